@@ -0,0 +1,16 @@
+import time
+
+if hasattr(time, "ticks_us"):
+    # MicroPython, where the ticks wrap around, so can only be compared using `ticks_diff`
+
+    def get_ticks() -> int:
+        return time.ticks_us()
+
+    def get_elapsed_seconds(started_at: int) -> float:
+        return time.ticks_diff(time.ticks_us(), started_at) / 1e6
+
+else:
+    get_ticks = time.perf_counter
+
+    def get_elapsed_seconds(started_at: float) -> float:
+        return time.perf_counter() - started_at
@@ -0,0 +1,91 @@
+"""
+Benchmarks `DayTime` sorting, comparison and addition throughput, along with the memory used by timers.
+
+Runs on CPython and on the MicroPython unix port. Run from the backend directory with either:
+- `PYTHONPATH=. python benchmarks/day_time.py`
+- `MICROPYPATH=.:<stdlib libs> micropython benchmarks/day_time.py`
+"""
+import gc
+import random
+from datetime import timedelta
+
+from benchmarks._common import get_elapsed_seconds, get_ticks
+from timeventx.timers.timers import DayTime, IdentifiableTimer, TimerId
+
+OPERATIONS = 20_000
+TIMERS = 1_000
+
+
+def _measure_rate(operation: callable, operations: int = OPERATIONS) -> float:
+    started_at = get_ticks()
+    operation()
+    return operations / get_elapsed_seconds(started_at)
+
+
+def _get_allocated_memory() -> int:
+    gc.collect()
+    try:
+        return gc.mem_alloc()
+    except AttributeError:
+        # CPython
+        import tracemalloc
+
+        return tracemalloc.get_traced_memory()[0]
+
+
+def _create_timers(day_times: list) -> list:
+    return [
+        IdentifiableTimer(TimerId(i), "timer", day_time, timedelta(minutes=1)) for i, day_time in enumerate(day_times)
+    ]
+
+
+def benchmark_throughput(day_times: list):
+    one_minute = timedelta(minutes=1)
+    pairs = list(zip(day_times, reversed(day_times)))
+
+    def sort():
+        sorted(day_times)
+
+    def compare():
+        for a, b in pairs:
+            a < b
+            a >= b
+            a == b
+
+    def add():
+        for day_time in day_times:
+            day_time + one_minute
+
+    print("Sort: %.0f items/s" % _measure_rate(sort))
+    print("Compare: %.0f comparisons/s" % _measure_rate(compare, OPERATIONS * 3))
+    print("Add: %.0f additions/s" % _measure_rate(add))
+
+
+def benchmark_memory(interning: bool):
+    try:
+        import tracemalloc
+
+        tracemalloc.start()
+    except ImportError:
+        pass
+
+    # Times as they would be created when deserialising timers, with many timers sharing a (quarter hour) start time
+    seconds = [random.randrange(0, 24 * 4) * 15 * 60 for _ in range(TIMERS)]
+    DayTime.interning_enabled = interning
+    before = _get_allocated_memory()
+    timers = _create_timers([DayTime.intern(DayTime.from_seconds(second)) for second in seconds])
+    used = _get_allocated_memory() - before
+    DayTime.interning_enabled = False
+    print("Memory per %d timers (interning %s): %d bytes" % (len(timers), "on" if interning else "off", used))
+
+
+def main():
+    random.seed(0)
+    day_times = [DayTime.from_seconds(random.randrange(0, 24 * 60 * 60)) for _ in range(OPERATIONS)]
+    benchmark_throughput(day_times)
+    benchmark_memory(False)
+    benchmark_memory(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmarks `TimerRunner.next_interval` and `TimerRunner.is_on` against the number of merged intervals.
+
+Run from the backend directory with: `PYTHONPATH=. python benchmarks/next_interval.py`
+"""
+import random
+import time
+from datetime import timedelta
+
+from timeventx.actions.noop import NoopActionController
+from timeventx.timer_runner import TimerRunner
+from timeventx.timers.collections.listenable import ListenableTimersCollection
+from timeventx.timers.collections.memory import InMemoryIdentifiableTimersCollection
+from timeventx.timers.timers import (
+    SECONDS_IN_A_DAY,
+    DayTime,
+    IdentifiableTimer,
+    TimerId,
+)
+
+# Intervals that touch are not merged so a day of 1s timers gives the most merged intervals possible
+MERGED_INTERVAL_COUNTS = (10, 100, 1_000, 10_000, SECONDS_IN_A_DAY - 1)
+CALLS = 20_000
+
+
+def create_timer_runner(merged_interval_count: int, current_time: list[DayTime]) -> TimerRunner:
+    spacing = SECONDS_IN_A_DAY // merged_interval_count
+    timers = InMemoryIdentifiableTimersCollection(
+        IdentifiableTimer(TimerId(i), f"timer-{i}", DayTime.from_seconds(i * spacing), timedelta(seconds=1))
+        for i in range(merged_interval_count)
+    )
+    timer_runner = TimerRunner(
+        ListenableTimersCollection(timers), NoopActionController(), current_time_getter=lambda: current_time[0]
+    )
+    assert len(timer_runner.on_off_intervals) == merged_interval_count
+    return timer_runner
+
+
+def benchmark(merged_interval_count: int) -> tuple[float, float]:
+    current_time = [DayTime(0, 0, 0)]
+    timer_runner = create_timer_runner(merged_interval_count, current_time)
+    times = tuple(DayTime.from_seconds(random.randrange(SECONDS_IN_A_DAY)) for _ in range(CALLS))
+
+    results = []
+    for method in (timer_runner.next_interval, timer_runner.is_on):
+        # Warm up the (lazily created) cache of intervals
+        method()
+        started_at = time.perf_counter()
+        for current_time[0] in times:
+            method()
+        results.append((time.perf_counter() - started_at) / CALLS * 1e6)
+    return results[0], results[1]
+
+
+def main():
+    random.seed(0)
+    print(f"{'Merged intervals':>16} {'next_interval (us)':>20} {'is_on (us)':>12}")
+    for merged_interval_count in MERGED_INTERVAL_COUNTS:
+        next_interval_latency, is_on_latency = benchmark(merged_interval_count)
+        print(f"{merged_interval_count:>16} {next_interval_latency:>20.2f} {is_on_latency:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmarks `SqliteTimersCollection` against `TimersDatabase` and `InMemoryIdentifiableTimersCollection` at increasing
+numbers of timers: the rate of adds, the time to load all timers (as at boot), the rate of gets by ID and the time to
+find the timers starting in an hour of the day.
+
+CPython only, as `sqlite3` is not available in MicroPython. Run from the backend directory with:
+`PYTHONPATH=. python benchmarks/sqlite_collection.py [<comma separated numbers of timers>] [<scratch directory>]`
+
+Timers are added with their IDs already set, so the cost of allocating IDs (which differs greatly between the
+collections) is not included. The scratch directory is emptied before use.
+"""
+import random
+import shutil
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from timeventx.timers.collections.database import TimersDatabase
+from timeventx.timers.collections.memory import InMemoryIdentifiableTimersCollection
+from timeventx.timers.collections.sqlite import SqliteTimersCollection
+from timeventx.timers.timers import DayTime, IdentifiableTimer, TimerId
+
+DEFAULT_TIMER_COUNTS = (1_000, 10_000, 100_000)
+DEFAULT_SCRATCH_DIRECTORY = "/tmp/timeventx-benchmark"
+GETS = 1_000
+
+
+def _create_timers(count: int) -> list:
+    random.seed(0)
+    return [
+        IdentifiableTimer(
+            TimerId(i + 1),
+            f"timer-{i % 100}",
+            DayTime.from_seconds(random.randrange(0, 24 * 60 * 60)),
+            timedelta(seconds=random.randrange(1, 60 * 60)),
+        )
+        for i in range(count)
+    ]
+
+
+def _get_starting_between(collection, start_time: DayTime, end_time: DayTime) -> list:
+    if isinstance(collection, SqliteTimersCollection):
+        return collection.get_starting_between(start_time, end_time)
+    # Other collections have no index on start time, so are scanned
+    start_seconds = start_time.as_seconds()
+    end_seconds = end_time.as_seconds()
+    return [timer for timer in collection if start_seconds <= timer.start_time.as_seconds() < end_seconds]
+
+
+def benchmark(name: str, open_collection: callable, timers: list):
+    collection = open_collection()
+    started_at = time.perf_counter()
+    for timer in timers:
+        collection.add(timer)
+    adds_per_second = len(timers) / (time.perf_counter() - started_at)
+
+    if not isinstance(collection, InMemoryIdentifiableTimersCollection):
+        # Reopened so the timers are loaded from storage, as at boot
+        collection = open_collection()
+    started_at = time.perf_counter()
+    loaded = len(list(collection))
+    load_time = time.perf_counter() - started_at
+    assert loaded == len(timers)
+
+    timer_ids = [random.choice(timers).id for _ in range(GETS)]
+    started_at = time.perf_counter()
+    for timer_id in timer_ids:
+        collection.get(timer_id)
+    gets_per_second = GETS / (time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    found = len(_get_starting_between(collection, DayTime(12, 0, 0), DayTime(13, 0, 0)))
+    range_time = time.perf_counter() - started_at
+
+    print(
+        "%s (%d timers): %.0f adds/s, %.1f ms to load, %.0f gets/s, %.2f ms to find %d timers starting in an hour"
+        % (name, len(timers), adds_per_second, load_time * 1000, gets_per_second, range_time * 1000, found)
+    )
+
+
+def main():
+    timer_counts = tuple(int(count) for count in sys.argv[1].split(",")) if len(sys.argv) > 1 else DEFAULT_TIMER_COUNTS
+    scratch_directory = Path(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_SCRATCH_DIRECTORY)
+
+    for timer_count in timer_counts:
+        timers = _create_timers(timer_count)
+        shutil.rmtree(scratch_directory, ignore_errors=True)
+        scratch_directory.mkdir(parents=True)
+        for name, open_collection in (
+            ("InMemoryIdentifiableTimersCollection", InMemoryIdentifiableTimersCollection),
+            ("TimersDatabase", lambda: TimersDatabase(scratch_directory / "timers")),
+            ("SqliteTimersCollection", lambda: SqliteTimersCollection(scratch_directory / "timers.sqlite")),
+        ):
+            benchmark(name, open_collection, timers)
+    shutil.rmtree(scratch_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
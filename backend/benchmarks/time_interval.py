@@ -0,0 +1,80 @@
+"""
+Benchmarks `TimeInterval.intersects` and duration throughput, along with the memory allocated per call.
+
+Allocated bytes are measured on MicroPython, with the garbage collector disabled so that `gc.mem_alloc` counts every
+allocation. CPython frees temporary objects immediately and offers no cumulative count, so allocations are not reported
+there.
+
+Runs on CPython and on the MicroPython unix port. Run from the backend directory with either:
+- `PYTHONPATH=. python benchmarks/time_interval.py`
+- `MICROPYPATH=.:<stdlib libs> micropython benchmarks/time_interval.py`
+"""
+import gc
+import random
+
+from benchmarks._common import get_elapsed_seconds, get_ticks
+from timeventx.timers.intervals import TimeInterval
+from timeventx.timers.timers import DayTime
+
+OPERATIONS = 20_000
+
+
+def _measure_rate(operation: callable, operations: int = OPERATIONS) -> float:
+    started_at = get_ticks()
+    operation()
+    return operations / get_elapsed_seconds(started_at)
+
+
+def _measure_allocated_bytes_per_call(operation: callable, operations: int = OPERATIONS) -> str:
+    if not hasattr(gc, "mem_alloc"):
+        # CPython
+        return "n/a"
+    gc.collect()
+    gc.disable()
+    before = gc.mem_alloc()
+    operation()
+    allocated = gc.mem_alloc() - before
+    gc.enable()
+    return "%.2f" % (allocated / operations)
+
+
+def main():
+    random.seed(0)
+    intervals = []
+    while len(intervals) < OPERATIONS:
+        start, end = random.randrange(0, 24 * 60 * 60), random.randrange(0, 24 * 60 * 60)
+        if start != end:
+            intervals.append(TimeInterval(DayTime.from_seconds(start), DayTime.from_seconds(end)))
+    pairs = list(zip(intervals, reversed(intervals)))
+    seconds_pairs = [(a, b.start_time.as_seconds(), b.end_time.as_seconds()) for a, b in pairs]
+
+    def intersects():
+        for a, b in pairs:
+            a.intersects(b)
+
+    def intersects_seconds():
+        for a, start_seconds, end_seconds in seconds_pairs:
+            a.intersects_seconds(start_seconds, end_seconds)
+
+    def duration():
+        for interval in intervals:
+            interval.duration
+
+    def duration_seconds():
+        for interval in intervals:
+            interval.duration_seconds
+
+    for name, operation in (
+        ("intersects", intersects),
+        ("intersects_seconds", intersects_seconds),
+        ("duration", duration),
+        ("duration_seconds", duration_seconds),
+    ):
+        print(
+            "%s: %.0f calls/s, %s bytes allocated per call"
+            % (name, _measure_rate(operation), _measure_allocated_bytes_per_call(operation))
+        )
+
+
+if __name__ == "__main__":
+    main()
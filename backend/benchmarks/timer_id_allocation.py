@@ -0,0 +1,55 @@
+"""
+Benchmarks adding timers without IDs to an `InMemoryIdentifiableTimersCollection`, which allocates the lowest unused ID
+to each, at increasing numbers of timers. The time per timer should stay about the same as the number of timers grows.
+
+Runs on CPython and on the MicroPython unix port. Run from the backend directory with either:
+- `PYTHONPATH=. python benchmarks/timer_id_allocation.py [<comma separated numbers of timers>]`
+- `MICROPYPATH=.:<stdlib libs> micropython benchmarks/timer_id_allocation.py [<comma separated numbers of timers>]`
+"""
+import random
+import sys
+from datetime import timedelta
+
+from benchmarks._common import get_elapsed_seconds, get_ticks
+from timeventx.timers.collections.memory import InMemoryIdentifiableTimersCollection
+from timeventx.timers.timers import DayTime, Timer
+
+DEFAULT_TIMER_COUNTS = (1_000, 10_000, 100_000)
+
+
+def benchmark(timer_count: int):
+    timer = Timer("timer", DayTime(12, 0, 0), timedelta(minutes=1))
+    collection = InMemoryIdentifiableTimersCollection()
+
+    started_at = get_ticks()
+    for _ in range(timer_count):
+        collection.add(timer)
+    add_time = get_elapsed_seconds(started_at)
+
+    # Half of the timers are removed at random, so the IDs are reallocated from the free-list
+    random.seed(0)
+    removed = 0
+    for timer_id in range(timer_count):
+        if random.random() < 0.5:
+            collection.remove(timer_id)
+            removed += 1
+    started_at = get_ticks()
+    for _ in range(removed):
+        collection.add(timer)
+    readd_time = get_elapsed_seconds(started_at)
+    assert len(collection) == timer_count
+
+    print(
+        "%d timers: %.2f us/timer to add, %.2f us/timer to re-add %d removed timers"
+        % (timer_count, add_time * 1e6 / timer_count, readd_time * 1e6 / max(removed, 1), removed)
+    )
+
+
+def main():
+    timer_counts = tuple(int(count) for count in sys.argv[1].split(",")) if len(sys.argv) > 1 else DEFAULT_TIMER_COUNTS
+    for timer_count in timer_counts:
+        benchmark(timer_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmarks the memory used per timer when stored as timer objects and when stored in a `TimerTable`.
+
+Runs on CPython and on the MicroPython unix port. Run from the backend directory with either:
+- `PYTHONPATH=. python benchmarks/timer_table.py`
+- `MICROPYPATH=.:<stdlib libs> micropython benchmarks/timer_table.py`
+"""
+import gc
+import random
+from datetime import timedelta
+
+from timeventx.timers.collections.memory import InMemoryIdentifiableTimersCollection
+from timeventx.timers.collections.table import TimerTable
+from timeventx.timers.timers import DayTime, IdentifiableTimer, TimerId
+
+TIMERS = 1_000
+
+
+def _get_allocated_memory() -> int:
+    gc.collect()
+    try:
+        return gc.mem_alloc()
+    except AttributeError:
+        # CPython
+        import tracemalloc
+
+        return tracemalloc.get_traced_memory()[0]
+
+
+def _create_timers(names: list) -> list:
+    random.seed(0)
+    return [
+        IdentifiableTimer(
+            TimerId(i),
+            random.choice(names),
+            DayTime.from_seconds(random.randrange(0, 24 * 60 * 60)),
+            timedelta(seconds=random.randrange(1, 60 * 60)),
+        )
+        for i in range(TIMERS)
+    ]
+
+
+def benchmark_memory(collection_type: type, names: list):
+    before = _get_allocated_memory()
+    # Only the timers retained by the collection are counted, as the list of created timers is discarded
+    collection = collection_type(_create_timers(names))
+    used = _get_allocated_memory() - before
+    print("%s: %.1f bytes per timer" % (collection_type.__name__, used / len(collection)))
+
+
+def main():
+    try:
+        import tracemalloc
+
+        tracemalloc.start()
+    except ImportError:
+        pass
+
+    names = ["timer-%d" % i for i in range(10)]
+    benchmark_memory(InMemoryIdentifiableTimersCollection, names)
+    benchmark_memory(TimerTable, names)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmarks the rate of adding timers to, the time taken to load (as at boot) and the storage used by each timers storage
+backend.
+
+Runs on CPython and on the MicroPython unix port (or on a device, with a location on its filesystem). Run from the
+backend directory with either:
+- `PYTHONPATH=. python benchmarks/timers_storage.py [<scratch directory>]`
+- `MICROPYPATH=.:<stdlib libs> micropython benchmarks/timers_storage.py [<scratch directory>]`
+
+The timers are stored in a new directory that the benchmark creates in the scratch directory and removes afterwards.
+Nothing else in the scratch directory is changed.
+"""
+import os
+import random
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+from benchmarks._common import get_elapsed_seconds, get_ticks
+from timeventx.timers.collections.binary import BinaryTimersCollection
+from timeventx.timers.collections.database import TimersDatabase
+from timeventx.timers.collections.journal import JournalTimersCollection
+from timeventx.timers.timers import DayTime, Timer
+
+try:
+    from timeventx.timers.collections.mapped import MappedTimersCollection
+except ImportError:
+    # `mmap` is not available in MicroPython
+    MappedTimersCollection = None
+
+TIMERS = 200
+DEFAULT_SCRATCH_DIRECTORY = "/tmp"
+
+# `stat` module does not exist for MicroPython
+_FILE_TYPE_MASK = 0xF000
+_DIRECTORY_MODE = 0x4000
+
+
+def _remove(location: str):
+    # `shutil` is not available in MicroPython. Nor is `os.lstat`, but where it is, symbolic links are removed rather than
+    # followed
+    mode = getattr(os, "lstat", os.stat)(location)[0]
+    if mode & _FILE_TYPE_MASK == _DIRECTORY_MODE:
+        for name in os.listdir(location):
+            _remove(f"{location}/{name}")
+        os.rmdir(location)
+    else:
+        os.remove(location)
+
+
+def _get_size(location: str) -> int:
+    try:
+        return sum(_get_size(f"{location}/{name}") for name in os.listdir(location))
+    except OSError:
+        # `os.stat` result indexed as it is a tuple in MicroPython
+        return os.stat(location)[6]
+
+
+def benchmark(name: str, open_collection: callable, location: str):
+    timers = [Timer(f"timer-{i}", DayTime.from_seconds(i * 60), timedelta(minutes=1)) for i in range(TIMERS)]
+
+    collection = open_collection()
+    started_at = get_ticks()
+    for timer in timers:
+        collection.add(timer)
+    adds_per_second = len(timers) / get_elapsed_seconds(started_at)
+
+    started_at = get_ticks()
+    # Loaded as at boot, when the timer runner reads all of the timers
+    loaded = len(list(open_collection()))
+    load_time = get_elapsed_seconds(started_at)
+    assert loaded == len(timers)
+
+    print(
+        "%s: %.0f adds/s, %.1f ms to load %d timers, %d bytes stored"
+        % (name, adds_per_second, load_time * 1000, loaded, _get_size(location))
+    )
+
+
+def main():
+    parent_directory = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SCRATCH_DIRECTORY
+    Path(parent_directory).mkdir(parents=True, exist_ok=True)
+    # `tempfile` is not available in MicroPython. Fails if the directory already exists, so only a directory created
+    # here is ever removed
+    scratch_directory = f"{parent_directory}/timeventx-benchmark-{random.getrandbits(32):08x}"
+    os.mkdir(scratch_directory)
+
+    backends = [
+        ("TimersDatabase", TimersDatabase, "timers"),
+        ("JournalTimersCollection", JournalTimersCollection, "timers.journal"),
+        ("BinaryTimersCollection", BinaryTimersCollection, "timers.bin"),
+    ]
+    if MappedTimersCollection is not None:
+        backends.append(("MappedTimersCollection", MappedTimersCollection, "timers.mmap"))
+
+    try:
+        for name, collection_type, file_name in backends:
+            location = f"{scratch_directory}/{file_name}"
+            benchmark(name, lambda: collection_type(Path(location)), location)
+    finally:
+        _remove(scratch_directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmarks compiling a `TransitionPlan` and the operations used by the timer runner on each wake, along with the memory
+allocated by those operations.
+
+Runs on CPython and on the MicroPython unix port. Run from the backend directory with either:
+- `PYTHONPATH=. python benchmarks/transition_plan.py`
+- `MICROPYPATH=.:<stdlib libs> micropython benchmarks/transition_plan.py`
+"""
+import gc
+import random
+from datetime import timedelta
+
+from benchmarks._common import get_elapsed_seconds, get_ticks
+from timeventx.timers.intervals import MergedIntervalsIndex
+from timeventx.timers.timers import DayTime, IdentifiableTimer, TimerId
+from timeventx.timers.transitions import TransitionPlan
+
+OPERATIONS = 20_000
+TIMERS = 200
+
+
+def _measure_rate(operation: callable, operations: int = OPERATIONS) -> float:
+    started_at = get_ticks()
+    operation()
+    return operations / get_elapsed_seconds(started_at)
+
+
+def _measure_allocated_bytes_per_call(operation: callable, operations: int = OPERATIONS) -> str:
+    if not hasattr(gc, "mem_alloc"):
+        # CPython
+        return "n/a"
+    gc.collect()
+    gc.disable()
+    before = gc.mem_alloc()
+    operation()
+    allocated = gc.mem_alloc() - before
+    gc.enable()
+    return "%.2f" % (allocated / operations)
+
+
+def main():
+    random.seed(0)
+    index = MergedIntervalsIndex(
+        IdentifiableTimer(
+            TimerId(i),
+            "timer",
+            DayTime.from_seconds(random.randrange(0, 24 * 60) * 60),
+            timedelta(minutes=random.randint(1, 5)),
+        )
+        for i in range(TIMERS)
+    )
+    on_off_intervals = index.on_off_intervals
+    plan = TransitionPlan.from_on_off_intervals(on_off_intervals)
+    seconds = [random.randrange(0, 24 * 60 * 60) for _ in range(OPERATIONS)]
+
+    compilations = 100
+
+    def compile_plans():
+        for _ in range(compilations):
+            TransitionPlan.from_on_off_intervals(on_off_intervals)
+
+    def wake():
+        # What the runner does each time it wakes: advance the cursor and look up the state
+        cursor = plan.find_next(0)
+        previous_seconds = 0
+        for current_seconds in range(0, OPERATIONS * 4, 4):
+            current_seconds %= 24 * 60 * 60
+            cursor = plan.advance(cursor, previous_seconds, current_seconds)
+            plan.states[cursor - 1]
+            plan.seconds_until(cursor, current_seconds)
+            previous_seconds = current_seconds
+
+    def state_at():
+        for second in seconds:
+            plan.state_at(second)
+
+    print("Transitions in plan: %d" % len(plan))
+    print("Compile: %.0f plans/s" % _measure_rate(compile_plans, compilations))
+    for name, operation in (("Wake", wake), ("State at", state_at)):
+        print(
+            "%s: %.0f calls/s, %s bytes allocated per call"
+            % (name, _measure_rate(operation), _measure_allocated_bytes_per_call(operation))
+        )
+
+
+if __name__ == "__main__":
+    main()
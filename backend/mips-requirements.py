@@ -28,6 +28,7 @@ LIBRARIES_TO_INSTALL = (
             f"{target_directory}/_async.py", f"{target_directory}/ucontentlib_async.py"
         ),
     ),
+    "bisect",
     "collections",
     # pfalcon's defaultdict package has a couple more definitions than that in micropython-lib to get data out of the defaultdict
     Library("github:pfalcon/pycopy-lib/collections.defaultdict/collections/defaultdict.py", package="collections"),
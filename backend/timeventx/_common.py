@@ -1,7 +1,6 @@
 import os
 import sys
 from _thread import LockType
-from pathlib import Path
 
 try:
     import asyncio
@@ -27,7 +26,19 @@ def noop_if_not_rp2040(wrappable: callable) -> callable:
 
 
 # `pathlib.resolve` and `os.path.abspath` do not work as expected in the MicroPython modules
-def resolve_path(path: Path) -> Path:
-    is_file = path.is_file()
-    os.chdir(str(path.parent if is_file else path))
-    return Path(f"{os.getcwd()}/{path.name}") if is_file else os.getcwd()
+def to_absolute_path(path: str) -> str:
+    """
+    Gets the absolute, normalised form of the given path, without following symlinks or changing directory.
+    :param path: absolute path or path relative to the current directory
+    :return: absolute path
+    """
+    if not path.startswith("/"):
+        path = f"{os.getcwd()}/{path}"
+    parts = []
+    for part in path.split("/"):
+        if part == "..":
+            if len(parts) > 0:
+                parts.pop()
+        elif part != "" and part != ".":
+            parts.append(part)
+    return "/" + "/".join(parts)
@@ -7,23 +7,27 @@ from typing import Dict, Tuple, TypeAlias, Union
 from microdot_asyncio import Microdot, Request, Response, abort, send_file
 from microdot_cors import CORS
 
-from timeventx._common import RP2040_DETECTED, resolve_path
+from timeventx._common import RP2040_DETECTED
 from timeventx._logging import clear_logs, flush_file_logs, get_logger
 from timeventx.app_utils import (
     ContentType,
     HttpStatus,
+    ResponseCache,
+    accepts_encoding,
+    create_conditional_response,
     create_content_type_header,
-    get_content_type,
+    etag_matches,
     handle_authorisation,
 )
 from timeventx.configuration import Configuration, ConfigurationNotFoundError
 from timeventx.rp2040 import get_disk_usage, get_memory_usage
+from timeventx.static_assets import IMMUTABLE_MAX_AGE, create_static_asset_index
 from timeventx.timers.serialisation import (
     deserialise_daytime,
     serialise_daytime,
     timer_to_json,
 )
-from timeventx.timers.timers import IdentifiableTimer, Timer, TimerId
+from timeventx.timers.timers import DayTime, IdentifiableTimer, Timer, TimerId
 
 API_VERSION = "v1"
 
@@ -34,6 +38,10 @@ EndpointResponse: TypeAlias = Union[Response, str, Tuple[str, int], Tuple[str, i
 logger = get_logger(__name__)
 app = Microdot()
 CORS(app, allowed_origins="*", allow_credentials=True)
+# Bodies of responses that are only re-rendered when the data they are rendered from changes
+app.response_cache = ResponseCache()
+# Index of the UI's static files, built at startup (or else on first use)
+app.static_asset_index = None
 
 
 @app.before_request
@@ -61,11 +69,14 @@ async def get_healthcheck(request: Request) -> EndpointResponse:
 @app.get(f"/api/{API_VERSION}/timers")
 @handle_authorisation
 async def get_timers(request: Request) -> EndpointResponse:
-    return (
-        json.dumps([timer_to_json(timer) for timer in request.app.database]),
-        HttpStatus.OK,
-        create_content_type_header(ContentType.JSON),
+    database = request.app.database
+    body, etag = request.app.response_cache.get(
+        "timers",
+        database,
+        database.generation,
+        lambda: json.dumps([timer_to_json(timer) for timer in database]),
     )
+    return create_conditional_response(request, body, etag, ContentType.JSON)
 
 
 @app.post(f"/api/{API_VERSION}/timer")
@@ -88,9 +99,22 @@ async def post_timer(request: Request) -> EndpointResponse:
 @handle_authorisation
 async def put_timer(request: Request, timer_id: TimerId) -> EndpointResponse:
     timer = _create_timer_from_request(request)
-    request.app.database.remove(timer_id)
-    request.app.database.add(timer)
-    return json.dumps(timer_to_json(timer)), HttpStatus.CREATED, create_content_type_header(ContentType.JSON)
+
+    if isinstance(timer, IdentifiableTimer) and timer.id != timer_id:
+        abort(HttpStatus.BAD_REQUEST, "Timer ID does not match the ID in the URL")
+
+    try:
+        # Replaced in one operation, so the timer is never missing and listeners (e.g. the timer runner) are notified once
+        identifiable_timer = request.app.database.replace(timer_id, timer)
+    except KeyError:
+        identifiable_timer = request.app.database.add(
+            timer if isinstance(timer, IdentifiableTimer) else IdentifiableTimer.from_timer(timer, timer_id)
+        )
+    return (
+        json.dumps(timer_to_json(identifiable_timer)),
+        HttpStatus.CREATED,
+        create_content_type_header(ContentType.JSON),
+    )
 
 
 def _create_timer_from_request(request: Request) -> Timer | IdentifiableTimer:
@@ -139,16 +163,42 @@ async def delete_timer(request: Request, timer_id: TimerId) -> EndpointResponse:
 @app.get(f"/api/{API_VERSION}/intervals")
 @handle_authorisation
 async def get_intervals(request: Request) -> EndpointResponse:
-    return (
-        json.dumps(
+    timer_runner = request.app.timer_runner
+    body, etag = request.app.response_cache.get(
+        "intervals",
+        timer_runner,
+        timer_runner.generation,
+        lambda: json.dumps(
             [
-                {"startTime": serialise_daytime(interval.start_time), "endTime": serialise_daytime(interval.end_time)}
-                for interval in request.app.timer_runner.on_off_intervals
+                {
+                    "startTime": serialise_daytime(interval.start_time),
+                    "endTime": serialise_daytime(interval.end_time),
+                }
+                for interval in timer_runner.on_off_intervals
             ]
         ),
-        HttpStatus.OK,
-        create_content_type_header(ContentType.JSON),
     )
+    return create_conditional_response(request, body, etag, ContentType.JSON)
+
+
+@app.get(f"/api/{API_VERSION}/transitions")
+@handle_authorisation
+async def get_transitions(request: Request) -> EndpointResponse:
+    timer_runner = request.app.timer_runner
+
+    def render() -> str:
+        transition_plan = timer_runner.transition_plan
+        if len(transition_plan) == 0 and transition_plan.constant_state:
+            # On all day, so shown as turning on at the start of the day and never turning off
+            transitions = ((0, True),)
+        else:
+            transitions = zip(transition_plan.seconds, transition_plan.states)
+        return json.dumps(
+            [{"time": serialise_daytime(DayTime.from_seconds(seconds)), "on": state} for seconds, state in transitions]
+        )
+
+    body, etag = request.app.response_cache.get("transitions", timer_runner, timer_runner.generation, render)
+    return create_conditional_response(request, body, etag, ContentType.JSON)
 
 
 @app.get(f"/api/{API_VERSION}/stats")
@@ -212,18 +262,22 @@ async def delete_logs(request: Request) -> EndpointResponse:
 @handle_authorisation
 async def get_config(request: Request) -> EndpointResponse:
     configuration: Configuration = request.app.configuration
-    configuration_descriptions = configuration.get_configuration_descriptions()
 
-    configuration_map = defaultdict(dict)
-    for configuration_description in configuration_descriptions:
-        value = configuration.get_with_standard_default(configuration_description)
-        if isinstance(value, Path):
-            value = str(value)
-        configuration_map[configuration_description.ini_section][configuration_description.ini_option] = value
+    def render() -> str:
+        configuration_map = defaultdict(dict)
+        for configuration_description in configuration.get_configuration_descriptions():
+            value = configuration.get_with_standard_default(configuration_description)
+            if isinstance(value, Path):
+                value = str(value)
+            configuration_map[configuration_description.ini_section][configuration_description.ini_option] = value
+
+        # Workaround for `defaultdict` implementation being used with MicroPython
+        serialisable_configuration_map = {x: y for x, y in configuration_map.items()}
+        return json.dumps(serialisable_configuration_map)
 
-    # Workaround for `defaultdict` implementation being used with MicroPython
-    serialisable_configuration_map = {x: y for x, y in configuration_map.items()}
-    return json.dumps(serialisable_configuration_map), HttpStatus.OK, create_content_type_header(ContentType.JSON)
+    # The configuration is not changed whilst running, so is only rendered once for each configuration object
+    body, etag = request.app.response_cache.get("config", configuration, 0, render)
+    return create_conditional_response(request, body, etag, ContentType.JSON)
 
 
 @app.post(f"/api/{API_VERSION}/shutdown")
@@ -239,43 +293,46 @@ async def post_shutdown(request: Request) -> EndpointResponse:
 @app.get(f"/")
 @handle_authorisation
 async def get_root(request: Request) -> EndpointResponse:
-    return serve_ui(request, Path("index.html"))
+    return serve_ui(request, "index.html")
 
 
 # This route MUST be defined last
 @app.get(f"/<re:.*:path>")
 @handle_authorisation
 async def get_file(request: Request, path: str) -> EndpointResponse:
-    return serve_ui(request, Path(path))
+    return serve_ui(request, path)
 
 
-def serve_ui(request: Request, path: Path):
-    # MicroPython `pathlib` implementation does not support `is_absolute`
-    if str(path).startswith("/"):
-        abort(HttpStatus.NOT_FOUND, "Path should not start with double slash //")
-
-    try:
-        frontend_location = request.app.configuration[Configuration.FRONTEND_ROOT_DIRECTORY]
-    except ConfigurationNotFoundError:
-        # The pathlib library in use with MicroPython has a bug where `Path.resolve` returns a `str` instead of a `Path`
-        frontend_location = Path(Path(__file__).resolve()).parent / "../../frontend/dist"
-    frontend_location = resolve_path(frontend_location)
+def serve_ui(request: Request, path: str):
+    if request.app.static_asset_index is None:
+        request.app.static_asset_index = create_static_asset_index(request.app.configuration)
+    static_asset_index = request.app.static_asset_index
 
-    try:
-        # `Path.__truediv__` is not implemented in `pathlib` module in use with MicroPython
-        full_path = resolve_path(Path(f"{frontend_location}/{path}"))
-    except OSError:
-        abort(HttpStatus.NOT_FOUND)
-
-    if (
-        not str(full_path).startswith(str(frontend_location))
-        or "../" in str(full_path)
-        or not full_path.exists()
-        or not full_path.is_file()
-    ):
+    # Only files in the frontend are in the index, so paths outside of it (e.g. with `../`) are not found
+    asset = static_asset_index.get(path)
+    if asset is None:
         abort(HttpStatus.NOT_FOUND)
 
-    content_type = get_content_type(full_path)
-
-    logger.info(f"Serving {full_path}")
-    return send_file(str(full_path), max_age=0, content_type=content_type)
+    compressed = asset.gzip_path is not None and accepts_encoding(request, "gzip")
+    headers = {
+        "ETag": asset.gzip_etag if compressed else asset.etag,
+        # Files without a hash in their name (e.g. `index.html`) are revalidated on every use, so changes are seen
+        "Cache-Control": f"max-age={IMMUTABLE_MAX_AGE}, immutable" if asset.immutable else "max-age=0",
+    }
+    if asset.gzip_path is not None:
+        headers["Vary"] = "Accept-Encoding"
+
+    if etag_matches(request, headers["ETag"]):
+        return "", HttpStatus.NOT_MODIFIED, headers
+
+    logger.info(f"Serving {path}{' (compressed)' if compressed else ''}")
+    response = send_file(
+        path,
+        content_type=asset.content_type,
+        compressed=compressed,
+        stream=static_asset_index.open(asset, compressed),
+    )
+    response.headers.update(headers)
+    # Known from the index, so the client can tell how much of the file is left to receive
+    response.headers["Content-Length"] = str(asset.gzip_size if compressed else asset.size)
+    return response
@@ -1,3 +1,4 @@
+import random
 from logging import getLogger
 from pathlib import Path
 from typing import Callable, Optional
@@ -11,6 +12,7 @@ class HttpStatus:
     OK = 200
     CREATED = 201
     ACCEPTED = 202
+    NOT_MODIFIED = 304
     BAD_REQUEST = 400
     UNAUTHORISED = 401
     NOT_FOUND = 404
@@ -46,6 +48,47 @@ _BASIC_AUTH_HEADER = ("WWW-Authenticate", 'Basic realm="timeventx"')
 logger = getLogger(__name__)
 
 
+class ResponseCache:
+    """
+    Cache of encoded response bodies, by endpoint.
+
+    Each body is kept for the source it was rendered from (e.g. the timers collection) and the generation of that source
+    at the time, so it is re-rendered once the source changes.
+
+    Each body rendered is given a strong ETag that is unique to this cache. The ETag includes a nonce chosen when the cache
+    is created, so ETags given out before a restart do not match bodies rendered after it.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[object, int, bytes, str]] = {}
+        self._boot_nonce = "%08x" % random.getrandbits(32)
+        self._renders = 0
+
+    def get(self, key: str, source: object, generation: int, render: Callable[[], str]) -> tuple[bytes, str]:
+        """
+        Gets the body for the given key, rendering it if not cached for the source at the given generation.
+        :param key: key of the response (e.g. the endpoint)
+        :param source: what the body is rendered from
+        :param generation: generation of the source
+        :param render: renders the body
+        :return: tuple where the first element is the encoded body and the second is its ETag
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is source and entry[1] == generation:
+            return entry[2], entry[3]
+        body = render().encode()
+        self._renders += 1
+        etag = f'"{self._boot_nonce}-{self._renders:x}"'
+        self._entries[key] = (source, generation, body, etag)
+        return body, etag
+
+    def clear(self):
+        """
+        Removes all cached bodies.
+        """
+        self._entries.clear()
+
+
 # mimetypes module does not exist for MicroPython
 def get_content_type(path: Path) -> str:
     try:
@@ -54,6 +97,82 @@ def get_content_type(path: Path) -> str:
         return ContentType.OCTET_STREAM
 
 
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Gets whether the given ETag matches the request's `If-None-Match` header, i.e. whether the client already has it.
+    :param request: request made
+    :param etag: ETag of the response to the request
+    :return: whether the ETag matches
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for client_etag in if_none_match.split(","):
+        client_etag = client_etag.strip()
+        # `If-None-Match` uses weak comparison, so a weak ETag matches its strong equivalent
+        if client_etag.startswith("W/"):
+            client_etag = client_etag[2:]
+        if client_etag == etag:
+            return True
+    return False
+
+
+def accepts_encoding(request: Request, encoding: str) -> bool:
+    """
+    Gets whether the request's `Accept-Encoding` header allows a response with the given content encoding.
+    :param request: request made
+    :param encoding: content encoding (e.g. `gzip`)
+    :return: whether the encoding is accepted
+    """
+    accept_encoding = request.headers.get("Accept-Encoding")
+    if accept_encoding is None:
+        return False
+    # The encoding's own entry takes precedence over the wildcard, regardless of the order they are listed in
+    wildcard_accepted = False
+    for accepted in accept_encoding.split(","):
+        parameters = accepted.split(";")
+        coding = parameters[0].strip().lower()
+        if coding == encoding:
+            return _get_quality(parameters[1:]) > 0
+        if coding == "*":
+            wildcard_accepted = _get_quality(parameters[1:]) > 0
+    return wildcard_accepted
+
+
+def _get_quality(parameters: list[str]) -> float:
+    for parameter in parameters:
+        name, _, value = parameter.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0
+    return 1
+
+
+def create_conditional_response(
+    request: Request, body: bytes, etag: str, content_type: str
+) -> tuple[bytes, int, dict[str, str]]:
+    """
+    Creates a response with the given body and ETag, or an empty not modified response if the client already has it.
+    :param request: request made
+    :param body: body of the response
+    :param etag: ETag of the body
+    :param content_type: content type of the body
+    :return: tuple where the first element is the body, the second is the status and the third is the headers
+    """
+    if etag_matches(request, etag):
+        # No body, so no content type
+        return b"", HttpStatus.NOT_MODIFIED, {"ETag": etag}
+    headers = create_content_type_header(content_type)
+    headers["ETag"] = etag
+    # Stored by the client but always revalidated, so changes are seen on the next request
+    headers["Cache-Control"] = "no-cache"
+    return body, HttpStatus.OK, headers
+
+
 # TODO: consider decorator instead
 def create_content_type_header(content_type: str) -> dict:
     return {"Content-Type": content_type}
@@ -60,9 +60,18 @@ class Configuration:
     LOG_FILE_LOCATION = ConfigurationDescription(
         f"{ENVIRONMENT_VARIABLE_PREFIX}_LOG_FILE_LOCATION", "log.file_location", Path, default="/main.log"
     )
+    # Directory of timer files, or a file to store all timers in, with the `.journal` (journal), `.bin` (binary records),
+    # `.mmap` (memory-mapped records, CPython only) or `.sqlite` (SQLite database, CPython only) extension
     TIMERS_DATABASE_LOCATION = ConfigurationDescription(
         f"{ENVIRONMENT_VARIABLE_PREFIX}_TIMERS_DATABASE_LOCATION", "database.location", Path, default="/data/timers"
     )
+    # Whether to reload the timers database if it is changed by something other than the application
+    TIMERS_DATABASE_CHECK_EXTERNAL_CHANGES = ConfigurationDescription(
+        f"{ENVIRONMENT_VARIABLE_PREFIX}_TIMERS_DATABASE_CHECK_EXTERNAL_CHANGES",
+        "database.check_external_changes",
+        lambda value: True if value.lower() == "true" else False,
+        default=False,
+    )
     WIFI_SSID = ConfigurationDescription(f"{ENVIRONMENT_VARIABLE_PREFIX}_WIFI_SSID", "wifi.ssid", str, allow_none=False)
     WIFI_PASSWORD = ConfigurationDescription(
         f"{ENVIRONMENT_VARIABLE_PREFIX}_WIFI_PASSWORD", "wifi.password", str, allow_none=False
@@ -73,6 +82,10 @@ class Configuration:
         Path,
         default="/frontend",
     )
+    # Archive of the built frontend (made using `scripts/pack-frontend.py`), served instead of the root directory if set
+    FRONTEND_ARCHIVE_LOCATION = ConfigurationDescription(
+        f"{ENVIRONMENT_VARIABLE_PREFIX}_FRONTEND_ARCHIVE_LOCATION", "frontend.archive", Path, default=None
+    )
     BACKEND_PORT = ConfigurationDescription(
         f"{ENVIRONMENT_VARIABLE_PREFIX}_BACKEND_PORT", "backend.port", int, default=80
     )
@@ -88,6 +101,14 @@ class Configuration:
     ACTION_CONTROLLER_MODULE = ConfigurationDescription(
         f"{ENVIRONMENT_VARIABLE_PREFIX}_ACTION_CONTROLLER_MODULE", "actions.module", str, allow_none=False
     )
+    # Interval, in seconds, between resynchronisations of the clock with the wall clock
+    CLOCK_RESYNC_INTERVAL = ConfigurationDescription(
+        f"{ENVIRONMENT_VARIABLE_PREFIX}_CLOCK_RESYNC_INTERVAL", "clock.resync_interval", int, default=3600
+    )
+    # How the times the timers are on are held: "intervals" (exact), "minute_bitmap" or "second_bitmap"
+    SCHEDULE_MODE = ConfigurationDescription(
+        f"{ENVIRONMENT_VARIABLE_PREFIX}_SCHEDULE_MODE", "schedule.mode", str, default="intervals"
+    )
     # Credentials expected in the form: base64("user:password"),base64("user2:password2")
     BASE64_ENCODED_CREDENTIALS = ConfigurationDescription(
         f"{ENVIRONMENT_VARIABLE_PREFIX}_BASE64_ENCODED_CREDENTIALS",
@@ -1,5 +1,6 @@
 import os
 import sys
+from datetime import timedelta
 from pathlib import Path
 from time import sleep
 from typing import Optional
@@ -10,9 +11,22 @@ from timeventx.actions.actions import ActionController, get_global_action_contro
 from timeventx.app import app
 from timeventx.configuration import DEFAULT_CONFIGURATION_FILE_NAME, Configuration
 from timeventx.rp2040 import setup_device
+from timeventx.static_assets import create_static_asset_index
 from timeventx.timer_runner import TimerRunner
-from timeventx.timers.collections.database import TimersDatabase
+from timeventx.timers.bitmap import MINUTE_RESOLUTION, SECOND_RESOLUTION, BitmapSchedule
+from timeventx.timers.clock import MonotonicClock
+from timeventx.timers.collections.abc import IdentifiableTimersCollection
+from timeventx.timers.collections.binary import (
+    BINARY_FILE_EXTENSION,
+    BinaryTimersCollection,
+)
+from timeventx.timers.collections.database import CachedTimersDatabase, TimersDatabase
+from timeventx.timers.collections.journal import (
+    JOURNAL_FILE_EXTENSION,
+    JournalTimersCollection,
+)
 from timeventx.timers.collections.listenable import ListenableTimersCollection
+from timeventx.timers.intervals import MergedIntervalsIndex
 
 try:
     import asyncio
@@ -25,20 +39,53 @@ DEFAULT_CONFIGURATION_FILE_LOCATION = Path("/") / DEFAULT_CONFIGURATION_FILE_NAM
 
 logger = get_logger(__name__)
 
+# Timers collections stored in a single file, by the extension of the file
+_SINGLE_FILE_TIMERS_COLLECTION_TYPES = {
+    JOURNAL_FILE_EXTENSION: JournalTimersCollection,
+    BINARY_FILE_EXTENSION: BinaryTimersCollection,
+}
+try:
+    from timeventx.timers.collections.mapped import (
+        MAPPED_FILE_EXTENSION,
+        MappedTimersCollection,
+    )
+
+    _SINGLE_FILE_TIMERS_COLLECTION_TYPES[MAPPED_FILE_EXTENSION] = MappedTimersCollection
+except ImportError:
+    # `mmap` is not available in MicroPython
+    pass
+try:
+    from timeventx.timers.collections.sqlite import (
+        SQLITE_FILE_EXTENSION,
+        SqliteTimersCollection,
+    )
+
+    _SINGLE_FILE_TIMERS_COLLECTION_TYPES[SQLITE_FILE_EXTENSION] = SqliteTimersCollection
+except ImportError:
+    # `sqlite3` is not available in MicroPython
+    pass
+
 
 async def inner_main(configuration: Configuration):
     setup_device(configuration)
 
     logger.info("Setting up database")
-    timers_database = ListenableTimersCollection(TimersDatabase(configuration[Configuration.TIMERS_DATABASE_LOCATION]))
+    timers_database = ListenableTimersCollection(get_timers_database(configuration))
 
     logger.info("Starting task runner")
     action_controller = get_action_controller(configuration)
-    timer_runner = TimerRunner(timers_database, action_controller)
+    clock = MonotonicClock(
+        timedelta(seconds=configuration.get_with_standard_default(Configuration.CLOCK_RESYNC_INTERVAL))
+    )
+    timer_runner = TimerRunner(timers_database, action_controller, clock, get_schedule_factory(configuration))
     timer_runner_task = asyncio.create_task(timer_runner.run())
 
+    logger.info("Indexing static files")
+    static_asset_index = create_static_asset_index(configuration)
+
     logger.info("Starting web server")
     app.configuration = configuration
+    app.static_asset_index = static_asset_index
     app.database = timers_database
     app.timer_runner = timer_runner
     server_task = asyncio.create_task(
@@ -67,6 +114,35 @@ def get_action_controller(configuration: Configuration) -> ActionController:
         raise RuntimeError("Action controller not set up")
 
 
+def get_timers_database(configuration: Configuration) -> IdentifiableTimersCollection:
+    location = configuration[Configuration.TIMERS_DATABASE_LOCATION]
+    single_file_collection_type = _SINGLE_FILE_TIMERS_COLLECTION_TYPES.get(location.suffix)
+    if single_file_collection_type is not None:
+        # Timers in a directory database at the same location, without the extension, are migrated to the file
+        directory_location = location.with_suffix("")
+        if not location.exists() and directory_location.exists():
+            logger.info(f"Migrating timers database in {directory_location} to {location}")
+            return single_file_collection_type.from_timers(TimersDatabase(directory_location), location)
+        return single_file_collection_type(location)
+    return CachedTimersDatabase(
+        location,
+        check_for_external_changes=configuration.get_with_standard_default(
+            Configuration.TIMERS_DATABASE_CHECK_EXTERNAL_CHANGES
+        ),
+    )
+
+
+def get_schedule_factory(configuration: Configuration) -> callable:
+    schedule_mode = configuration.get_with_standard_default(Configuration.SCHEDULE_MODE)
+    if schedule_mode == "intervals":
+        return MergedIntervalsIndex.from_timer_seconds
+    elif schedule_mode == "minute_bitmap":
+        return lambda timer_seconds: BitmapSchedule.from_timer_seconds(timer_seconds, MINUTE_RESOLUTION)
+    elif schedule_mode == "second_bitmap":
+        return lambda timer_seconds: BitmapSchedule.from_timer_seconds(timer_seconds, SECOND_RESOLUTION)
+    raise ValueError(f"Unknown schedule mode: {schedule_mode}")
+
+
 def reset(cooldown_time_in_seconds: int = 10):
     logger.info(f"Resetting after a cooldown of {cooldown_time_in_seconds}s (prevents rapid reset loops)")
     sleep(cooldown_time_in_seconds)
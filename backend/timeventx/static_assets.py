@@ -0,0 +1,325 @@
+import json
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from timeventx._common import to_absolute_path
+from timeventx._logging import get_logger
+from timeventx.app_utils import get_content_type
+from timeventx.configuration import Configuration, ConfigurationNotFoundError
+
+GZIP_FILE_EXTENSION = ".gz"
+ARCHIVE_FILE_EXTENSION = ".pack"
+# How long files with the hash of their content in their name can be cached for (they are never changed, only replaced)
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# `stat` module does not exist for MicroPython
+_DIRECTORY_MODE = 0x4000
+# Vite's default output for bundled files is `assets/[name]-[hash][extname]`, where the hash is 8 base64url characters
+_HASHED_ASSETS_DIRECTORY = "assets/"
+_HASH_LENGTH = 8
+_HASH_CHARACTERS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-")
+# Archive starts with the magic bytes, the format version and the length of the (JSON) index that follows
+_ARCHIVE_MAGIC = b"TVXA"
+_ARCHIVE_VERSION = 1
+_ARCHIVE_HEADER_FORMAT = "<4sBI"
+# Length of the hex digest of each file's content kept in an archive (and used as its ETag)
+_ARCHIVE_HASH_LENGTH = 16
+
+logger = get_logger(__name__)
+
+
+class StaticAsset:
+    """
+    Static file served by the UI.
+    """
+
+    def __init__(self, path: str, size: int, content_type: str, etag: str, immutable: bool = False, offset: int = 0):
+        """
+        Constructor.
+        :param path: absolute path of the file (or of the archive containing it)
+        :param size: size of the file in bytes
+        :param content_type: content type of the file
+        :param etag: strong ETag of the file, derived from its size and modification time (or its content's hash)
+        :param immutable: whether the file's name changes whenever its content does, so it can be cached indefinitely
+        :param offset: where the file starts in the file at `path` (non-zero if in an archive)
+        """
+        self.path = path
+        self.size = size
+        self.content_type = content_type
+        self.etag = etag
+        self.immutable = immutable
+        self.offset = offset
+        # Gzip compressed copy of the file, if there is one
+        self.gzip_path: Optional[str] = None
+        self.gzip_size: Optional[int] = None
+        self.gzip_etag: Optional[str] = None
+        self.gzip_offset = 0
+
+
+class StaticAssetIndex:
+    """
+    Index of static files, by the URL path they are served at.
+
+    Built once, as the files are not expected to change whilst running. Only the files in the index can be served, so
+    paths outside of the frontend (e.g. `../secret`) are never found.
+    """
+
+    def __init__(self):
+        self._assets: dict[str, StaticAsset] = {}
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._assets)
+
+    def get(self, url_path: str) -> Optional[StaticAsset]:
+        """
+        Gets the static file served at the given URL path.
+        :param url_path: path relative to the root of the frontend, without a leading slash
+        :return: the static file, or `None` if there is no such file
+        """
+        return self._assets.get(url_path)
+
+    def open(self, asset: StaticAsset, compressed: bool = False) -> BinaryIO:
+        """
+        Opens the given static file for reading.
+        :param asset: static file in the index
+        :param compressed: whether to open the gzip compressed copy of the file
+        :return: the file's content, as a file-like object that is closed once read
+        """
+        return open(asset.gzip_path if compressed else asset.path, "rb")
+
+
+class DirectoryStaticAssetIndex(StaticAssetIndex):
+    """
+    Index of the static files in a directory, by their path relative to the directory.
+
+    A file with a `.gz` sibling (e.g. `index.js` and `index.js.gz`) is indexed with the sibling as its compressed copy,
+    rather than the sibling being indexed as a file of its own.
+    """
+
+    def __init__(self, root_directory: Path):
+        """
+        Constructor.
+        :param root_directory: directory containing the static files
+        """
+        super().__init__()
+        self.root_directory = to_absolute_path(str(root_directory))
+        try:
+            self._index_directory(self.root_directory, "")
+        except OSError as e:
+            logger.warning(f"Could not index static files in {self.root_directory}: {e}")
+        logger.info(f"Indexed {len(self._assets)} static files in {self.root_directory}")
+
+    def _index_directory(self, directory: str, url_path_prefix: str):
+        gzip_files: dict[str, tuple[str, tuple]] = {}
+        for name in os.listdir(directory):
+            path = f"{directory}/{name}"
+            url_path = f"{url_path_prefix}{name}"
+            # `os.stat` returns a tuple in MicroPython, rather than an object with named attributes
+            stat = os.stat(path)
+            if stat[0] & _DIRECTORY_MODE:
+                self._index_directory(path, f"{url_path}/")
+            elif name.endswith(GZIP_FILE_EXTENSION):
+                # Matched with the file they are a copy of once all the files in the directory are indexed
+                gzip_files[url_path] = (path, stat)
+            else:
+                self._assets[url_path] = StaticAsset(
+                    path, stat[6], get_content_type(Path(name)), _create_etag(stat), _is_content_hashed(url_path)
+                )
+
+        for url_path, (path, stat) in gzip_files.items():
+            asset = self._assets.get(url_path[: -len(GZIP_FILE_EXTENSION)])
+            if asset is None:
+                self._assets[url_path] = StaticAsset(path, stat[6], get_content_type(Path(path)), _create_etag(stat))
+            else:
+                asset.gzip_path = path
+                asset.gzip_size = stat[6]
+                # Different from the uncompressed file's ETag, as the content is different
+                asset.gzip_etag = _create_etag(stat, "-gz")
+
+
+class PackedStaticAssetIndex(StaticAssetIndex):
+    """
+    Index of the static files packed into an archive (see `pack_static_assets`).
+
+    The archive is kept open and every file is read from it, so serving a file does not need it to be looked up on the
+    filesystem and opened.
+    """
+
+    def __init__(self, archive_location: Path):
+        """
+        Constructor.
+        :param archive_location: location of the archive
+        """
+        super().__init__()
+        self.archive_location = to_absolute_path(str(archive_location))
+        self._archive: Optional[BinaryIO] = None
+        try:
+            self._archive = open(self.archive_location, "rb")
+            self._read_index()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not index static files in archive {self.archive_location}: {e}")
+            self._assets.clear()
+            self.close()
+        logger.info(f"Indexed {len(self._assets)} static files in archive {self.archive_location}")
+
+    def open(self, asset: StaticAsset, compressed: bool = False) -> BinaryIO:
+        if compressed:
+            return _FileRange(self._archive, asset.gzip_offset, asset.gzip_size)
+        return _FileRange(self._archive, asset.offset, asset.size)
+
+    def close(self):
+        """
+        Closes the archive.
+        """
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def _read_index(self):
+        header_size = struct.calcsize(_ARCHIVE_HEADER_FORMAT)
+        header = self._archive.read(header_size)
+        if len(header) < header_size:
+            raise ValueError("Archive is too short to have a header")
+        magic, version, index_size = struct.unpack(_ARCHIVE_HEADER_FORMAT, header)
+        if magic != _ARCHIVE_MAGIC or version != _ARCHIVE_VERSION:
+            raise ValueError(f"Not a version {_ARCHIVE_VERSION} static files archive")
+        index = json.loads(self._archive.read(index_size).decode())
+        # Offsets in the index are from the end of the index
+        data_offset = header_size + index_size
+        for url_path, offset, size, content_type, content_hash, gzip_offset, gzip_size in index:
+            asset = StaticAsset(
+                self.archive_location,
+                size,
+                content_type,
+                f'"{content_hash}"',
+                _is_content_hashed(url_path),
+                data_offset + offset,
+            )
+            if gzip_offset is not None:
+                asset.gzip_path = self.archive_location
+                asset.gzip_size = gzip_size
+                asset.gzip_etag = f'"{content_hash}-gz"'
+                asset.gzip_offset = data_offset + gzip_offset
+            self._assets[url_path] = asset
+
+
+class _FileRange:
+    """
+    File-like object for reading a range of bytes in a file.
+
+    The file is shared (e.g. the open archive that every packed static file is read from), so it is sought before every
+    read, and closing the range does not close it.
+    """
+
+    def __init__(self, file: BinaryIO, offset: int, size: int):
+        self._file = file
+        self._offset = offset
+        self._size = size
+        self._position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self._size - self._position
+        if size < 0 or size > remaining:
+            size = remaining
+        if size == 0:
+            return b""
+        self._file.seek(self._offset + self._position)
+        data = self._file.read(size)
+        self._position += len(data)
+        return data
+
+    def close(self):
+        """
+        Closes the range, so nothing more is read from it. The shared file is deliberately left open.
+        """
+        self._position = self._size
+
+
+def pack_static_assets(root_directory: Path, archive_location: Path) -> int:
+    """
+    Packs the static files in a directory into an archive, to be served using a `PackedStaticAssetIndex`.
+
+    Files are indexed in the same way as by `DirectoryStaticAssetIndex`, so `.gz` siblings are packed as compressed
+    copies.
+    :param root_directory: directory containing the static files
+    :param archive_location: location to write the archive to
+    :return: number of files packed
+    """
+    # Only needed when building, so not imported on the device
+    from hashlib import sha256
+
+    directory_index = DirectoryStaticAssetIndex(root_directory)
+    index = []
+    contents = []
+    data_size = 0
+    for url_path in directory_index:
+        asset = directory_index.get(url_path)
+        with directory_index.open(asset) as file:
+            content = file.read()
+        contents.append(content)
+        offset = data_size
+        data_size += len(content)
+        gzip_offset, gzip_size = None, None
+        if asset.gzip_path is not None:
+            with directory_index.open(asset, compressed=True) as file:
+                gzip_content = file.read()
+            contents.append(gzip_content)
+            gzip_offset, gzip_size = data_size, len(gzip_content)
+            data_size += gzip_size
+        content_hash = sha256(content).hexdigest()[:_ARCHIVE_HASH_LENGTH]
+        index.append((url_path, offset, len(content), asset.content_type, content_hash, gzip_offset, gzip_size))
+
+    serialised_index = json.dumps(index).encode()
+    with open(str(archive_location), "wb") as archive:
+        archive.write(struct.pack(_ARCHIVE_HEADER_FORMAT, _ARCHIVE_MAGIC, _ARCHIVE_VERSION, len(serialised_index)))
+        archive.write(serialised_index)
+        for content in contents:
+            archive.write(content)
+    return len(index)
+
+
+def create_static_asset_index(configuration: Configuration) -> StaticAssetIndex:
+    """
+    Creates the index of the frontend's static files, from the archive if one is configured, else from the directory.
+    :param configuration: configuration of the app
+    :return: index of the frontend's static files
+    """
+    archive_location = configuration.get(Configuration.FRONTEND_ARCHIVE_LOCATION)
+    if archive_location is not None:
+        return PackedStaticAssetIndex(archive_location)
+    return DirectoryStaticAssetIndex(get_frontend_root_directory(configuration))
+
+
+def get_frontend_root_directory(configuration: Configuration) -> Path:
+    """
+    Gets the directory containing the frontend's static files.
+    :param configuration: configuration of the app
+    :return: the frontend's directory
+    """
+    try:
+        return configuration[Configuration.FRONTEND_ROOT_DIRECTORY]
+    except ConfigurationNotFoundError:
+        # The pathlib library in use with MicroPython has a bug where `Path.resolve` returns a `str` instead of a `Path`
+        return Path(Path(__file__).resolve()).parent / "../../frontend/dist"
+
+
+def _create_etag(stat: tuple, suffix: str = "") -> str:
+    return f'"{stat[6]:x}-{int(stat[8]):x}{suffix}"'
+
+
+def _is_content_hashed(url_path: str) -> bool:
+    if not url_path.startswith(_HASHED_ASSETS_DIRECTORY):
+        return False
+    name = url_path[url_path.rfind("/") + 1 :]
+    extension_index = name.rfind(".")
+    stem = name[:extension_index] if extension_index > 0 else name
+    return (
+        len(stem) > _HASH_LENGTH + 1
+        and stem[-_HASH_LENGTH - 1] == "-"
+        and all(character in _HASH_CHARACTERS for character in stem[-_HASH_LENGTH:])
+    )
@@ -1,27 +1,37 @@
+import gzip
 import logging
 import os
+import shutil
 import tempfile
 from base64 import b64encode
 from copy import deepcopy
+from datetime import timedelta
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from microdot_asyncio_test_client import TestClient
 
 from timeventx._logging import get_logger, reset_logging, setup_logging
+from timeventx.actions.noop import NoopActionController
 from timeventx.app import API_VERSION, app
 from timeventx.configuration import Configuration
+from timeventx.static_assets import IMMUTABLE_MAX_AGE, pack_static_assets
 from timeventx.tests._common import (
     EXAMPLE_IDENTIFIABLE_TIMER_1,
     EXAMPLE_IDENTIFIABLE_TIMER_2,
     EXAMPLE_TIMER_1,
+    EXAMPLE_TIMER_2,
 )
+from timeventx.timer_runner import TimerRunner
 from timeventx.timers.collections.abc import IdentifiableTimersCollection
-from timeventx.timers.collections.listenable import ListenableTimersCollection
+from timeventx.timers.collections.database import CachedTimersDatabase, TimersDatabase
+from timeventx.timers.collections.listenable import Event, ListenableTimersCollection
 from timeventx.timers.collections.memory import InMemoryIdentifiableTimersCollection
-from timeventx.timers.serialisation import timer_to_json
+from timeventx.timers.intervals import MergedIntervalsIndex
+from timeventx.timers.serialisation import serialise_daytime, timer_to_json
+from timeventx.timers.timers import DayTime, IdentifiableTimer, Timer
 
 logger = get_logger(__name__)
 
@@ -71,6 +81,95 @@ async def test_get_timers(api_test_client: TestClient, database: IdentifiableTim
     ]
 
 
+@pytest.mark.asyncio
+async def test_get_timers_cached_until_changed(api_test_client: TestClient, database: ListenableTimersCollection):
+    database.add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+    first_response = await api_test_client.get(f"/api/{API_VERSION}/timers")
+
+    with patch("timeventx.app.timer_to_json", side_effect=AssertionError("Response rendered")):
+        response = await api_test_client.get(f"/api/{API_VERSION}/timers")
+    assert response.body == first_response.body
+
+    database.add(EXAMPLE_IDENTIFIABLE_TIMER_2)
+    response = await api_test_client.get(f"/api/{API_VERSION}/timers")
+    assert response.json == [
+        timer_to_json(timer) for timer in (EXAMPLE_IDENTIFIABLE_TIMER_1, EXAMPLE_IDENTIFIABLE_TIMER_2)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_timers_changed_externally(api_test_client: TestClient, tmp_path: Path):
+    database = ListenableTimersCollection(CachedTimersDatabase(tmp_path, check_for_external_changes=True))
+    api_test_client.app.database = database
+    api_test_client.app.timer_runner = TimerRunner(database, NoopActionController())
+    database.add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+    timers_etag = (await api_test_client.get(f"/api/{API_VERSION}/timers")).headers["ETag"]
+    intervals_etag = (await api_test_client.get(f"/api/{API_VERSION}/intervals")).headers["ETag"]
+
+    # Changed by something else, such as another process
+    TimersDatabase(tmp_path).add(EXAMPLE_IDENTIFIABLE_TIMER_2)
+
+    response = await api_test_client.get(f"/api/{API_VERSION}/timers", headers={"If-None-Match": timers_etag})
+    assert response.status_code == 200, response.text
+    assert response.json == [
+        timer_to_json(timer) for timer in (EXAMPLE_IDENTIFIABLE_TIMER_1, EXAMPLE_IDENTIFIABLE_TIMER_2)
+    ]
+    response = await api_test_client.get(f"/api/{API_VERSION}/intervals", headers={"If-None-Match": intervals_etag})
+    assert response.status_code == 200, response.text
+    assert response.json == [
+        {"startTime": serialise_daytime(interval.start_time), "endTime": serialise_daytime(interval.end_time)}
+        for interval in MergedIntervalsIndex.from_timer_seconds(
+            InMemoryIdentifiableTimersCollection(
+                (EXAMPLE_IDENTIFIABLE_TIMER_1, EXAMPLE_IDENTIFIABLE_TIMER_2)
+            ).iter_timer_seconds()
+        ).on_off_intervals
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_timers_not_modified(api_test_client: TestClient, database: ListenableTimersCollection):
+    database.add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+    first_response = await api_test_client.get(f"/api/{API_VERSION}/timers")
+    etag = first_response.headers["ETag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    response = await api_test_client.get(f"/api/{API_VERSION}/timers", headers={"If-None-Match": etag})
+    assert response.status_code == 304, response.text
+    assert response.body == b""
+    assert response.headers["ETag"] == etag
+
+    response = await api_test_client.get(f"/api/{API_VERSION}/timers", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304, response.text
+
+    database.add(EXAMPLE_IDENTIFIABLE_TIMER_2)
+    response = await api_test_client.get(f"/api/{API_VERSION}/timers", headers={"If-None-Match": etag})
+    assert response.status_code == 200, response.text
+    assert response.headers["ETag"] != etag
+    assert len(response.json) == 2
+
+
+@pytest.mark.asyncio
+async def test_polling_timers_only_transfers_changes(api_test_client: TestClient, database: ListenableTimersCollection):
+    for i in range(20):
+        database.add(Timer(f"timer-{i}", EXAMPLE_TIMER_1.start_time, EXAMPLE_TIMER_1.duration))
+
+    async def poll(etag: str | None) -> tuple[str, int]:
+        response = await api_test_client.get(
+            f"/api/{API_VERSION}/timers", headers={"If-None-Match": etag} if etag is not None else {}
+        )
+        return response.headers["ETag"], _get_bytes_on_wire(response)
+
+    etag, first_poll_bytes = await poll(None)
+    for _ in range(10):
+        etag, poll_bytes = await poll(etag)
+        # Each steady state poll transfers only the status line and headers
+        assert poll_bytes < first_poll_bytes / 4
+
+    database.add(EXAMPLE_TIMER_2)
+    _, changed_poll_bytes = await poll(etag)
+    assert changed_poll_bytes > first_poll_bytes
+
+
 @pytest.mark.asyncio
 async def test_get_timers_when_none(api_test_client: TestClient):
     response = await api_test_client.get(f"/api/{API_VERSION}/timers")
@@ -119,6 +218,38 @@ async def test_put_timer(api_test_client: TestClient):
     assert response.status_code == 201, response.text
 
 
+@pytest.mark.asyncio
+async def test_put_timer_replaces_timer(api_test_client: TestClient, database: ListenableTimersCollection):
+    database.add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+    listener = MagicMock()
+    database.add_listener(Event.TIMER_UPDATED, listener)
+    response = await api_test_client.put(
+        f"/api/{API_VERSION}/timer/{EXAMPLE_IDENTIFIABLE_TIMER_1.id}", body=timer_to_json(EXAMPLE_TIMER_2)
+    )
+    assert response.status_code == 201, response.text
+    updated_timer = IdentifiableTimer.from_timer(EXAMPLE_TIMER_2, EXAMPLE_IDENTIFIABLE_TIMER_1.id)
+    assert response.json == timer_to_json(updated_timer)
+    assert list(database) == [updated_timer]
+    listener.assert_called_once_with(EXAMPLE_IDENTIFIABLE_TIMER_1, updated_timer)
+
+
+@pytest.mark.asyncio
+async def test_put_timer_adds_with_url_id(api_test_client: TestClient, database: ListenableTimersCollection):
+    response = await api_test_client.put(f"/api/{API_VERSION}/timer/123", body=timer_to_json(EXAMPLE_TIMER_1))
+    assert response.status_code == 201, response.text
+    assert list(database) == [IdentifiableTimer.from_timer(EXAMPLE_TIMER_1, 123)]
+
+
+@pytest.mark.asyncio
+async def test_put_timer_with_different_id(api_test_client: TestClient, database: ListenableTimersCollection):
+    response = await api_test_client.put(
+        f"/api/{API_VERSION}/timer/{EXAMPLE_IDENTIFIABLE_TIMER_1.id + 1}",
+        body=timer_to_json(EXAMPLE_IDENTIFIABLE_TIMER_1),
+    )
+    assert response.status_code == 400, response.text
+    assert len(database) == 0
+
+
 @pytest.mark.asyncio
 async def test_delete_timer(api_test_client: TestClient, database: IdentifiableTimersCollection):
     database.add(EXAMPLE_IDENTIFIABLE_TIMER_1)
@@ -156,6 +287,131 @@ async def test_serve_file(api_test_client: TestClient, configuration: Configurat
     assert response.headers["Content-Type"] == "image/jpeg"
 
 
+@pytest.mark.asyncio
+async def test_serve_file_not_modified(api_test_client: TestClient, configuration: Configuration):
+    with tempfile.TemporaryDirectory() as temp_directory:
+        file_path = Path(temp_directory, "test.js")
+        file_path.write_text("content" * 100)
+
+        with patch.dict(os.environ, {Configuration.FRONTEND_ROOT_DIRECTORY.environment_variable_name: temp_directory}):
+            first_response = await api_test_client.get(f"/test.js")
+            etag = first_response.headers["ETag"]
+            response = await api_test_client.get(f"/test.js", headers={"If-None-Match": etag})
+            assert response.status_code == 304, response.text
+            assert _get_bytes_on_wire(response) < _get_bytes_on_wire(first_response)
+
+            # Static files are indexed once, so are only seen to change after a restart
+            file_path.write_text("changed content" * 100)
+            api_test_client.app.static_asset_index = None
+            response = await api_test_client.get(f"/test.js", headers={"If-None-Match": etag})
+    assert response.status_code == 200, response.text
+    assert response.headers["ETag"] != etag
+    assert response.text == "changed content" * 100
+
+
+@pytest.mark.asyncio
+async def test_serve_file_in_subdirectory(api_test_client: TestClient, configuration: Configuration):
+    with tempfile.TemporaryDirectory() as temp_directory:
+        os.makedirs(f"{temp_directory}/assets")
+        Path(temp_directory, "assets", "index.js").write_text("content")
+        original_cwd = os.getcwd()
+
+        with patch.dict(os.environ, {Configuration.FRONTEND_ROOT_DIRECTORY.environment_variable_name: temp_directory}):
+            response = await api_test_client.get(f"/assets/index.js")
+    assert response.status_code == 200, response.text
+    assert response.text == "content"
+    assert response.headers["Content-Type"] == "application/javascript"
+    assert os.getcwd() == original_cwd
+
+
+@pytest.mark.asyncio
+async def test_serve_compressed_file(api_test_client: TestClient, configuration: Configuration):
+    content = "content" * 100
+    compressed_content = gzip.compress(content.encode())
+    with tempfile.TemporaryDirectory() as temp_directory:
+        Path(temp_directory, "index.html").write_text(content)
+        Path(temp_directory, "index.html.gz").write_bytes(compressed_content)
+
+        with patch.dict(os.environ, {Configuration.FRONTEND_ROOT_DIRECTORY.environment_variable_name: temp_directory}):
+            response = await api_test_client.get(f"/", headers={"Accept-Encoding": "gzip, deflate, br"})
+            assert response.status_code == 200, response.text
+            assert response.body == compressed_content
+            assert response.headers["Content-Encoding"] == "gzip"
+            assert response.headers["Content-Type"] == "text/html"
+            assert response.headers["Vary"] == "Accept-Encoding"
+            compressed_etag = response.headers["ETag"]
+
+            response = await api_test_client.get(f"/", headers={"If-None-Match": compressed_etag})
+            assert response.status_code == 200, response.text
+            assert response.text == content
+            assert "Content-Encoding" not in response.headers
+            assert response.headers["ETag"] != compressed_etag
+
+            response = await api_test_client.get(f"/", headers={"Accept-Encoding": "gzip;q=0, identity"})
+            assert response.text == content
+
+            response = await api_test_client.get(
+                f"/", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed_etag}
+            )
+            assert response.status_code == 304, response.text
+
+            response = await api_test_client.get(f"/index.html.gz")
+    assert response.status_code == 404, response.text
+
+
+@pytest.mark.asyncio
+async def test_serve_file_cache_control(api_test_client: TestClient, configuration: Configuration):
+    with tempfile.TemporaryDirectory() as temp_directory:
+        os.makedirs(f"{temp_directory}/assets")
+        Path(temp_directory, "index.html").touch()
+        Path(temp_directory, "assets", "index-4ed993c7.js").touch()
+
+        with patch.dict(os.environ, {Configuration.FRONTEND_ROOT_DIRECTORY.environment_variable_name: temp_directory}):
+            index_response = await api_test_client.get(f"/")
+            asset_response = await api_test_client.get(f"/assets/index-4ed993c7.js")
+    assert index_response.headers["Cache-Control"] == "max-age=0"
+    assert asset_response.headers["Cache-Control"] == f"max-age={IMMUTABLE_MAX_AGE}, immutable"
+
+
+@pytest.mark.asyncio
+async def test_serve_packed_file(api_test_client: TestClient, configuration: Configuration):
+    content = "content" * 1000
+    with tempfile.TemporaryDirectory() as temp_directory:
+        os.makedirs(f"{temp_directory}/frontend/assets")
+        Path(temp_directory, "frontend", "index.html").write_text("index")
+        Path(temp_directory, "frontend", "assets", "index-4ed993c7.js").write_text(content)
+        Path(temp_directory, "frontend", "assets", "index-4ed993c7.js.gz").write_bytes(gzip.compress(content.encode()))
+        archive_location = Path(temp_directory, "frontend.pack")
+        pack_static_assets(Path(temp_directory, "frontend"), archive_location)
+        shutil.rmtree(f"{temp_directory}/frontend")
+
+        with patch.dict(
+            os.environ, {Configuration.FRONTEND_ARCHIVE_LOCATION.environment_variable_name: str(archive_location)}
+        ):
+            response = await api_test_client.get(f"/")
+            assert response.status_code == 200, response.text
+            assert response.text == "index"
+            assert response.headers["Content-Type"] == "text/html"
+            assert response.headers["Content-Length"] == str(len("index"))
+
+            response = await api_test_client.get(f"/assets/index-4ed993c7.js")
+            assert response.text == content
+            assert response.headers["Cache-Control"] == f"max-age={IMMUTABLE_MAX_AGE}, immutable"
+
+            response = await api_test_client.get(f"/assets/index-4ed993c7.js", headers={"Accept-Encoding": "gzip"})
+            assert gzip.decompress(response.body).decode() == content
+            assert response.headers["Content-Encoding"] == "gzip"
+
+            response = await api_test_client.get(
+                f"/assets/index-4ed993c7.js", headers={"If-None-Match": response.headers["ETag"]}
+            )
+            assert response.status_code == 200, response.text
+
+            response = await api_test_client.get(f"/../frontend.pack")
+            assert response.status_code == 404, response.text
+        api_test_client.app.static_asset_index.close()
+
+
 @pytest.mark.asyncio
 async def test_serve_file_unknown_type(api_test_client: TestClient, configuration: Configuration):
     with tempfile.TemporaryDirectory() as temp_directory:
@@ -225,6 +481,16 @@ async def test_double_slash_root(api_test_client: TestClient):
     assert response.status_code == 404, response.text
 
 
+@pytest.mark.asyncio
+async def test_get_config_not_modified(api_test_client: TestClient):
+    first_response = await api_test_client.get(f"/api/{API_VERSION}/config")
+    response = await api_test_client.get(
+        f"/api/{API_VERSION}/config", headers={"If-None-Match": first_response.headers["ETag"]}
+    )
+    assert response.status_code == 304, response.text
+    assert response.body == b""
+
+
 @pytest.mark.asyncio
 async def test_get_config(api_test_client: TestClient):
     example_wifi_ssid = "example_wifi_ssid"
@@ -257,3 +523,70 @@ async def test_authorisation(api_test_client: TestClient, configuration: Configu
             f"/api/{API_VERSION}/timers", headers={"Authorization": f"Basic {b64encode(b'user:pass').decode('UTF-8')}"}
         )
         assert response.status_code == 200, response.text
+
+
+@pytest.mark.asyncio
+async def test_get_transitions(api_test_client: TestClient, database: ListenableTimersCollection):
+    api_test_client.app.timer_runner = TimerRunner(database, NoopActionController())
+    database.add(EXAMPLE_TIMER_1)
+    response = await api_test_client.get(f"/api/{API_VERSION}/transitions")
+    assert response.status_code == 200, response.text
+    assert response.json == [
+        {"time": serialise_daytime(EXAMPLE_TIMER_1.start_time), "on": True},
+        {"time": serialise_daytime(EXAMPLE_TIMER_1.end_time), "on": False},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_transitions_on_whole_day(api_test_client: TestClient, database: ListenableTimersCollection):
+    api_test_client.app.timer_runner = TimerRunner(database, NoopActionController())
+    # Merged into intervals that only touch, so there are no transitions
+    database.add(Timer("first", DayTime(4, 0, 0), timedelta(hours=8)))
+    database.add(Timer("second", DayTime(12, 0, 0), timedelta(hours=4)))
+    database.add(Timer("third", DayTime(16, 0, 0), timedelta(hours=18)))
+    response = await api_test_client.get(f"/api/{API_VERSION}/transitions")
+    assert response.status_code == 200, response.text
+    assert response.json == [{"time": serialise_daytime(DayTime(0, 0, 0)), "on": True}]
+
+
+@pytest.mark.asyncio
+async def test_get_intervals_cached_until_schedule_changed(
+    api_test_client: TestClient, database: ListenableTimersCollection
+):
+    api_test_client.app.timer_runner = TimerRunner(database, NoopActionController())
+    database.add(EXAMPLE_TIMER_1)
+    first_response = await api_test_client.get(f"/api/{API_VERSION}/intervals")
+
+    with patch("timeventx.app.serialise_daytime", side_effect=AssertionError("Response rendered")):
+        response = await api_test_client.get(f"/api/{API_VERSION}/intervals")
+    assert response.body == first_response.body
+
+    database.add(EXAMPLE_TIMER_2)
+    response = await api_test_client.get(f"/api/{API_VERSION}/intervals")
+    assert response.json == [
+        {"startTime": serialise_daytime(interval.start_time), "endTime": serialise_daytime(interval.end_time)}
+        for interval in api_test_client.app.timer_runner.on_off_intervals
+    ]
+    assert response.body != first_response.body
+
+
+@pytest.mark.asyncio
+async def test_get_intervals_not_modified_until_schedule_changed(
+    api_test_client: TestClient, database: ListenableTimersCollection
+):
+    api_test_client.app.timer_runner = TimerRunner(database, NoopActionController())
+    database.add(EXAMPLE_TIMER_1)
+    etag = (await api_test_client.get(f"/api/{API_VERSION}/intervals")).headers["ETag"]
+
+    response = await api_test_client.get(f"/api/{API_VERSION}/intervals", headers={"If-None-Match": etag})
+    assert response.status_code == 304, response.text
+
+    database.add(EXAMPLE_TIMER_2)
+    response = await api_test_client.get(f"/api/{API_VERSION}/intervals", headers={"If-None-Match": etag})
+    assert response.status_code == 200, response.text
+
+
+def _get_bytes_on_wire(response) -> int:
+    # Status line, headers and body, as sent by the server (the test client does not expose the raw response)
+    headers = "".join(f"{name}: {value}\r\n" for name, value in response.headers.items())
+    return len(f"HTTP/1.0 {response.status_code} X\r\n{headers}\r\n".encode()) + len(response.body)
@@ -0,0 +1,36 @@
+from typing import Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from timeventx.app_utils import accepts_encoding
+
+
+def _create_request(accept_encoding: Optional[str]) -> MagicMock:
+    request = MagicMock()
+    request.headers = {} if accept_encoding is None else {"Accept-Encoding": accept_encoding}
+    return request
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, accepted",
+    [
+        (None, False),
+        ("", False),
+        ("gzip", True),
+        ("deflate, GZIP", True),
+        ("gzip;q=0.5", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, deflate", False),
+        ("deflate, br", False),
+        ("*", True),
+        ("*;q=0", False),
+        ("*, gzip;q=0", False),
+        ("gzip;q=0, *", False),
+        ("*;q=0, gzip", True),
+        ("gzip, *;q=0", True),
+        ("gzip;q=invalid", False),
+    ],
+)
+def test_accepts_encoding(accept_encoding: Optional[str], accepted: bool):
+    assert accepts_encoding(_create_request(accept_encoding), "gzip") == accepted
@@ -12,7 +12,11 @@ import requests
 
 from timeventx.app import API_VERSION
 from timeventx.configuration import Configuration
-from timeventx.main import main
+from timeventx.main import get_timers_database, main
+from timeventx.tests._common import EXAMPLE_TIMER_1
+from timeventx.timers.collections.database import TimersDatabase
+from timeventx.timers.collections.journal import JournalTimersCollection
+from timeventx.timers.collections.mapped import MappedTimersCollection
 
 ServiceLocation: TypeAlias = str
 
@@ -73,3 +77,24 @@ def test_main(url: ServiceLocation):
     response = requests.get(f"{url}/api/{API_VERSION}/timers")
     assert response.status_code == 200
     assert response.json() == []
+
+
+def test_get_timers_database_migrates_to_journal(tmp_path: Path):
+    added_timer = TimersDatabase(tmp_path / "timers").add(EXAMPLE_TIMER_1)
+    with patch.dict(
+        os.environ,
+        {Configuration.TIMERS_DATABASE_LOCATION.environment_variable_name: str(tmp_path / "timers.journal")},
+    ):
+        timers_database = get_timers_database(Configuration())
+    assert isinstance(timers_database, JournalTimersCollection)
+    assert list(timers_database) == [added_timer]
+
+
+def test_get_timers_database_mapped(tmp_path: Path):
+    with patch.dict(
+        os.environ,
+        {Configuration.TIMERS_DATABASE_LOCATION.environment_variable_name: str(tmp_path / "timers.mmap")},
+    ):
+        timers_database = get_timers_database(Configuration())
+    assert isinstance(timers_database, MappedTimersCollection)
+    timers_database.close()
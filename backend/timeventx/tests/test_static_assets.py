@@ -0,0 +1,179 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from timeventx.app_utils import ContentType
+from timeventx.static_assets import (
+    DirectoryStaticAssetIndex,
+    PackedStaticAssetIndex,
+    pack_static_assets,
+)
+
+
+@pytest.fixture
+def frontend_directory() -> str:
+    with tempfile.TemporaryDirectory() as temp_directory:
+        Path(temp_directory, "index.html").write_text("index")
+        os.makedirs(f"{temp_directory}/assets/images")
+        Path(temp_directory, "assets", "index.js").write_text("script")
+        Path(temp_directory, "assets", "images", "logo.svg").write_text("<svg/>")
+        yield temp_directory
+
+
+def test_index(frontend_directory: str):
+    index = DirectoryStaticAssetIndex(Path(frontend_directory))
+    assert sorted(index) == ["assets/images/logo.svg", "assets/index.js", "index.html"]
+
+    asset = index.get("assets/index.js")
+    assert asset.path == str(Path(frontend_directory, "assets", "index.js").resolve())
+    assert asset.size == len("script")
+    assert asset.content_type == ContentType.JAVASCRIPT
+    assert asset.etag.startswith('"') and asset.etag.endswith('"')
+
+
+def test_index_relative_directory(frontend_directory: str):
+    original_cwd = os.getcwd()
+    os.chdir(frontend_directory)
+    try:
+        index = DirectoryStaticAssetIndex(Path("assets/../assets"))
+    finally:
+        os.chdir(original_cwd)
+    assert index.root_directory == str(Path(frontend_directory, "assets").resolve())
+    assert index.get("index.js").path == str(Path(frontend_directory, "assets", "index.js").resolve())
+
+
+def test_index_etags_differ(frontend_directory: str):
+    index = DirectoryStaticAssetIndex(Path(frontend_directory))
+    assert index.get("index.html").etag != index.get("assets/index.js").etag
+
+
+def test_get_outside_directory(frontend_directory: str):
+    index = DirectoryStaticAssetIndex(Path(frontend_directory, "assets"))
+    assert index.get("../index.html") is None
+    assert index.get("/index.html") is None
+    assert index.get("images") is None
+
+
+def test_index_compressed_copies(frontend_directory: str):
+    Path(frontend_directory, "assets", "index.js.gz").write_bytes(b"compressed")
+    Path(frontend_directory, "archive.gz").write_bytes(b"archive")
+    index = DirectoryStaticAssetIndex(Path(frontend_directory))
+
+    asset = index.get("assets/index.js")
+    assert asset.gzip_path == str(Path(frontend_directory, "assets", "index.js.gz").resolve())
+    assert asset.gzip_size == len(b"compressed")
+    assert asset.gzip_etag not in (None, asset.etag)
+    assert index.get("assets/index.js.gz") is None
+    assert index.get("index.html").gzip_path is None
+    # Not a copy of another file
+    assert index.get("archive.gz").path == str(Path(frontend_directory, "archive.gz").resolve())
+
+
+@pytest.mark.parametrize(
+    "url_path, immutable",
+    [
+        ("assets/index-4ed993c7.js", True),
+        ("assets/index-a_B-9xYz.css", True),
+        ("assets/images/logo-4ed993c7.svg", True),
+        ("index-4ed993c7.js", False),
+        ("assets/index.js", False),
+        ("assets/settings.js", False),
+        ("assets/index-4ed993c.js", False),
+        ("assets/index-4ed993c!.js", False),
+    ],
+)
+def test_index_immutable(url_path: str, immutable: bool):
+    with tempfile.TemporaryDirectory() as temp_directory:
+        path = Path(temp_directory, url_path)
+        os.makedirs(str(path.parent), exist_ok=True)
+        path.touch()
+        assert DirectoryStaticAssetIndex(Path(temp_directory)).get(url_path).immutable == immutable
+
+
+def test_index_missing_directory(frontend_directory: str):
+    index = DirectoryStaticAssetIndex(Path(frontend_directory, "missing"))
+    assert len(index) == 0
+    assert index.get("index.html") is None
+
+
+def test_pack(frontend_directory: str):
+    Path(frontend_directory, "assets", "index.js.gz").write_bytes(b"compressed")
+    archive_location = Path(frontend_directory, "frontend.pack")
+    assert pack_static_assets(Path(frontend_directory), archive_location) == 3
+
+    index = PackedStaticAssetIndex(archive_location)
+    assert sorted(index) == ["assets/images/logo.svg", "assets/index.js", "index.html"]
+    for url_path, content in (("index.html", b"index"), ("assets/images/logo.svg", b"<svg/>")):
+        asset = index.get(url_path)
+        assert asset.size == len(content)
+        assert index.open(asset).read() == content
+        assert asset.gzip_path is None
+
+    asset = index.get("assets/index.js")
+    assert asset.content_type == ContentType.JAVASCRIPT
+    assert asset.path == str(archive_location.resolve())
+    assert index.open(asset).read() == b"script"
+    assert index.open(asset, compressed=True).read() == b"compressed"
+    assert asset.gzip_etag not in (None, asset.etag)
+    index.close()
+
+
+def test_pack_etags_from_content(frontend_directory: str):
+    archive_location = Path(frontend_directory, "frontend.pack")
+    pack_static_assets(Path(frontend_directory), archive_location)
+    index = PackedStaticAssetIndex(archive_location)
+    etag = index.get("index.html").etag
+    index.close()
+
+    # Same content at a different time is the same
+    Path(frontend_directory, "index.html").write_text("index")
+    pack_static_assets(Path(frontend_directory), archive_location)
+    index = PackedStaticAssetIndex(archive_location)
+    assert index.get("index.html").etag == etag
+    index.close()
+
+    Path(frontend_directory, "index.html").write_text("other")
+    pack_static_assets(Path(frontend_directory), archive_location)
+    index = PackedStaticAssetIndex(archive_location)
+    assert index.get("index.html").etag != etag
+    index.close()
+
+
+def test_packed_reads_interleaved(frontend_directory: str):
+    Path(frontend_directory, "index.html").write_text("0123456789")
+    archive_location = Path(frontend_directory, "frontend.pack")
+    pack_static_assets(Path(frontend_directory), archive_location)
+    index = PackedStaticAssetIndex(archive_location)
+
+    # Files are read from the same open archive, so reads of different files can be interleaved (e.g. when requests are
+    # served concurrently)
+    index_file = index.open(index.get("index.html"))
+    script_file = index.open(index.get("assets/index.js"))
+    assert index_file.read(4) == b"0123"
+    assert script_file.read(3) == b"scr"
+    assert index_file.read(4) == b"4567"
+    assert script_file.read() == b"ipt"
+    assert index_file.read(100) == b"89"
+    assert index_file.read(100) == b""
+    index.close()
+
+
+def test_packed_close_leaves_archive_open(frontend_directory: str):
+    archive_location = Path(frontend_directory, "frontend.pack")
+    pack_static_assets(Path(frontend_directory), archive_location)
+    index = PackedStaticAssetIndex(archive_location)
+
+    index_file = index.open(index.get("index.html"))
+    index_file.close()
+    assert index_file.read() == b""
+    assert index.open(index.get("assets/index.js")).read() == b"script"
+    index.close()
+
+
+def test_packed_invalid_archive(frontend_directory: str):
+    index = PackedStaticAssetIndex(Path(frontend_directory, "index.html"))
+    assert len(index) == 0
+    index = PackedStaticAssetIndex(Path(frontend_directory, "missing.pack"))
+    assert len(index) == 0
@@ -2,7 +2,7 @@ import asyncio
 from dataclasses import dataclass
 from datetime import timedelta
 from typing import Awaitable, Callable, Generic, Iterable, TypeVar
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -12,10 +12,14 @@ from timeventx.tests._common import (
     EXAMPLE_TIMERS,
     create_example_timer,
 )
+from timeventx.tests.timers.test_clock import FakeClocks
 from timeventx.timer_runner import NoTimersError, TimerRunner
+from timeventx.timers.bitmap import BitmapSchedule
+from timeventx.timers.clock import MonotonicClock
 from timeventx.timers.collections.listenable import ListenableTimersCollection
 from timeventx.timers.collections.memory import InMemoryIdentifiableTimersCollection
-from timeventx.timers.intervals import TimeInterval
+from timeventx.timers.collections.table import TimerTable
+from timeventx.timers.intervals import MergedIntervalsIndex, TimeInterval
 from timeventx.timers.serialisation import deserialise_daytime
 from timeventx.timers.timers import DayTime
 
@@ -77,6 +81,76 @@ class TestTimerRunner:
             _create_interval("23:00:00", timedelta(hours=2)),
         )
 
+    def test_on_off_intervals_updated_without_reading_timers(self):
+        timer_runner, *_ = _create_timer_runner(EXAMPLE_TIME_INTERVALS)
+        with patch.object(InMemoryIdentifiableTimersCollection, "__iter__", side_effect=AssertionError("Timers read")):
+            timer = timer_runner.timers.add(create_example_timer("05:00:00", timedelta(hours=1)))
+            assert _create_interval("05:00:00", timedelta(hours=1)) in timer_runner.on_off_intervals
+            timer_runner.timers.remove(timer.id)
+            assert _create_interval("05:00:00", timedelta(hours=1)) not in timer_runner.on_off_intervals
+
+    def test_on_off_intervals_from_timer_table_columns(self):
+        timers = TimerTable()
+        for start_time, duration in EXAMPLE_TIME_INTERVALS:
+            timers.add(create_example_timer(start_time, duration).to_timer())
+        with patch.object(TimerTable, "_create_timer", side_effect=AssertionError("Timer created")):
+            timer_runner = TimerRunner(ListenableTimersCollection(timers), MockActionController())
+            assert timer_runner.on_off_intervals == (
+                _create_interval("01:30:00", timedelta(hours=1)),
+                _create_interval("12:00:00", timedelta(hours=1)),
+                _create_interval("23:00:00", timedelta(hours=2)),
+            )
+
+    def test_transition_plan_replaced_when_timers_change(self):
+        timer_runner, *_ = _create_timer_runner(EXAMPLE_TIME_INTERVALS)
+        transition_plan = timer_runner.transition_plan
+        assert timer_runner.transition_plan is transition_plan
+        timer_runner.timers.add(create_example_timer("05:00:00", timedelta(hours=1)))
+        assert timer_runner.transition_plan is not transition_plan
+        assert DayTime(5, 0, 0).as_seconds() in timer_runner.transition_plan.seconds
+
+    def test_on_off_intervals_updated_when_timer_replaced(self):
+        timer_runner, *_ = _create_timer_runner(EXAMPLE_TIME_INTERVALS)
+        timer = timer_runner.timers.add(create_example_timer("05:00:00", timedelta(hours=1)))
+        transition_plan = timer_runner.transition_plan
+        with patch.object(InMemoryIdentifiableTimersCollection, "__iter__", side_effect=AssertionError("Timers read")):
+            timer_runner.timers.replace(timer.id, create_example_timer("07:00:00", timedelta(hours=1)).to_timer())
+        assert _create_interval("05:00:00", timedelta(hours=1)) not in timer_runner.on_off_intervals
+        assert _create_interval("07:00:00", timedelta(hours=1)) in timer_runner.on_off_intervals
+        assert timer_runner.transition_plan is not transition_plan
+        assert timer_runner.timers_change_event.is_set()
+
+    def test_schedule_recovers_after_timers_with_no_end_time(self):
+        timer_runner, time_setter, _ = _create_timer_runner(current_time=DayTime(23, 0, 0))
+        first_timer = timer_runner.timers.add(create_example_timer("07:00:00", timedelta(hours=15)))
+        with pytest.raises(ValueError):
+            # Added to the timers, but cannot be added to the schedule
+            timer_runner.timers.add(create_example_timer("22:00:00", timedelta(hours=9)).to_timer())
+        assert len(timer_runner.timers) == 2
+
+        timer_runner.timers.remove(first_timer.id)
+        assert timer_runner.on_off_intervals == (_create_interval("22:00:00", timedelta(hours=9)),)
+        assert timer_runner.is_on()
+
+    def test_schedule_built_once_for_bulk_change(self):
+        schedule_factory = MagicMock(side_effect=MergedIntervalsIndex.from_timer_seconds)
+        timer_runner = TimerRunner(
+            ListenableTimersCollection(InMemoryIdentifiableTimersCollection()),
+            MockActionController(),
+            schedule_factory=schedule_factory,
+        )
+        schedule_factory.reset_mock()
+        timer_runner.timers.replace_all(
+            create_example_timer(start_time, duration) for start_time, duration in EXAMPLE_TIME_INTERVALS
+        )
+        schedule_factory.assert_called_once()
+        assert timer_runner.on_off_intervals == (
+            _create_interval("01:30:00", timedelta(hours=1)),
+            _create_interval("12:00:00", timedelta(hours=1)),
+            _create_interval("23:00:00", timedelta(hours=2)),
+        )
+        assert timer_runner.timers_change_event.is_set()
+
     def test_is_on_no_timers(self):
         timer_runner, *_ = _create_timer_runner()
         assert not timer_runner.is_on()
@@ -93,6 +167,35 @@ class TestTimerRunner:
             time_setter.value = time
             assert not timer_runner.is_on()
 
+    def test_is_on_with_clock(self):
+        fake_clocks = FakeClocks(DayTime(0, 30, 0).as_seconds())
+        clock = MonotonicClock(timedelta(hours=1), fake_clocks.get_wall_clock_seconds, fake_clocks.get_ticks_ms)
+        timers = (create_example_timer(start_time, duration) for start_time, duration in EXAMPLE_TIME_INTERVALS)
+        timer_runner = TimerRunner(
+            ListenableTimersCollection(InMemoryIdentifiableTimersCollection(timers)),
+            MockActionController(),
+            current_time_getter=clock,
+        )
+        assert timer_runner.is_on()
+        fake_clocks.advance(2 * 60 * 60)
+        assert not timer_runner.is_on()
+
+    def test_is_on_with_bitmap_schedule(self):
+        time_setter = TimeSetter(DayTime(0, 30, 0))
+        timers = (create_example_timer(start_time, duration) for start_time, duration in EXAMPLE_TIME_INTERVALS)
+        timer_runner = TimerRunner(
+            ListenableTimersCollection(InMemoryIdentifiableTimersCollection(timers)),
+            MockActionController(),
+            current_time_getter=lambda: time_setter.value,
+            schedule_factory=BitmapSchedule.from_timer_seconds,
+        )
+        assert timer_runner.is_on()
+        time_setter.value = DayTime(2, 35, 0)
+        assert not timer_runner.is_on()
+        timer_runner.timers.add(create_example_timer("02:30:00", timedelta(hours=1)))
+        assert timer_runner.is_on()
+        assert timer_runner.next_interval() == (_create_interval("01:30:00", timedelta(hours=2)), True)
+
     def test_next_interval_no_timers(self):
         timer_runner, *_ = _create_timer_runner()
         with pytest.raises(NoTimersError):
@@ -148,6 +251,17 @@ class TestTimerRunner:
         with pytest.raises(RuntimeError):
             await timer_runner.run()
 
+    @pytest.mark.asyncio
+    async def test_run_stop_when_idle(self):
+        timer_runner, _, action_controller = _create_timer_runner()
+        task = asyncio.create_task(timer_runner.run())
+        await _short_sleep()
+
+        # Only the stop event is set, so the runner must not be waiting on the timers change event alone
+        timer_runner.run_stop_event.set()
+        await asyncio.wait_for(task, 1)
+        action_controller.assert_actions_called(False, False)
+
     @pytest.mark.asyncio
     async def test_run_timer_in_future_on_start(self):
         start_time = DayTime(0, 0, 0)
@@ -175,6 +289,30 @@ class TestTimerRunner:
             start_time,
         )
 
+    @pytest.mark.asyncio
+    async def test_run_sleeps_until_transition(self):
+        start_time = DayTime(0, 0, 0)
+        timer_runner, time_setter, action_controller = _create_timer_runner(
+            ((start_time + timedelta(hours=1), timedelta(seconds=1)),), start_time
+        )
+        time_reads = 0
+        original_current_seconds_getter = timer_runner._current_seconds_getter
+
+        def current_seconds_getter() -> int:
+            nonlocal time_reads
+            time_reads += 1
+            return original_current_seconds_getter()
+
+        timer_runner._current_seconds_getter = current_seconds_getter
+        timer_runner.minimum_time_accuracy = timedelta(microseconds=1)
+        task = asyncio.create_task(timer_runner.run())
+        await _short_sleep()
+
+        timer_runner.run_stop_event.set()
+        await task
+        assert time_reads < 5
+        action_controller.assert_actions_called(False, False)
+
     @pytest.mark.asyncio
     async def test_run_timer_reached_on_start(self):
         start_time = DayTime(0, 0, 0)
@@ -294,6 +432,31 @@ class TestTimerRunner:
             start_time=start_time,
         )
 
+    @pytest.mark.asyncio
+    async def test_run_timers_touching_over_whole_day(self):
+        # Merged into intervals that only touch, so there are no transitions
+        start_duration_pairs = (
+            (DayTime(4, 0, 0), timedelta(hours=8)),
+            (DayTime(12, 0, 0), timedelta(hours=4)),
+            (DayTime(16, 0, 0), timedelta(hours=18)),
+        )
+
+        async def actions_during_run(
+            timer_runner: TimerRunner, time_setter: TimeSetter, action_controller: MockActionController
+        ):
+            assert len(timer_runner.transition_plan) == 0
+            assert timer_runner.is_on()
+            # Timeout so the test fails, rather than hangs, if the runner does not turn on
+            await asyncio.wait_for(action_controller.on_action_called_event.wait(), 1)
+            await _short_sleep()
+            action_controller.assert_actions_called(True, False)
+
+        await self._test_run(
+            start_duration_pairs,
+            actions_during_run=actions_during_run,
+            start_time=DayTime(20, 0, 0),
+        )
+
     @pytest.mark.asyncio
     async def test_run_stop_when_on(self):
         start_time = DayTime(0, 0, 0)
@@ -0,0 +1,152 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from timeventx.tests._common import create_example_timer
+from timeventx.timers.bitmap import SECOND_RESOLUTION, BitmapSchedule
+from timeventx.timers.intervals import MergedIntervalsIndex, TimeInterval
+from timeventx.timers.serialisation import deserialise_daytime
+from timeventx.timers.timers import DayTime, TimerId
+
+
+def _to_time_interval(serialised_start_time: str, serialised_end_time: str) -> TimeInterval:
+    return TimeInterval(deserialise_daytime(serialised_start_time), deserialise_daytime(serialised_end_time))
+
+
+def _to_seconds(serialised_time: str) -> int:
+    return deserialise_daytime(serialised_time).as_seconds()
+
+
+class TestBitmapSchedule:
+    def test_empty(self):
+        schedule = BitmapSchedule()
+        assert len(schedule) == 0
+        assert schedule.on_off_intervals == ()
+        assert not schedule.is_on(0)
+
+    def test_unsupported_resolution(self):
+        with pytest.raises(ValueError):
+            BitmapSchedule(resolution=7)
+
+    def test_on_off_intervals(self):
+        schedule = BitmapSchedule(
+            (
+                create_example_timer("23:55:00", timedelta(minutes=10)),
+                create_example_timer("01:00:00", timedelta(minutes=10)),
+                create_example_timer("01:05:00", timedelta(minutes=10)),
+                create_example_timer("12:00:00", timedelta(hours=1)),
+            )
+        )
+        assert schedule.on_off_intervals == (
+            _to_time_interval("01:00:00", "01:15:00"),
+            _to_time_interval("12:00:00", "13:00:00"),
+            _to_time_interval("23:55:00", "00:05:00"),
+        )
+
+    def test_on_off_intervals_touching_joined(self):
+        schedule = BitmapSchedule(
+            (
+                create_example_timer("01:00:00", timedelta(hours=1)),
+                create_example_timer("02:00:00", timedelta(hours=1)),
+            )
+        )
+        assert schedule.on_off_intervals == (_to_time_interval("01:00:00", "03:00:00"),)
+
+    def test_rounded_to_resolution(self):
+        schedule = BitmapSchedule((create_example_timer("01:00:30", timedelta(seconds=60)),))
+        assert schedule.on_off_intervals == (_to_time_interval("01:00:00", "01:02:00"),)
+
+    def test_second_resolution(self):
+        schedule = BitmapSchedule(
+            (create_example_timer("01:00:30", timedelta(seconds=61)),), resolution=SECOND_RESOLUTION
+        )
+        assert schedule.on_off_intervals == (_to_time_interval("01:00:30", "01:01:31"),)
+        assert not schedule.is_on(_to_seconds("01:00:29"))
+        assert schedule.is_on(_to_seconds("01:00:30"))
+        assert not schedule.is_on(_to_seconds("01:01:31"))
+
+    def test_from_timer_seconds(self):
+        schedule = BitmapSchedule.from_timer_seconds(((TimerId(0), _to_seconds("23:00:00"), 2 * 60 * 60),))
+        assert len(schedule) == 1
+        assert schedule.on_off_intervals == (_to_time_interval("23:00:00", "01:00:00"),)
+
+    def test_is_on(self):
+        schedule = BitmapSchedule(
+            (
+                create_example_timer("01:00:00", timedelta(hours=1)),
+                create_example_timer("23:00:00", timedelta(hours=2)),
+            )
+        )
+        for time in ("00:00:00", "00:59:59", "01:00:00", "01:59:59", "23:00:00", "23:59:59"):
+            assert schedule.is_on(_to_seconds(time))
+        for time in ("02:00:00", "12:00:00", "22:59:59"):
+            assert not schedule.is_on(_to_seconds(time))
+
+    def test_next_interval(self):
+        schedule = BitmapSchedule(
+            (
+                create_example_timer("01:00:00", timedelta(hours=1)),
+                create_example_timer("12:00:00", timedelta(hours=1)),
+                create_example_timer("23:00:00", timedelta(minutes=105)),
+            )
+        )
+        wrapping_interval = _to_time_interval("23:00:00", "00:45:00")
+        assert schedule.next_interval(_to_seconds("00:30:00")) == (wrapping_interval, True)
+        assert schedule.next_interval(_to_seconds("23:30:00")) == (wrapping_interval, True)
+        assert schedule.next_interval(_to_seconds("00:50:00")) == (_to_time_interval("01:00:00", "02:00:00"), False)
+        assert schedule.next_interval(_to_seconds("01:59:59")) == (_to_time_interval("01:00:00", "02:00:00"), True)
+        assert schedule.next_interval(_to_seconds("02:00:00")) == (_to_time_interval("12:00:00", "13:00:00"), False)
+        assert schedule.next_interval(_to_seconds("13:00:00")) == (wrapping_interval, False)
+
+    def test_next_interval_wraps_to_first(self):
+        schedule = BitmapSchedule((create_example_timer("01:00:00", timedelta(hours=1)),))
+        assert schedule.next_interval(_to_seconds("23:00:00")) == (_to_time_interval("01:00:00", "02:00:00"), False)
+
+    def test_next_interval_when_empty(self):
+        with pytest.raises(IndexError):
+            BitmapSchedule().next_interval(0)
+
+    def test_add(self):
+        schedule = BitmapSchedule((create_example_timer("01:00:00", timedelta(minutes=10)),))
+        schedule.add(create_example_timer("01:05:00", timedelta(minutes=10)))
+        assert schedule.on_off_intervals == (_to_time_interval("01:00:00", "01:15:00"),)
+
+    def test_add_duplicate(self):
+        timer = create_example_timer("01:00:00", timedelta(minutes=10))
+        schedule = BitmapSchedule((timer,))
+        with pytest.raises(ValueError):
+            schedule.add(timer)
+
+    def test_add_no_end_time(self):
+        schedule = BitmapSchedule((create_example_timer("00:00:00", timedelta(hours=23)),))
+        with pytest.raises(ValueError):
+            schedule.add(create_example_timer("23:00:00", timedelta(hours=1)))
+        assert len(schedule) == 1
+        assert schedule.on_off_intervals == (_to_time_interval("00:00:00", "23:00:00"),)
+
+    def test_remove(self):
+        timers = (
+            create_example_timer("01:00:00", timedelta(minutes=10)),
+            create_example_timer("01:05:00", timedelta(minutes=10)),
+        )
+        schedule = BitmapSchedule(timers)
+        assert schedule.remove(timers[1].id)
+        assert not schedule.remove(timers[1].id)
+        assert schedule.on_off_intervals == (_to_time_interval("01:00:00", "01:10:00"),)
+
+    def test_matches_merged_intervals_index(self):
+        randomiser = random.Random(0)
+        for _ in range(20):
+            timers = [
+                create_example_timer(
+                    DayTime.from_seconds(randomiser.randrange(0, 24 * 60) * 60),
+                    timedelta(minutes=randomiser.randint(1, 120)),
+                )
+                for _ in range(randomiser.randint(1, 20))
+            ]
+            index = MergedIntervalsIndex(timers)
+            schedule = BitmapSchedule(timers)
+            for _ in range(100):
+                seconds = randomiser.randrange(0, 24 * 60 * 60)
+                assert schedule.is_on(seconds) == index.is_on(seconds)
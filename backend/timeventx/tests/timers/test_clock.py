@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from timeventx.timers.clock import MonotonicClock
+from timeventx.timers.timers import SECONDS_IN_A_DAY, DayTime
+
+
+class FakeClocks:
+    def __init__(self, wall_clock_seconds: int = 0, ticks_ms: int = 0):
+        self.wall_clock_seconds = wall_clock_seconds
+        self.ticks_ms = ticks_ms
+        self.wall_clock_reads = 0
+
+    def get_wall_clock_seconds(self) -> int:
+        self.wall_clock_reads += 1
+        return self.wall_clock_seconds
+
+    def get_ticks_ms(self) -> int:
+        return self.ticks_ms
+
+    def advance(self, seconds: int, drift_in_seconds: int = 0):
+        self.ticks_ms += seconds * 1000
+        self.wall_clock_seconds = (self.wall_clock_seconds + seconds + drift_in_seconds) % SECONDS_IN_A_DAY
+
+
+def _create_clock(fake_clocks: FakeClocks, resync_interval: timedelta = timedelta(hours=1)) -> MonotonicClock:
+    return MonotonicClock(resync_interval, fake_clocks.get_wall_clock_seconds, fake_clocks.get_ticks_ms)
+
+
+class TestMonotonicClock:
+    def test_anchored_to_wall_clock(self):
+        fake_clocks = FakeClocks(DayTime(12, 30, 15).as_seconds(), ticks_ms=123456)
+        clock = _create_clock(fake_clocks)
+        assert clock() == DayTime(12, 30, 15)
+        assert clock.seconds_of_day() == DayTime(12, 30, 15).as_seconds()
+
+    def test_time_from_ticks(self):
+        fake_clocks = FakeClocks(DayTime(12, 0, 0).as_seconds())
+        clock = _create_clock(fake_clocks)
+        fake_clocks.ticks_ms += 90_500
+        assert clock() == DayTime(12, 1, 30)
+        assert fake_clocks.wall_clock_reads == 1
+
+    def test_unaffected_by_wall_clock_change_between_resyncs(self):
+        fake_clocks = FakeClocks(DayTime(12, 0, 0).as_seconds())
+        clock = _create_clock(fake_clocks)
+        fake_clocks.advance(60, drift_in_seconds=600)
+        assert clock() == DayTime(12, 1, 0)
+
+    def test_wraps_at_midnight(self):
+        fake_clocks = FakeClocks(DayTime(23, 59, 59).as_seconds())
+        clock = _create_clock(fake_clocks)
+        fake_clocks.advance(2)
+        assert clock() == DayTime(0, 0, 1)
+
+    def test_resync(self):
+        fake_clocks = FakeClocks(DayTime(12, 0, 0).as_seconds())
+        clock = _create_clock(fake_clocks, timedelta(minutes=10))
+        fake_clocks.advance(10 * 60, drift_in_seconds=3)
+        assert clock() == DayTime(12, 10, 3)
+        assert clock.drift == timedelta(seconds=3)
+        assert fake_clocks.wall_clock_reads == 2
+
+    def test_resync_negative_drift_over_midnight(self):
+        fake_clocks = FakeClocks(DayTime(23, 59, 0).as_seconds())
+        clock = _create_clock(fake_clocks, timedelta(minutes=1))
+        fake_clocks.advance(60, drift_in_seconds=-2)
+        assert clock() == DayTime(23, 59, 58)
+        assert clock.drift == timedelta(seconds=-2)
+
+    def test_drift_when_not_resynced(self):
+        clock = _create_clock(FakeClocks())
+        assert clock.drift == timedelta(0)
+
+    def test_real_clocks(self):
+        clock = MonotonicClock()
+        assert (clock.seconds_of_day() - DayTime.now().as_seconds()) % SECONDS_IN_A_DAY in (0, 1, SECONDS_IN_A_DAY - 1)
@@ -1,6 +1,9 @@
+import json
+import random
+from datetime import timedelta
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -11,10 +14,22 @@ from timeventx.tests._common import (
     EXAMPLE_TIMERS,
 )
 from timeventx.timers.collections.abc import IdentifiableTimersCollection
-from timeventx.timers.collections.database import TimersDatabase
+from timeventx.timers.collections.binary import (
+    _FILE_HEADER_SIZE,
+    BinaryTimersCollection,
+)
+from timeventx.timers.collections.database import CachedTimersDatabase, TimersDatabase
+from timeventx.timers.collections.journal import JournalTimersCollection
 from timeventx.timers.collections.listenable import Event, ListenableTimersCollection
+from timeventx.timers.collections.mapped import (
+    MAXIMUM_NAME_LENGTH,
+    MappedTimersCollection,
+)
 from timeventx.timers.collections.memory import InMemoryIdentifiableTimersCollection
-from timeventx.timers.timers import IdentifiableTimer, TimerId
+from timeventx.timers.collections.sqlite import SqliteTimersCollection
+from timeventx.timers.collections.table import TimerTable
+from timeventx.timers.serialisation import TIMER_RECORD_HEADER_SIZE
+from timeventx.timers.timers import DayTime, IdentifiableTimer, Timer, TimerId
 
 
 def timers_database() -> TimersDatabase:
@@ -23,6 +38,35 @@ def timers_database() -> TimersDatabase:
         yield TimersDatabase(Path(tmpdir) / "test.db")
 
 
+def cached_timers_database() -> CachedTimersDatabase:
+    with TemporaryDirectory() as tmpdir:
+        yield CachedTimersDatabase(Path(tmpdir) / "test.db", check_for_external_changes=True)
+
+
+def journal_timers_collection() -> JournalTimersCollection:
+    with TemporaryDirectory() as tmpdir:
+        yield JournalTimersCollection(Path(tmpdir) / "timers.journal")
+
+
+def binary_timers_collection() -> BinaryTimersCollection:
+    with TemporaryDirectory() as tmpdir:
+        yield BinaryTimersCollection(Path(tmpdir) / "timers.bin")
+
+
+def mapped_timers_collection() -> MappedTimersCollection:
+    with TemporaryDirectory() as tmpdir:
+        collection = MappedTimersCollection(Path(tmpdir) / "timers.mmap")
+        yield collection
+        collection.close()
+
+
+def sqlite_timers_collection() -> SqliteTimersCollection:
+    with TemporaryDirectory() as tmpdir:
+        collection = SqliteTimersCollection(Path(tmpdir) / "timers.sqlite")
+        yield collection
+        collection.close()
+
+
 def in_memory_timers_collection() -> InMemoryIdentifiableTimersCollection:
     yield InMemoryIdentifiableTimersCollection()
 
@@ -31,7 +75,23 @@ def listenable_timers_collection() -> ListenableTimersCollection:
     yield ListenableTimersCollection(InMemoryIdentifiableTimersCollection())
 
 
-@pytest.fixture(params=[timers_database, in_memory_timers_collection, listenable_timers_collection])
+def timer_table() -> TimerTable:
+    yield TimerTable()
+
+
+@pytest.fixture(
+    params=[
+        timers_database,
+        cached_timers_database,
+        journal_timers_collection,
+        binary_timers_collection,
+        mapped_timers_collection,
+        sqlite_timers_collection,
+        in_memory_timers_collection,
+        listenable_timers_collection,
+        timer_table,
+    ]
+)
 def timers_collection(request: pytest.FixtureRequest):
     yield from request.param()
 
@@ -41,6 +101,11 @@ def listenable() -> ListenableTimersCollection:
     return next(listenable_timers_collection())
 
 
+@pytest.fixture
+def sqlite_collection() -> SqliteTimersCollection:
+    yield from sqlite_timers_collection()
+
+
 class TestIdentifiableTimersCollection:
     def test_len_when_zero(self, timers_collection: IdentifiableTimersCollection):
         assert len(timers_collection) == 0
@@ -105,6 +170,529 @@ class TestIdentifiableTimersCollection:
     def test_contains_when_not_exists(self, timers_collection: IdentifiableTimersCollection):
         assert TimerId(123) not in timers_collection
 
+    def test_replace(self, timers_collection: IdentifiableTimersCollection):
+        added_timers = timers_collection.add_many([EXAMPLE_TIMER_1, EXAMPLE_TIMER_2])
+        replacement_timer = timers_collection.replace(added_timers[0].id, EXAMPLE_TIMER_2)
+        assert replacement_timer == IdentifiableTimer.from_timer(EXAMPLE_TIMER_2, added_timers[0].id)
+        assert timers_collection.get(added_timers[0].id) == replacement_timer
+        assert set(timers_collection) == {replacement_timer, added_timers[1]}
+
+    def test_replace_when_does_not_exist(self, timers_collection: IdentifiableTimersCollection):
+        with pytest.raises(KeyError):
+            timers_collection.replace(TimerId(123), EXAMPLE_TIMER_1)
+        assert len(timers_collection) == 0
+
+    def test_replace_with_different_id(self, timers_collection: IdentifiableTimersCollection):
+        added_timer = timers_collection.add(EXAMPLE_TIMER_1)
+        with pytest.raises(ValueError):
+            timers_collection.replace(added_timer.id, IdentifiableTimer.from_timer(EXAMPLE_TIMER_2, added_timer.id + 1))
+        assert list(timers_collection) == [added_timer]
+
+    def test_bulk_add_many(self, timers_collection: IdentifiableTimersCollection):
+        added_timers = timers_collection.add_many(EXAMPLE_TIMERS)
+        assert [timer.to_timer() for timer in added_timers] == [
+            timer.to_timer() if isinstance(timer, IdentifiableTimer) else timer for timer in EXAMPLE_TIMERS
+        ]
+        assert len({timer.id for timer in added_timers}) == len(EXAMPLE_TIMERS)
+        assert set(timers_collection) == set(added_timers)
+
+    def test_bulk_add_many_with_duplicate_id(self, timers_collection: IdentifiableTimersCollection):
+        timers_collection.add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+        with pytest.raises(ValueError):
+            timers_collection.add_many([EXAMPLE_TIMER_2, EXAMPLE_IDENTIFIABLE_TIMER_1])
+        assert list(timers_collection) == [EXAMPLE_IDENTIFIABLE_TIMER_1]
+
+    def test_bulk_remove_many(self, timers_collection: IdentifiableTimersCollection):
+        added_timers = timers_collection.add_many(EXAMPLE_TIMERS)
+        removed_timer_ids = timers_collection.remove_many([added_timers[0].id, TimerId(123), added_timers[2].id])
+        assert removed_timer_ids == [added_timers[0].id, added_timers[2].id]
+        assert set(timers_collection) == {added_timers[1], *added_timers[3:]}
+
+    def test_bulk_replace_all(self, timers_collection: IdentifiableTimersCollection):
+        timers_collection.add_many(EXAMPLE_TIMERS)
+        added_timers = timers_collection.replace_all([EXAMPLE_TIMER_1, EXAMPLE_IDENTIFIABLE_TIMER_1])
+        assert set(timers_collection) == set(added_timers)
+        assert len(timers_collection) == 2
+
+    def test_bulk_replace_all_with_duplicate_id(self, timers_collection: IdentifiableTimersCollection):
+        added_timer = timers_collection.add(EXAMPLE_TIMER_1)
+        with pytest.raises(ValueError):
+            timers_collection.replace_all([EXAMPLE_IDENTIFIABLE_TIMER_1, EXAMPLE_IDENTIFIABLE_TIMER_1])
+        assert list(timers_collection) == [added_timer]
+
+    def test_iter_timer_seconds(self, timers_collection: IdentifiableTimersCollection):
+        added_timers = [timers_collection.add(timer) for timer in EXAMPLE_TIMERS]
+        assert sorted(timers_collection.iter_timer_seconds()) == sorted(
+            (timer.id, timer.start_time.as_seconds(), int(timer.duration.total_seconds())) for timer in added_timers
+        )
+
+
+class TestTimersDatabase:
+    def test_does_not_scan_directory_after_opening(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path)
+        with patch.object(Path, "glob", side_effect=AssertionError("Directory scanned")):
+            added_timer = database.add(EXAMPLE_TIMER_1)
+            assert len(database) == 1
+            assert list(database) == [added_timer]
+            assert database.remove(added_timer.id)
+
+    def test_timer_ids_not_reused(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path)
+        added_timer = database.add(EXAMPLE_TIMER_1)
+        database.remove(added_timer.id)
+        assert TimersDatabase(tmp_path).add(EXAMPLE_TIMER_1).id > added_timer.id
+
+    def test_manifest_rebuilt_when_missing(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path)
+        added_timer = database.add(EXAMPLE_TIMER_1)
+        (tmp_path / "manifest").unlink()
+        assert list(TimersDatabase(tmp_path)) == [added_timer]
+        assert (tmp_path / "manifest").exists()
+
+    def test_manifest_rebuilt_when_corrupt(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path)
+        added_timer = database.add(EXAMPLE_TIMER_1)
+        (tmp_path / "manifest").write_text("{")
+        assert list(TimersDatabase(tmp_path)) == [added_timer]
+
+    def test_manifest_rebuilt_when_stale(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path)
+        added_timer = database.add(EXAMPLE_TIMER_1)
+        # Timer file written without the manifest being updated, as would happen if interrupted
+        (tmp_path / "manifest").rename(tmp_path / "old-manifest")
+        other_timer = database.add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+        (tmp_path / "old-manifest").rename(tmp_path / "manifest")
+
+        reopened_database = TimersDatabase(tmp_path)
+        assert set(reopened_database) == {added_timer, other_timer}
+        assert reopened_database.add(EXAMPLE_TIMER_1).id > other_timer.id
+
+    def test_manifest_changes_appended(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path)
+        added_timers = [database.add(timer) for timer in EXAMPLE_TIMERS]
+        database.remove(added_timers[0].id)
+        manifest_lines = (tmp_path / "manifest").read_text().splitlines()
+        assert len(manifest_lines) == 1 + len(EXAMPLE_TIMERS) + 1
+        assert json.loads(manifest_lines[-1]) == {
+            "added": [],
+            "removed": [added_timers[0].id],
+            "nextId": database._next_timer_id,
+        }
+
+        reopened_database = TimersDatabase(tmp_path)
+        assert set(reopened_database) == set(added_timers[1:])
+        assert reopened_database.add(EXAMPLE_TIMER_1).id > added_timers[-1].id
+
+    def test_manifest_compacted(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path)
+        added_timer = database.add(EXAMPLE_TIMER_1)
+        with patch.object(TimersDatabase, "_MIN_MANIFEST_CHANGES_BEFORE_COMPACTION", 2):
+            for _ in range(10):
+                database.remove(database.add(EXAMPLE_TIMER_2).id)
+        assert len((tmp_path / "manifest").read_text().splitlines()) <= 3
+        assert list(TimersDatabase(tmp_path)) == [added_timer]
+
+    def test_manifest_with_incomplete_change(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path)
+        added_timer = database.add(EXAMPLE_TIMER_1)
+        removed_timer = database.add(EXAMPLE_TIMER_2)
+        database.remove(removed_timer.id)
+        # Last change only partly appended, as would happen if interrupted
+        manifest = (tmp_path / "manifest").read_text()
+        (tmp_path / "manifest").write_text(manifest[: -len(manifest.splitlines()[-1]) // 2])
+
+        reopened_database = TimersDatabase(tmp_path)
+        assert list(reopened_database) == [added_timer]
+        assert reopened_database.add(EXAMPLE_TIMER_2).id > removed_timer.id
+        assert (tmp_path / "manifest").read_text().endswith("\n")
+
+    def test_manifest_without_changes(self, tmp_path: Path):
+        added_timer = TimersDatabase(tmp_path).add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+        # Manifest as written before changes were appended
+        (tmp_path / "manifest").write_text(json.dumps({"ids": [added_timer.id], "count": 1, "nextId": 1000}))
+
+        reopened_database = TimersDatabase(tmp_path)
+        assert list(reopened_database) == [added_timer]
+        assert reopened_database.add(EXAMPLE_TIMER_1).id == 1000
+
+
+class TestCachedTimersDatabase:
+    def test_reads_from_disk_once(self, tmp_path: Path):
+        TimersDatabase(tmp_path).add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+        database = CachedTimersDatabase(tmp_path)
+        assert len(database) == 1
+        with patch("builtins.open", side_effect=AssertionError("Read from disk")):
+            assert list(database) == [EXAMPLE_IDENTIFIABLE_TIMER_1]
+            assert database.get(EXAMPLE_IDENTIFIABLE_TIMER_1.id) == EXAMPLE_IDENTIFIABLE_TIMER_1
+
+    def test_writes_through(self, tmp_path: Path):
+        database = CachedTimersDatabase(tmp_path)
+        added_timer = database.add(EXAMPLE_TIMER_1)
+        assert list(TimersDatabase(tmp_path)) == [added_timer]
+        database.remove(added_timer.id)
+        assert len(TimersDatabase(tmp_path)) == 0
+
+    def test_external_change_ignored(self, tmp_path: Path):
+        database = CachedTimersDatabase(tmp_path)
+        assert len(database) == 0
+        TimersDatabase(tmp_path).add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+        assert len(database) == 0
+
+    def test_external_change_detected(self, tmp_path: Path):
+        database = CachedTimersDatabase(tmp_path, check_for_external_changes=True)
+        assert len(database) == 0
+        TimersDatabase(tmp_path).add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+        assert list(database) == [EXAMPLE_IDENTIFIABLE_TIMER_1]
+
+    def test_external_change_counted(self, tmp_path: Path):
+        database = CachedTimersDatabase(tmp_path, check_for_external_changes=True)
+        listenable_database = ListenableTimersCollection(database)
+        generation = listenable_database.generation
+        assert database.get_external_change_count() == 0
+        listenable_database.add(EXAMPLE_TIMER_1)
+        assert database.get_external_change_count() == 0
+        assert listenable_database.generation != generation
+
+        generation = listenable_database.generation
+        TimersDatabase(tmp_path).add(EXAMPLE_TIMER_2)
+        assert database.get_external_change_count() == 1
+        assert listenable_database.generation != generation
+
+
+class TestJournalTimersCollection:
+    def test_replayed(self, tmp_path: Path):
+        journal = JournalTimersCollection(tmp_path / "timers.journal")
+        added_timers = [journal.add(timer) for timer in EXAMPLE_TIMERS]
+        journal.remove(added_timers[0].id)
+        assert set(JournalTimersCollection(tmp_path / "timers.journal")) == set(added_timers[1:])
+
+    def test_compacted(self, tmp_path: Path):
+        journal = JournalTimersCollection(tmp_path / "timers.journal", minimum_records_to_compact=4)
+        kept_timer = journal.add(EXAMPLE_TIMER_1)
+        for _ in range(3):
+            journal.remove(journal.add(EXAMPLE_TIMER_2).id)
+        assert journal.dead_record_ratio <= journal.compaction_threshold
+        assert len((tmp_path / "timers.journal").read_text().splitlines()) < 4
+        assert list(JournalTimersCollection(tmp_path / "timers.journal")) == [kept_timer]
+
+    def test_timer_ids_not_reused_after_compaction(self, tmp_path: Path):
+        journal = JournalTimersCollection(tmp_path / "timers.journal")
+        removed_timer = journal.add(EXAMPLE_TIMER_1)
+        journal.remove(removed_timer.id)
+        journal.compact()
+        assert JournalTimersCollection(tmp_path / "timers.journal").add(EXAMPLE_TIMER_1).id > removed_timer.id
+
+    def test_incomplete_record_discarded(self, tmp_path: Path):
+        journal = JournalTimersCollection(tmp_path / "timers.journal")
+        added_timer = journal.add(EXAMPLE_TIMER_1)
+        with open(tmp_path / "timers.journal", "a") as file:
+            file.write('{"type": "add", "tim')
+
+        journal = JournalTimersCollection(tmp_path / "timers.journal")
+        assert list(journal) == [added_timer]
+        other_timer = journal.add(EXAMPLE_TIMER_2)
+        assert set(JournalTimersCollection(tmp_path / "timers.journal")) == {added_timer, other_timer}
+
+    def test_from_timers(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path / "timers")
+        added_timers = {database.add(timer) for timer in EXAMPLE_TIMERS}
+        JournalTimersCollection.from_timers(database, tmp_path / "timers.journal")
+        assert set(JournalTimersCollection(tmp_path / "timers.journal")) == added_timers
+
+    def test_from_timers_when_journal_exists(self, tmp_path: Path):
+        JournalTimersCollection(tmp_path / "timers.journal").add(EXAMPLE_TIMER_1)
+        with pytest.raises(ValueError):
+            JournalTimersCollection.from_timers((), tmp_path / "timers.journal")
+
+
+class TestBinaryTimersCollection:
+    def test_loaded(self, tmp_path: Path):
+        collection = BinaryTimersCollection(tmp_path / "timers.bin")
+        added_timers = [collection.add(timer) for timer in EXAMPLE_TIMERS]
+        collection.remove(added_timers[0].id)
+        assert set(BinaryTimersCollection(tmp_path / "timers.bin")) == set(added_timers[1:])
+
+    def test_timer_ids_not_reused(self, tmp_path: Path):
+        collection = BinaryTimersCollection(tmp_path / "timers.bin")
+        removed_timer = collection.add(EXAMPLE_TIMER_1)
+        collection.remove(removed_timer.id)
+        assert BinaryTimersCollection(tmp_path / "timers.bin").add(EXAMPLE_TIMER_1).id > removed_timer.id
+
+    def test_incomplete_record_discarded(self, tmp_path: Path):
+        collection = BinaryTimersCollection(tmp_path / "timers.bin")
+        added_timer = collection.add(EXAMPLE_TIMER_1)
+        collection.add(EXAMPLE_TIMER_2)
+        with open(tmp_path / "timers.bin", "r+b") as file:
+            file.truncate(file.seek(0, 2) - 1)
+
+        collection = BinaryTimersCollection(tmp_path / "timers.bin")
+        assert list(collection) == [added_timer]
+        other_timer = collection.add(EXAMPLE_TIMER_2)
+        assert set(BinaryTimersCollection(tmp_path / "timers.bin")) == {added_timer, other_timer}
+
+    def test_corrupt_record_not_discarded(self, tmp_path: Path):
+        collection = BinaryTimersCollection(tmp_path / "timers.bin")
+        collection.add(EXAMPLE_TIMER_1)
+        collection.add(EXAMPLE_TIMER_2)
+        # Corrupt the first byte of the first timer's name, so it is no longer valid UTF-8
+        with open(tmp_path / "timers.bin", "r+b") as file:
+            file.seek(_FILE_HEADER_SIZE + TIMER_RECORD_HEADER_SIZE)
+            file.write(b"\xff")
+        corrupted_content = (tmp_path / "timers.bin").read_bytes()
+
+        with pytest.raises(ValueError):
+            BinaryTimersCollection(tmp_path / "timers.bin")
+        assert (tmp_path / "timers.bin").read_bytes() == corrupted_content
+
+    def test_not_timers_file(self, tmp_path: Path):
+        (tmp_path / "timers.bin").write_bytes(b"other")
+        with pytest.raises(ValueError):
+            BinaryTimersCollection(tmp_path / "timers.bin")
+
+    def test_from_timers(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path / "timers")
+        added_timers = {database.add(timer) for timer in EXAMPLE_TIMERS}
+        BinaryTimersCollection.from_timers(database, tmp_path / "timers.bin")
+        assert set(BinaryTimersCollection(tmp_path / "timers.bin")) == added_timers
+
+
+class TestMappedTimersCollection:
+    def test_loaded(self, tmp_path: Path):
+        collection = MappedTimersCollection(tmp_path / "timers.mmap")
+        added_timers = [collection.add(timer) for timer in EXAMPLE_TIMERS]
+        collection.remove(added_timers[0].id)
+        collection.close()
+        collection = MappedTimersCollection(tmp_path / "timers.mmap")
+        assert set(collection) == set(added_timers[1:])
+        collection.close()
+
+    def test_grows(self, tmp_path: Path):
+        collection = MappedTimersCollection(tmp_path / "timers.mmap")
+        added_timers = {collection.add(EXAMPLE_TIMER_1) for _ in range(200)}
+        assert set(collection) == added_timers
+        collection.close()
+
+    def test_slot_reused(self, tmp_path: Path):
+        collection = MappedTimersCollection(tmp_path / "timers.mmap")
+        collection.remove(collection.add(EXAMPLE_TIMER_1).id)
+        size = (tmp_path / "timers.mmap").stat().st_size
+        for _ in range(10):
+            collection.remove(collection.add(EXAMPLE_TIMER_1).id)
+        assert (tmp_path / "timers.mmap").stat().st_size == size
+        collection.close()
+
+    def test_timer_ids_not_reused(self, tmp_path: Path):
+        collection = MappedTimersCollection(tmp_path / "timers.mmap")
+        removed_timer = collection.add(EXAMPLE_TIMER_1)
+        collection.remove(removed_timer.id)
+        collection.close()
+        collection = MappedTimersCollection(tmp_path / "timers.mmap")
+        assert collection.add(EXAMPLE_TIMER_1).id > removed_timer.id
+        collection.close()
+
+    def test_name_too_long(self, tmp_path: Path):
+        collection = MappedTimersCollection(tmp_path / "timers.mmap")
+        with pytest.raises(ValueError):
+            collection.add(Timer("x" * (MAXIMUM_NAME_LENGTH + 1), DayTime(1, 0, 0), timedelta(minutes=1)))
+        assert len(collection) == 0
+        collection.close()
+
+    def test_iter_timer_seconds_reads_mapping(self, tmp_path: Path):
+        collection = MappedTimersCollection(tmp_path / "timers.mmap")
+        added_timer = collection.add(Timer("timer", DayTime(1, 2, 3), timedelta(minutes=2)))
+        with patch.object(MappedTimersCollection, "_read_timer", side_effect=AssertionError("Timer created")):
+            assert list(collection.iter_timer_seconds()) == [(added_timer.id, 3723, 120)]
+        collection.close()
+
+    def test_not_timers_file(self, tmp_path: Path):
+        (tmp_path / "timers.mmap").write_bytes(b"other file contents")
+        with pytest.raises(ValueError):
+            MappedTimersCollection(tmp_path / "timers.mmap")
+
+
+class TestSqliteTimersCollection:
+    def test_loaded(self, tmp_path: Path):
+        collection = SqliteTimersCollection(tmp_path / "timers.sqlite")
+        added_timers = [collection.add(timer) for timer in EXAMPLE_TIMERS]
+        collection.remove(added_timers[0].id)
+        collection.close()
+        collection = SqliteTimersCollection(tmp_path / "timers.sqlite")
+        assert set(collection) == set(added_timers[1:])
+        collection.close()
+
+    def test_timer_ids_not_reused(self, tmp_path: Path):
+        collection = SqliteTimersCollection(tmp_path / "timers.sqlite")
+        removed_timer = collection.add(EXAMPLE_TIMER_1)
+        collection.remove(removed_timer.id)
+        collection.close()
+        collection = SqliteTimersCollection(tmp_path / "timers.sqlite")
+        assert collection.add(EXAMPLE_TIMER_1).id > removed_timer.id
+        collection.close()
+
+    def test_get_starting_between(self, sqlite_collection: SqliteTimersCollection):
+        timers = [
+            sqlite_collection.add(Timer(f"timer-{hour}", DayTime(hour, 0, 0), timedelta(minutes=1)))
+            for hour in (1, 5, 12, 23)
+        ]
+        assert sqlite_collection.get_starting_between(DayTime(1, 0, 0), DayTime(12, 0, 0)) == timers[:2]
+        assert sqlite_collection.get_starting_between(DayTime(6, 0, 0), DayTime(7, 0, 0)) == []
+
+    def test_get_starting_between_wraps_midnight(self, sqlite_collection: SqliteTimersCollection):
+        timers = [
+            sqlite_collection.add(Timer(f"timer-{hour}", DayTime(hour, 0, 0), timedelta(minutes=1)))
+            for hour in (1, 5, 12, 23)
+        ]
+        assert sqlite_collection.get_starting_between(DayTime(12, 0, 0), DayTime(5, 0, 0)) == [
+            timers[2],
+            timers[3],
+            timers[0],
+        ]
+
+    def test_add_timer_without_name(self, sqlite_collection: SqliteTimersCollection):
+        added_timer = sqlite_collection.add(EXAMPLE_TIMER_1)
+        with pytest.raises(ValueError):
+            sqlite_collection.add_many([EXAMPLE_TIMER_2, Timer(None, DayTime(1, 0, 0), timedelta(minutes=1))])
+        assert list(sqlite_collection) == [added_timer]
+
+    def test_get_by_name(self, sqlite_collection: SqliteTimersCollection):
+        added_timers = [sqlite_collection.add(EXAMPLE_TIMER_1), sqlite_collection.add(EXAMPLE_TIMER_1)]
+        sqlite_collection.add(EXAMPLE_TIMER_2)
+        assert sqlite_collection.get_by_name(EXAMPLE_TIMER_1.name) == added_timers
+
+    def test_from_timers(self, tmp_path: Path):
+        added_timer = TimersDatabase(tmp_path / "timers").add(EXAMPLE_TIMER_1)
+        collection = SqliteTimersCollection.from_timers(TimersDatabase(tmp_path / "timers"), tmp_path / "timers.sqlite")
+        assert list(collection) == [added_timer]
+        with pytest.raises(ValueError):
+            SqliteTimersCollection.from_timers((), tmp_path / "timers.sqlite")
+        collection.close()
+
+
+class TestTimersDatabaseChanges:
+    def test_replace_does_not_write_manifest(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path)
+        added_timer = database.add(EXAMPLE_TIMER_1)
+        with patch.object(TimersDatabase, "_write_manifest", side_effect=AssertionError("Manifest written")):
+            database.replace(added_timer.id, EXAMPLE_TIMER_2)
+        assert list(TimersDatabase(tmp_path)) == [IdentifiableTimer.from_timer(EXAMPLE_TIMER_2, added_timer.id)]
+        assert sorted(path.name for path in tmp_path.iterdir()) == [f"{added_timer.id}.json", "manifest"]
+
+    def test_add_many_writes_manifest_once(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path)
+        with patch.object(TimersDatabase, "_write_manifest", autospec=True) as write_manifest:
+            database.add_many(EXAMPLE_TIMERS)
+        write_manifest.assert_called_once()
+
+    def test_replace_all_writes_manifest_once(self, tmp_path: Path):
+        database = TimersDatabase(tmp_path)
+        database.add_many(EXAMPLE_TIMERS)
+        with patch.object(TimersDatabase, "_write_manifest", autospec=True) as write_manifest:
+            database.replace_all([EXAMPLE_TIMER_1])
+        write_manifest.assert_called_once()
+
+    def test_bulk_changes_persisted(self, tmp_path: Path):
+        database = CachedTimersDatabase(tmp_path)
+        added_timers = database.add_many(EXAMPLE_TIMERS)
+        database.remove_many([added_timers[0].id])
+        assert set(TimersDatabase(tmp_path)) == set(added_timers[1:])
+
+
+class TestInMemoryIdentifiableTimersCollection:
+    def test_add_creates_lowest_unused_id(self):
+        collection = InMemoryIdentifiableTimersCollection()
+        for i in range(5):
+            collection.add(IdentifiableTimer(TimerId(i), f"timer-{i}", DayTime(1, 0, 0), timedelta(minutes=1)))
+        collection.remove(TimerId(3))
+        collection.remove(TimerId(1))
+        assert collection.add(EXAMPLE_TIMER_1).id == 1
+        assert collection.add(EXAMPLE_TIMER_1).id == 3
+        assert collection.add(EXAMPLE_TIMER_1).id == 5
+
+    def test_add_skips_freed_id_since_used(self):
+        collection = InMemoryIdentifiableTimersCollection()
+        added_timers = collection.add_many([EXAMPLE_TIMER_1] * 3)
+        collection.remove(added_timers[0].id)
+        collection.add(IdentifiableTimer.from_timer(EXAMPLE_TIMER_1, added_timers[0].id))
+        collection.add(IdentifiableTimer.from_timer(EXAMPLE_TIMER_1, TimerId(3)))
+        assert collection.add(EXAMPLE_TIMER_1).id == 4
+
+    def test_add_matches_lowest_unused_id(self):
+        randomiser = random.Random(0)
+        collection = InMemoryIdentifiableTimersCollection()
+        for _ in range(2000):
+            operation = randomiser.random()
+            if operation < 0.5:
+                expected_timer_id = min(set(range(len(collection) + 1)) - {timer.id for timer in collection})
+                assert collection.add(EXAMPLE_TIMER_1).id == expected_timer_id
+            elif operation < 0.6:
+                timer_id = TimerId(randomiser.randrange(0, 100))
+                if timer_id not in {timer.id for timer in collection}:
+                    collection.add(IdentifiableTimer.from_timer(EXAMPLE_TIMER_1, timer_id))
+            else:
+                collection.remove(TimerId(randomiser.randrange(0, 100)))
+
+
+class TestTimerTable:
+    def test_add_creates_lowest_unused_id(self):
+        table = TimerTable()
+        for i in range(5):
+            table.add(IdentifiableTimer(TimerId(i), f"timer-{i}", DayTime(1, 0, 0), timedelta(minutes=1)))
+        table.remove(TimerId(1))
+        table.remove(TimerId(3))
+        assert table.add(EXAMPLE_TIMER_1).id == 1
+        assert table.add(EXAMPLE_TIMER_1).id == 3
+        assert table.add(EXAMPLE_TIMER_1).id == 5
+
+    def test_add_with_fractional_duration(self):
+        with pytest.raises(ValueError):
+            TimerTable().add(IdentifiableTimer(TimerId(0), "timer", DayTime(1, 0, 0), timedelta(seconds=1.5)))
+
+    def test_add_with_id_too_large(self):
+        table = TimerTable()
+        with pytest.raises(ValueError):
+            table.add(IdentifiableTimer(TimerId(2**64), "timer", DayTime(1, 0, 0), timedelta(minutes=1)))
+        assert len(table) == 0
+
+    def test_add_with_too_many_names(self):
+        table = TimerTable()
+        table.add(IdentifiableTimer(TimerId(0), "first", DayTime(1, 0, 0), timedelta(minutes=1)))
+        with patch("timeventx.timers.collections.table._MAX_NAME_INDEX", 0):
+            with pytest.raises(ValueError):
+                table.add(IdentifiableTimer(TimerId(1), "second", DayTime(1, 0, 0), timedelta(minutes=1)))
+            # Timers with a name already in the pool can still be added
+            table.add(IdentifiableTimer(TimerId(2), "first", DayTime(2, 0, 0), timedelta(minutes=1)))
+        assert [timer.id for timer in table] == [0, 2]
+        assert table._names == ["first"]
+        assert table._name_to_index == {"first": 0}
+
+    def test_add_with_duration_too_large(self):
+        table = TimerTable()
+        with pytest.raises(ValueError):
+            table.add(IdentifiableTimer(TimerId(0), "timer", DayTime(1, 0, 0), timedelta(days=2**16)))
+        assert len(table) == 0
+        assert table._names == []
+        assert len(table._name_indices) == len(table._start_seconds) == 0
+
+    def test_names_shared(self):
+        table = TimerTable()
+        for i in range(3):
+            table.add(IdentifiableTimer(TimerId(i), "shared", DayTime(i, 0, 0), timedelta(minutes=1)))
+        table.add(IdentifiableTimer(TimerId(3), "other", DayTime(3, 0, 0), timedelta(minutes=1)))
+        assert len(table._names) == 2
+
+    def test_name_slot_reused(self):
+        table = TimerTable()
+        table.add(IdentifiableTimer(TimerId(0), "first", DayTime(1, 0, 0), timedelta(minutes=1)))
+        table.add(IdentifiableTimer(TimerId(1), "second", DayTime(1, 0, 0), timedelta(minutes=1)))
+        table.remove(TimerId(0))
+        table.add(IdentifiableTimer(TimerId(2), "third", DayTime(1, 0, 0), timedelta(minutes=1)))
+        assert len(table._names) == 2
+        assert [timer.name for timer in table] == ["second", "third"]
+
+    def test_iter_timer_seconds_reads_columns(self):
+        table = TimerTable([IdentifiableTimer(TimerId(7), "timer", DayTime(1, 2, 3), timedelta(minutes=2))])
+        assert list(table.iter_timer_seconds()) == [(7, 3723, 120)]
+
 
 class TestListenableTimersCollection:
     def test_timer_add_listener(self, listenable: ListenableTimersCollection):
@@ -119,6 +707,124 @@ class TestListenableTimersCollection:
         listener.assert_called_once()
         assert listener.call_args.args[0].name == EXAMPLE_TIMER_1.name
 
+    def test_timers_changed_listener_on_bulk_changes(self, listenable: ListenableTimersCollection):
+        listener = MagicMock()
+        add_listener = MagicMock()
+        listenable.add_listener(Event.TIMERS_CHANGED, listener)
+        listenable.add_listener(Event.TIMER_ADDED, add_listener)
+
+        added_timers = listenable.add_many(EXAMPLE_TIMERS)
+        listener.assert_called_once_with(added_timers, [])
+        listener.reset_mock()
+
+        listenable.remove_many([added_timers[0].id, TimerId(123)])
+        listener.assert_called_once_with([], [added_timers[0].id])
+        listener.reset_mock()
+
+        replacement_timers = listenable.replace_all([EXAMPLE_TIMER_1])
+        listener.assert_called_once()
+        assert listener.call_args.args[0] == replacement_timers
+        assert set(listener.call_args.args[1]) == {timer.id for timer in added_timers[1:]}
+        add_listener.assert_not_called()
+
+    def test_timers_changed_listener_not_called_when_nothing_changed(self, listenable: ListenableTimersCollection):
+        listener = MagicMock()
+        listenable.add_listener(Event.TIMERS_CHANGED, listener)
+        listenable.add_many([])
+        listenable.remove_many([TimerId(123)])
+        listener.assert_not_called()
+
+    def test_timer_update_listener(self, listenable: ListenableTimersCollection):
+        listener = MagicMock()
+        other_listener = MagicMock()
+        listenable.add_listener(Event.TIMER_UPDATED, listener)
+        listenable.add_listener(Event.TIMER_ADDED, other_listener)
+        listenable.add_listener(Event.TIMER_REMOVED, other_listener)
+        added_timer = listenable.add(EXAMPLE_TIMER_1)
+        other_listener.reset_mock()
+
+        replacement_timer = listenable.replace(added_timer.id, EXAMPLE_TIMER_2)
+
+        listener.assert_called_once_with(added_timer, replacement_timer)
+        other_listener.assert_not_called()
+
+    def test_batch_rolls_back_replace(self, listenable: ListenableTimersCollection):
+        added_timer = listenable.add(EXAMPLE_TIMER_1)
+        with pytest.raises(RuntimeError):
+            with listenable.batch():
+                listenable.replace(added_timer.id, EXAMPLE_TIMER_2)
+                raise RuntimeError()
+        assert list(listenable) == [added_timer]
+
+    def test_batch_notifies_once(self, listenable: ListenableTimersCollection):
+        listener = MagicMock()
+        add_listener = MagicMock()
+        remove_listener = MagicMock()
+        listenable.add_listener(Event.TIMERS_CHANGED, listener)
+        listenable.add_listener(Event.TIMER_ADDED, add_listener)
+        listenable.add_listener(Event.TIMER_REMOVED, remove_listener)
+        existing_timer = listenable.add(EXAMPLE_TIMER_1)
+        add_listener.reset_mock()
+
+        with listenable.batch():
+            added_timers = [listenable.add(timer) for timer in EXAMPLE_TIMERS]
+            listenable.remove(existing_timer.id)
+            listener.assert_not_called()
+
+        listener.assert_called_once_with(added_timers, [existing_timer.id])
+        add_listener.assert_not_called()
+        remove_listener.assert_not_called()
+
+    def test_batch_coalesces_add_then_remove(self, listenable: ListenableTimersCollection):
+        listener = MagicMock()
+        listenable.add_listener(Event.TIMERS_CHANGED, listener)
+        with listenable.batch():
+            added_timer = listenable.add(EXAMPLE_TIMER_1)
+            listenable.remove(added_timer.id)
+        listener.assert_not_called()
+
+    def test_batch_coalesces_remove_then_add(self, listenable: ListenableTimersCollection):
+        listener = MagicMock()
+        listenable.add_listener(Event.TIMERS_CHANGED, listener)
+        listenable.add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+
+        with listenable.batch():
+            listenable.remove(EXAMPLE_IDENTIFIABLE_TIMER_1.id)
+            listenable.add(EXAMPLE_IDENTIFIABLE_TIMER_1)
+        listener.assert_not_called()
+
+        changed_timer = IdentifiableTimer.from_timer(EXAMPLE_TIMER_2, EXAMPLE_IDENTIFIABLE_TIMER_1.id)
+        with listenable.batch():
+            listenable.remove(EXAMPLE_IDENTIFIABLE_TIMER_1.id)
+            listenable.add(changed_timer)
+        listener.assert_called_once_with([changed_timer], [changed_timer.id])
+
+    def test_batch_nested(self, listenable: ListenableTimersCollection):
+        listener = MagicMock()
+        listenable.add_listener(Event.TIMERS_CHANGED, listener)
+        with listenable.batch():
+            with listenable.batch():
+                added_timers = listenable.add_many(EXAMPLE_TIMERS)
+            listener.assert_not_called()
+            listenable.remove_many([added_timers[0].id])
+        listener.assert_called_once_with(added_timers[1:], [])
+
+    def test_batch_rolled_back_on_exception(self, listenable: ListenableTimersCollection):
+        listener = MagicMock()
+        listenable.add_listener(Event.TIMERS_CHANGED, listener)
+        existing_timers = listenable.add_many(EXAMPLE_TIMERS)
+
+        with pytest.raises(ValueError):
+            with listenable.batch():
+                listenable.remove(existing_timers[0].id)
+                listenable.add(EXAMPLE_TIMER_1)
+                listenable.replace_all([EXAMPLE_TIMER_2])
+                listenable.add(existing_timers[1])
+                listenable.add(existing_timers[1])
+
+        listener.assert_called_once()
+        assert set(listenable) == set(existing_timers)
+
     def test_timer_remove_listener(self, listenable: ListenableTimersCollection):
         listener = MagicMock()
         other_listener = MagicMock()
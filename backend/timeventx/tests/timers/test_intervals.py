@@ -1,10 +1,19 @@
+import random
 from datetime import timedelta
 from typing import Iterable
 
 import pytest
 
-from timeventx.timers.intervals import TimeInterval, merge_and_sort_intervals
+from timeventx.tests._common import create_example_timer
+from timeventx.timers.intervals import (
+    MergedIntervalsIndex,
+    TimeInterval,
+    merge_and_sort_intervals,
+    merge_and_sort_unrolled_intervals,
+    to_unrolled_interval,
+)
 from timeventx.timers.serialisation import deserialise_daytime
+from timeventx.timers.timers import DayTime
 
 
 def _to_time_interval(serialised_start_time: str, serialised_end_time: str) -> TimeInterval:
@@ -198,3 +207,184 @@ class TestTimerRunner:
         )
         assert len(on_off_intervals) == 1
         assert on_off_intervals[0] == _to_time_interval("23:00:00", "04:00:00")
+
+    def test_calculate_on_off_intervals_touching_not_merged(self):
+        on_off_intervals = _merge_and_sort_intervals(
+            (
+                ("00:10:00", timedelta(minutes=10)),
+                ("00:00:00", timedelta(minutes=10)),
+            )
+        )
+        assert len(on_off_intervals) == 2
+        assert on_off_intervals[0] == _to_time_interval("00:00:00", "00:10:00")
+        assert on_off_intervals[1] == _to_time_interval("00:10:00", "00:20:00")
+
+    def test_calculate_on_off_intervals_touching_at_midnight_merged(self):
+        on_off_intervals = _merge_and_sort_intervals(
+            (
+                ("00:00:00", timedelta(minutes=10)),
+                ("23:00:00", timedelta(hours=1)),
+            )
+        )
+        assert len(on_off_intervals) == 1
+        assert on_off_intervals[0] == _to_time_interval("23:00:00", "00:10:00")
+
+    def test_calculate_on_off_intervals_many(self):
+        on_off_intervals = _merge_and_sort_intervals(
+            (f"{hour:02}:{minute:02}:{second:02}", timedelta(seconds=5))
+            for hour in range(24)
+            for minute in range(0, 60, 2)
+            for second in range(0, 10)
+        )
+        assert len(on_off_intervals) == 24 * 30
+        assert on_off_intervals[0] == _to_time_interval("00:00:00", "00:00:14")
+        assert on_off_intervals[-1] == _to_time_interval("23:58:00", "23:58:14")
+
+
+class TestMergeAndSortUnrolledIntervals:
+    def test_none(self):
+        assert merge_and_sort_unrolled_intervals(()) == []
+
+    def test_overlapping(self):
+        assert merge_and_sort_unrolled_intervals(((50, 150), (0, 100), (200, 300))) == [(0, 150), (200, 300)]
+
+    def test_fold_over_midnight(self):
+        assert merge_and_sort_unrolled_intervals(((0, 100), (86000, 86450), (200, 300))) == [(200, 300), (86000, 86500)]
+
+    def test_no_end_time(self):
+        with pytest.raises(ValueError):
+            merge_and_sort_unrolled_intervals(((0, 86000), (86000, 86400)))
+
+
+class TestMergedIntervalsIndex:
+    def test_empty(self):
+        index = MergedIntervalsIndex()
+        assert len(index) == 0
+        assert index.on_off_intervals == ()
+
+    def test_initial_timers(self):
+        index = MergedIntervalsIndex(
+            (
+                create_example_timer("00:00:00", timedelta(minutes=10)),
+                create_example_timer("00:05:00", timedelta(minutes=10)),
+                create_example_timer("23:55:00", timedelta(minutes=10)),
+            )
+        )
+        assert len(index) == 3
+        assert index.on_off_intervals == (_to_time_interval("23:55:00", "00:15:00"),)
+
+    def test_add(self):
+        index = MergedIntervalsIndex((create_example_timer("01:00:00", timedelta(minutes=10)),))
+        index.add(create_example_timer("01:05:00", timedelta(minutes=10)))
+        index.add(create_example_timer("03:00:00", timedelta(minutes=10)))
+        assert index.on_off_intervals == (
+            _to_time_interval("01:00:00", "01:15:00"),
+            _to_time_interval("03:00:00", "03:10:00"),
+        )
+
+    def test_add_bridging(self):
+        index = MergedIntervalsIndex(
+            (
+                create_example_timer("01:00:00", timedelta(minutes=10)),
+                create_example_timer("02:00:00", timedelta(minutes=10)),
+            )
+        )
+        index.add(create_example_timer("01:05:00", timedelta(hours=1)))
+        assert index.on_off_intervals == (_to_time_interval("01:00:00", "02:10:00"),)
+
+    def test_add_duplicate(self):
+        timer = create_example_timer("01:00:00", timedelta(minutes=10))
+        index = MergedIntervalsIndex((timer,))
+        with pytest.raises(ValueError):
+            index.add(timer)
+
+    def test_add_no_end_time(self):
+        index = MergedIntervalsIndex((create_example_timer("00:00:00", timedelta(hours=23)),))
+        with pytest.raises(ValueError):
+            index.add(create_example_timer("23:00:00", timedelta(hours=1)))
+
+    def test_add_no_end_time_rolled_back(self):
+        first_timer = create_example_timer("07:00:00", timedelta(hours=15))
+        index = MergedIntervalsIndex((first_timer,))
+        with pytest.raises(ValueError):
+            index.add(create_example_timer("22:00:00", timedelta(hours=9)))
+        assert len(index) == 1
+        assert index.on_off_intervals == (_to_time_interval("07:00:00", "22:00:00"),)
+        index.remove(first_timer.id)
+        assert index.on_off_intervals == ()
+
+    def test_remove(self):
+        timers = (
+            create_example_timer("01:00:00", timedelta(minutes=10)),
+            create_example_timer("01:05:00", timedelta(minutes=10)),
+            create_example_timer("01:10:00", timedelta(minutes=10)),
+        )
+        index = MergedIntervalsIndex(timers)
+        assert index.remove(timers[1].id)
+        assert len(index) == 2
+        assert index.on_off_intervals == (
+            _to_time_interval("01:00:00", "01:10:00"),
+            _to_time_interval("01:10:00", "01:20:00"),
+        )
+
+    def test_remove_folded(self):
+        timers = (
+            create_example_timer("00:00:00", timedelta(minutes=10)),
+            create_example_timer("23:00:00", timedelta(hours=1)),
+        )
+        index = MergedIntervalsIndex(timers)
+        assert index.remove(timers[1].id)
+        assert index.on_off_intervals == (_to_time_interval("00:00:00", "00:10:00"),)
+
+    def test_find(self):
+        index = MergedIntervalsIndex(
+            (
+                create_example_timer("01:00:00", timedelta(hours=1)),
+                create_example_timer("12:00:00", timedelta(hours=1)),
+                create_example_timer("23:00:00", timedelta(minutes=105)),
+            )
+        )
+        assert index.find(DayTime(0, 30, 0).as_seconds()) == (2, True)
+        assert index.find(DayTime(0, 50, 0).as_seconds()) == (0, False)
+        assert index.find(DayTime(1, 0, 0).as_seconds()) == (0, True)
+        assert index.find(DayTime(1, 59, 59).as_seconds()) == (0, True)
+        assert index.find(DayTime(2, 0, 0).as_seconds()) == (1, False)
+        assert index.find(DayTime(23, 30, 0).as_seconds()) == (2, True)
+
+    def test_find_wraps_to_first(self):
+        index = MergedIntervalsIndex((create_example_timer("01:00:00", timedelta(hours=1)),))
+        assert index.find(DayTime(0, 0, 0).as_seconds()) == (0, False)
+        assert index.find(DayTime(23, 0, 0).as_seconds()) == (0, False)
+
+    def test_find_when_empty(self):
+        with pytest.raises(IndexError):
+            MergedIntervalsIndex().find(0)
+
+    def test_remove_when_not_indexed(self):
+        timer = create_example_timer("01:00:00", timedelta(minutes=10))
+        assert not MergedIntervalsIndex().remove(timer.id)
+
+    def test_matches_full_merge(self):
+        randomiser = random.Random(0)
+        index = MergedIntervalsIndex()
+        timers = {}
+
+        for _ in range(500):
+            if len(timers) > 0 and randomiser.random() < 0.4:
+                timer_id = randomiser.choice(tuple(timers))
+                del timers[timer_id]
+                index.remove(timer_id)
+            else:
+                timer = create_example_timer(
+                    DayTime.from_seconds(randomiser.randrange(0, 24 * 60) * 60),
+                    timedelta(minutes=randomiser.randint(1, 120)),
+                )
+                try:
+                    index.add(timer)
+                    timers[timer.id] = timer
+                except ValueError:
+                    index.remove(timer.id)
+
+            assert index.merged_intervals == merge_and_sort_unrolled_intervals(
+                to_unrolled_interval(timer.interval) for timer in timers.values()
+            )
@@ -0,0 +1,69 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from timeventx.tests._common import EXAMPLE_IDENTIFIABLE_TIMER_1
+from timeventx.timers.serialisation import (
+    TIMER_RECORD_HEADER_SIZE,
+    IncompleteTimerRecordError,
+    json_to_identifiable_timer,
+    record_to_identifiable_timer,
+    timer_to_json,
+    timer_to_record,
+)
+from timeventx.timers.timers import DayTime, IdentifiableTimer, TimerId
+
+NAME_CHARACTERS = "abcXYZ 019-_é✓🕒"
+
+
+def _create_random_timer(randomiser: random.Random) -> IdentifiableTimer:
+    return IdentifiableTimer(
+        timer_id=TimerId(randomiser.randrange(0, 2**63)),
+        name="".join(randomiser.choice(NAME_CHARACTERS) for _ in range(randomiser.randint(0, 300))),
+        start_time=DayTime.from_seconds(randomiser.randrange(0, 24 * 60 * 60)),
+        duration=timedelta(microseconds=randomiser.randint(1, 24 * 60 * 60 * 1_000_000)),
+    )
+
+
+class TestTimerRecord:
+    def test_round_trip(self):
+        record = timer_to_record(EXAMPLE_IDENTIFIABLE_TIMER_1)
+        assert record_to_identifiable_timer(record) == (EXAMPLE_IDENTIFIABLE_TIMER_1, len(record))
+
+    def test_round_trip_fuzz_matches_json(self):
+        randomiser = random.Random(0)
+        for _ in range(2000):
+            timer = _create_random_timer(randomiser)
+            decoded_timer, _ = record_to_identifiable_timer(timer_to_record(timer))
+            assert decoded_timer == json_to_identifiable_timer(timer_to_json(timer)) == timer
+
+    def test_records_decoded_in_place(self):
+        randomiser = random.Random(0)
+        timers = [_create_random_timer(randomiser) for _ in range(100)]
+        buffer = b"".join(timer_to_record(timer) for timer in timers)
+
+        decoded_timers = []
+        offset = 0
+        while offset < len(buffer):
+            timer, offset = record_to_identifiable_timer(buffer, offset)
+            decoded_timers.append(timer)
+        assert decoded_timers == timers
+
+    def test_incomplete_record(self):
+        record = timer_to_record(EXAMPLE_IDENTIFIABLE_TIMER_1)
+        for length in (0, 10, len(record) - 1):
+            with pytest.raises(IncompleteTimerRecordError):
+                record_to_identifiable_timer(record[:length])
+
+    def test_invalid_name(self):
+        record = bytearray(timer_to_record(EXAMPLE_IDENTIFIABLE_TIMER_1))
+        record[TIMER_RECORD_HEADER_SIZE] = 0xFF
+        with pytest.raises(ValueError) as error:
+            record_to_identifiable_timer(bytes(record))
+        assert not isinstance(error.value, IncompleteTimerRecordError)
+
+    def test_id_too_large(self):
+        timer = IdentifiableTimer(TimerId(2**64), "timer", DayTime(1, 0, 0), timedelta(minutes=1))
+        with pytest.raises(ValueError):
+            timer_to_record(timer)
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
 
@@ -42,6 +43,41 @@ class TestDayTime:
     def test_comparison_regression(self):
         assert DayTime(1, 20, 0) < DayTime(2, 0, 0)
 
+    def test_from_seconds(self):
+        assert DayTime.from_seconds(0) == DayTime(0, 0, 0)
+        assert DayTime.from_seconds(DayTime(23, 59, 58).as_seconds()) == DayTime(23, 59, 58)
+
+    def test_components(self):
+        day_time = DayTime(13, 14, 15)
+        assert (day_time.hour, day_time.minute, day_time.second) == (13, 14, 15)
+
+    def test_hash(self):
+        assert hash(DayTime(1, 2, 3)) == hash(DayTime.from_seconds(DayTime(1, 2, 3).as_seconds()))
+        assert len({DayTime(1, 2, 3), DayTime(1, 2, 3), DayTime(1, 2, 4)}) == 2
+
+    def test_compare_non_daytime(self):
+        with pytest.raises(TypeError):
+            DayTime(1, 2, 3) < 5
+        with pytest.raises(TypeError):
+            DayTime(1, 2, 3) >= 5
+
+    def test_sort(self):
+        assert sorted((DayTime(2, 0, 0), DayTime(0, 0, 1), DayTime(1, 59, 59))) == [
+            DayTime(0, 0, 1),
+            DayTime(1, 59, 59),
+            DayTime(2, 0, 0),
+        ]
+
+    def test_intern_when_disabled(self):
+        day_time = DayTime(1, 2, 3)
+        assert DayTime.intern(DayTime(1, 2, 3)) is not day_time
+
+    def test_intern(self):
+        with patch.object(DayTime, "interning_enabled", True):
+            day_time = DayTime.intern(DayTime(1, 2, 3))
+            assert DayTime.intern(DayTime(1, 2, 3)) is day_time
+            assert DayTime.intern(DayTime(1, 2, 4)) is not day_time
+
     def test_add_non_timedelta(self):
         with pytest.raises(TypeError):
             DayTime(1, 2, 3) + 5
@@ -83,6 +119,10 @@ class TestTimeInterval:
         assert TimeInterval(DayTime(23, 59, 0), DayTime(0, 1, 0)).duration == timedelta(minutes=2)
         assert TimeInterval(DayTime(23, 0, 0), DayTime(1, 0, 0)).duration == timedelta(hours=2)
 
+    def test_duration_seconds(self):
+        assert TimeInterval(DayTime(1, 0, 0), DayTime(2, 0, 1)).duration_seconds == 3601
+        assert TimeInterval(DayTime(23, 0, 0), DayTime(1, 0, 0)).duration_seconds == 7200
+
     def test_spans_midnight(self):
         assert TimeInterval(DayTime(23, 0, 0), DayTime(2, 0, 0)).spans_midnight()
 
@@ -129,3 +169,23 @@ class TestTimeInterval:
         assert not TimeInterval(DayTime(23, 55, 0), DayTime(0, 5, 0)).intersects(
             TimeInterval(DayTime(22, 0, 0), DayTime(23, 0, 0))
         )
+
+    def test_intersects_seconds(self):
+        interval = TimeInterval(DayTime(23, 0, 0), DayTime(1, 0, 0))
+        assert interval.intersects_seconds(DayTime(0, 30, 0).as_seconds(), DayTime(2, 0, 0).as_seconds())
+        assert not interval.intersects_seconds(DayTime(1, 0, 0).as_seconds(), DayTime(23, 0, 0).as_seconds())
+
+    def test_intersects_matches_hours_covered(self):
+        intervals = [
+            TimeInterval(DayTime(start_hour, 0, 0), DayTime(end_hour, 0, 0))
+            for start_hour in range(0, 24, 3)
+            for end_hour in range(0, 24, 2)
+            if start_hour != end_hour
+        ]
+
+        def get_hours_covered(interval: TimeInterval) -> set[int]:
+            return {(interval.start_time.hour + i) % 24 for i in range(interval.duration_seconds // 3600)}
+
+        for interval in intervals:
+            for other in intervals:
+                assert interval.intersects(other) == (len(get_hours_covered(interval) & get_hours_covered(other)) > 0)
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+import pytest
+
+from timeventx.timers.intervals import TimeInterval
+from timeventx.timers.serialisation import deserialise_daytime
+from timeventx.timers.transitions import OFF, ON, TransitionPlan
+
+
+def _to_time_interval(serialised_start_time: str, serialised_end_time: str) -> TimeInterval:
+    return TimeInterval(deserialise_daytime(serialised_start_time), deserialise_daytime(serialised_end_time))
+
+
+def _to_seconds(serialised_time: str) -> int:
+    return deserialise_daytime(serialised_time).as_seconds()
+
+
+EXAMPLE_PLAN = TransitionPlan.from_on_off_intervals(
+    (
+        _to_time_interval("01:00:00", "02:00:00"),
+        _to_time_interval("12:00:00", "13:00:00"),
+        _to_time_interval("23:00:00", "00:30:00"),
+    )
+)
+
+
+class TestTransitionPlan:
+    def test_from_on_off_intervals(self):
+        assert EXAMPLE_PLAN == TransitionPlan(
+            tuple(
+                _to_seconds(time) for time in ("00:30:00", "01:00:00", "02:00:00", "12:00:00", "13:00:00", "23:00:00")
+            ),
+            (OFF, ON, OFF, ON, OFF, ON),
+        )
+
+    def test_from_on_off_intervals_none(self):
+        assert len(TransitionPlan.from_on_off_intervals(())) == 0
+
+    def test_from_on_off_intervals_touching(self):
+        plan = TransitionPlan.from_on_off_intervals(
+            (_to_time_interval("01:00:00", "02:00:00"), _to_time_interval("02:00:00", "03:00:00"))
+        )
+        assert plan == TransitionPlan((_to_seconds("01:00:00"), _to_seconds("03:00:00")), (ON, OFF))
+
+    def test_from_on_off_intervals_touching_over_whole_day(self):
+        plan = TransitionPlan.from_on_off_intervals(
+            (_to_time_interval("12:00:00", "16:00:00"), _to_time_interval("16:00:00", "12:00:00"))
+        )
+        assert len(plan) == 0
+        assert plan == TransitionPlan(constant_state=ON)
+        for time in ("00:00:00", "12:00:00", "16:00:00", "23:59:59"):
+            assert plan.state_at(_to_seconds(time)) == ON
+
+    def test_state_at(self):
+        for time in ("00:00:00", "00:29:59", "01:00:00", "12:30:00", "23:00:00"):
+            assert EXAMPLE_PLAN.state_at(_to_seconds(time)) == ON
+        for time in ("00:30:00", "02:00:00", "22:59:59"):
+            assert EXAMPLE_PLAN.state_at(_to_seconds(time)) == OFF
+
+    def test_state_at_when_empty(self):
+        assert TransitionPlan().state_at(0) == OFF
+
+    def test_find_next(self):
+        assert EXAMPLE_PLAN.find_next(_to_seconds("00:00:00")) == 0
+        assert EXAMPLE_PLAN.find_next(_to_seconds("01:00:00")) == 2
+        assert EXAMPLE_PLAN.find_next(_to_seconds("23:30:00")) == 0
+
+    def test_find_next_when_empty(self):
+        with pytest.raises(IndexError):
+            TransitionPlan().find_next(0)
+
+    def test_seconds_until(self):
+        assert EXAMPLE_PLAN.seconds_until(0, _to_seconds("23:30:00")) == timedelta(hours=1).total_seconds()
+        assert EXAMPLE_PLAN.seconds_until(1, _to_seconds("00:59:00")) == 60
+
+    def test_advance(self):
+        cursor = EXAMPLE_PLAN.find_next(_to_seconds("00:45:00"))
+        assert EXAMPLE_PLAN.advance(cursor, _to_seconds("00:45:00"), _to_seconds("00:59:59")) == cursor
+        assert EXAMPLE_PLAN.advance(cursor, _to_seconds("00:45:00"), _to_seconds("01:00:00")) == cursor + 1
+
+    def test_advance_past_many(self):
+        cursor = EXAMPLE_PLAN.find_next(_to_seconds("00:45:00"))
+        cursor = EXAMPLE_PLAN.advance(cursor, _to_seconds("00:45:00"), _to_seconds("23:30:00"))
+        assert cursor == 0
+        assert EXAMPLE_PLAN.states[cursor - 1] == ON
+
+    def test_advance_backwards(self):
+        # Going back in time goes (almost) all the way around the day
+        cursor = EXAMPLE_PLAN.find_next(_to_seconds("12:30:00"))
+        cursor = EXAMPLE_PLAN.advance(cursor, _to_seconds("12:30:00"), _to_seconds("01:30:00"))
+        assert cursor == EXAMPLE_PLAN.find_next(_to_seconds("01:30:00"))
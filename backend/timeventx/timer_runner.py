@@ -1,11 +1,13 @@
 from datetime import timedelta
-from typing import Callable
+from typing import Callable, Iterable, Optional
 
 from timeventx._logging import get_logger
 from timeventx.actions.actions import ActionController
+from timeventx.timers.bitmap import BitmapSchedule
 from timeventx.timers.collections.listenable import Event, ListenableTimersCollection
-from timeventx.timers.intervals import TimeInterval, merge_and_sort_intervals
-from timeventx.timers.timers import DayTime
+from timeventx.timers.intervals import MergedIntervalsIndex, TimeInterval
+from timeventx.timers.timers import DayTime, IdentifiableTimer, TimerId
+from timeventx.timers.transitions import TransitionPlan
 
 try:
     import asyncio
@@ -26,21 +28,55 @@ class NoTimersError(RuntimeError):
 class TimerRunner:
     @property
     def on_off_intervals(self) -> tuple[TimeInterval, ...]:
-        return self._on_off_intervals
+        self._check_for_external_changes()
+        return self._schedule.on_off_intervals
+
+    @property
+    def transition_plan(self) -> TransitionPlan:
+        self._check_for_external_changes()
+        if self._transition_plan is None:
+            self._transition_plan = TransitionPlan.from_on_off_intervals(self.on_off_intervals)
+        return self._transition_plan
 
     def __init__(
         self,
         timers: ListenableTimersCollection,
         action_controller: ActionController,
         current_time_getter: Callable[[], DayTime] = DayTime.now,
+        schedule_factory: Callable[
+            [Iterable[tuple[TimerId, int, int]]], MergedIntervalsIndex | BitmapSchedule
+        ] = MergedIntervalsIndex.from_timer_seconds,
     ):
+        """
+        Constructor.
+        :param timers: timers to run
+        :param action_controller: controller of the actions to perform when turning on and off
+        :param current_time_getter: gets the current time of day (e.g. `DayTime.now` or a `MonotonicClock`)
+        :param schedule_factory: creates the schedule of when the timers are on from the
+                                 `(timer_id, start_seconds, duration_seconds)` of each timer (e.g.
+                                 `MergedIntervalsIndex.from_timer_seconds` or `BitmapSchedule.from_timer_seconds`)
+        """
         assert issubclass(type(timers), ListenableTimersCollection)
 
         self.timers = timers
         self.action_controller = action_controller
         self._turned_on = False
         self._current_time_getter = current_time_getter
-        self._on_off_intervals = self._calculate_on_off_intervals()
+        # Clocks such as `MonotonicClock` can provide the seconds of the day without creating a `DayTime`
+        self._current_seconds_getter: Callable[[], int] = getattr(
+            current_time_getter, "seconds_of_day", lambda: current_time_getter().as_seconds()
+        )
+        self._schedule_factory = schedule_factory
+        self._schedule = schedule_factory(self.timers.iter_timer_seconds())
+        # Set if a change to the timers could not be applied to the schedule (e.g. as the timers would always be on), in
+        # which case the schedule is rebuilt from the timers on the next change
+        self._schedule_out_of_date = False
+        # Changes made to the timers by something else are not notified, so are checked for when the schedule is used
+        self._external_change_count = self.timers.get_external_change_count()
+        # Compiled from the schedule when needed
+        self._transition_plan: Optional[TransitionPlan] = None
+        # Incremented each time the schedule changes
+        self._generation = 0
         self.timers_change_event = asyncio.Event()
 
         self._running = False
@@ -48,37 +84,47 @@ class TimerRunner:
         self.run_stop_event = asyncio.Event()
         self.minimum_time_accuracy: timedelta = timedelta(seconds=1)
 
-        def on_timers_change(*args) -> None:
-            self._on_off_intervals = self._calculate_on_off_intervals()
-            self.timers_change_event.set()
+        def on_timer_added(timer: IdentifiableTimer) -> None:
+            self._update_schedule(lambda: self._schedule.add(timer))
+
+        def on_timer_removed(timer_id: TimerId) -> None:
+            self._update_schedule(lambda: self._schedule.remove(timer_id))
 
-        self.timers.add_listener(Event.TIMER_ADDED, on_timers_change)
-        self.timers.add_listener(Event.TIMER_REMOVED, on_timers_change)
+        def on_timer_updated(original_timer: IdentifiableTimer, replacement_timer: IdentifiableTimer) -> None:
+            def update():
+                self._schedule.remove(original_timer.id)
+                self._schedule.add(replacement_timer)
+
+            self._update_schedule(update)
+
+        def on_timers_changed(added_timers: list[IdentifiableTimer], removed_timer_ids: list[TimerId]) -> None:
+            # The schedule is rebuilt once for all the changes, rather than updated for each timer
+            self._rebuild_schedule()
+
+        self.timers.add_listener(Event.TIMER_ADDED, on_timer_added)
+        self.timers.add_listener(Event.TIMER_REMOVED, on_timer_removed)
+        self.timers.add_listener(Event.TIMER_UPDATED, on_timer_updated)
+        self.timers.add_listener(Event.TIMERS_CHANGED, on_timers_changed)
+
+    @property
+    def generation(self) -> int:
+        """
+        Number that changes whenever the schedule changes, so things derived from it (e.g. responses) can be cached.
+        """
+        self._check_for_external_changes()
+        return self._generation
 
     def is_on(self) -> bool:
-        try:
-            return self.next_interval()[1]
-        except NoTimersError:
-            return False
+        self._check_for_external_changes()
+        return self._schedule.is_on(self._current_seconds_getter())
 
     def next_interval(self) -> tuple[TimeInterval, bool]:
-        if len(self._on_off_intervals) == 0:
+        self._check_for_external_changes()
+        try:
+            return self._schedule.next_interval(self._current_seconds_getter())
+        except IndexError:
             raise NoTimersError("No timers")
 
-        now = self._current_time_getter()
-        now_interval = TimeInterval(now, now + timedelta(seconds=1))
-
-        for i, interval in enumerate(self._on_off_intervals):
-            if interval.intersects(now_interval):
-                return interval, True
-            elif interval.start_time >= now:
-                if i == 0 and self._on_off_intervals[-1].intersects(now_interval):
-                    # May intersect with the interval at the end of the list if it spans midnight
-                    return self._on_off_intervals[-1], True
-                else:
-                    return interval, False
-        return self._on_off_intervals[0], False
-
     async def run(self):
         async with self._running_lock:
             if self._running:
@@ -88,108 +134,108 @@ class TimerRunner:
             raise RuntimeError("Run stop event must be cleared before running")
 
         while not self.run_stop_event.is_set():
-            while len(self.timers) == 0:
-                self._set_off()
-
-                logger.debug(f"Waiting for timers change event, currently: {self.timers_change_event.is_set()}")
-                await self.timers_change_event.wait()
-                self.timers_change_event.clear()
-
-                if self.run_stop_event.is_set():
-                    return
-
             self.timers_change_event.clear()
-
-            try:
-                next_interval, on_now = self.next_interval()
-            except NoTimersError:
-                # Since getting the lock it is possible that the timers have been updated!
+            # Timer changes swap in a new plan, which is picked up the next time around
+            plan = self.transition_plan
+
+            if len(plan) == 0:
+                # Either no timers, or timers that cover the whole day
+                self._set_state(plan.constant_state)
+                logger.debug("Waiting for timers change or run stop event")
+                await self._wait_for_events()
                 continue
 
-            first_encounter_time = self._current_time_getter()
-            logger.debug(f"Got next interval at {first_encounter_time}: {next_interval}")
-
-            if not on_now:
-                self._set_off()
-
-                logger.info(f"Waiting for next interval start time: {next_interval.start_time}")
-
-                def on_time_missed_condition(current_time: DayTime) -> bool:
-                    # `True` when the start time has been missed and we've "gone around the clock"
-                    return (
-                        False
-                        if current_time == first_encounter_time
-                        else TimeInterval(current_time, first_encounter_time).duration
-                        < TimeInterval(current_time, next_interval.start_time).duration
-                    )
-
-                wait_completed = await self._wait_for_time(
-                    next_interval.start_time, on_time_missed_condition, "on action"
-                )
-                if not wait_completed:
-                    continue
-
-            def off_time_missed_condition(current_time: DayTime) -> bool:
-                # `True` when the end time has been missed and we've "gone around the clock"
-                return (
-                    False
-                    if current_time == first_encounter_time
-                    else TimeInterval(current_time, first_encounter_time).duration
-                    < TimeInterval(current_time, next_interval.end_time).duration
-                )
-
-            self._set_on()
+            previous_seconds = self._current_seconds_getter()
+            cursor = plan.find_next(previous_seconds)
+            self._set_state(plan.states[cursor - 1])
 
-            logger.debug(f"Waiting for interval end time: {next_interval.end_time}")
-            wait_completed = await self._wait_for_time(next_interval.end_time, off_time_missed_condition, "off action")
-            if not wait_completed:
-                continue
+            while not self.timers_change_event.is_set() and not self.run_stop_event.is_set():
+                seconds_until_transition = plan.seconds_until(cursor, previous_seconds)
+                logger.debug(f"Seconds to next transition: {seconds_until_transition}")
+                await self._wait_for_events(max(seconds_until_transition, self.minimum_time_accuracy.total_seconds()))
 
-            self._set_off()
+                # The time is re-read as the wait may have ended early or late, or the clock may have changed
+                current_seconds = self._current_seconds_getter()
+                cursor = plan.advance(cursor, previous_seconds, current_seconds)
+                previous_seconds = current_seconds
+                self._set_state(plan.states[cursor - 1])
+                # Sets the timers change event if the timers have been changed by something else
+                self._check_for_external_changes()
 
         self._running = False
         # Default to off state
         self._set_off()
 
-    async def _wait_for_time(
-        self, waiting_for: DayTime, exit_condition: callable, wait_description: str = "wait time"
-    ) -> bool:
-        """
-        Waits until the specified time is reached, returning early if the wait was interrupted by a change in the timers
-        or the run stop event being set.
-        :param waiting_for: the time to wait for
-        :param exit_condition: exit as wait completed if condition ever returns `True`. Passed current time as first
-                               and only argument
-        :param wait_description: description of the wait for logging purposes
-        :returns: `True` if the wait was completed
-        """
-        # Unfortunately, timeouts aren't implemented on asyncio events:
-        # https://docs.micropython.org/en/v1.14/library/uasyncio.html#class-lock
-        # Therefore, the implementation polls the event every second until the time is reached or the event is triggered
-        while True:
-            current_time = self._current_time_getter()
-            difference_in_seconds = (
-                0 if current_time == waiting_for else TimeInterval(current_time, waiting_for).duration.seconds
-            )
-            logger.debug(f"Seconds to {wait_description}: {difference_in_seconds} ({current_time} => {waiting_for})")
-
-            if difference_in_seconds <= 0:
-                return True
+    def _on_schedule_changed(self):
+        self._transition_plan = None
+        self._generation += 1
+        self.timers_change_event.set()
 
-            if self.timers_change_event.is_set():
-                logger.debug(f"Timers changed whilst waiting for {wait_description}")
-                return False
+    def _update_schedule(self, update: Callable[[], None]):
+        if self._schedule_out_of_date:
+            self._rebuild_schedule()
+            return
+        try:
+            update()
+        except ValueError:
+            self._schedule_out_of_date = True
+            raise
+        finally:
+            self._on_schedule_changed()
+
+    def _rebuild_schedule(self):
+        try:
+            self._schedule = self._schedule_factory(self.timers.iter_timer_seconds())
+        except ValueError:
+            # The previous schedule is kept until it can be rebuilt
+            self._schedule_out_of_date = True
+            raise
+        else:
+            self._schedule_out_of_date = False
+        finally:
+            self._on_schedule_changed()
+
+    def _check_for_external_changes(self):
+        external_change_count = self.timers.get_external_change_count()
+        if external_change_count != self._external_change_count:
+            self._external_change_count = external_change_count
+            try:
+                self._rebuild_schedule()
+            except ValueError as e:
+                # Not raised, as nothing here caused the change
+                logger.error(f"Could not rebuild schedule after external change to timers: {e}")
 
-            if exit_condition(current_time):
-                return True
+    async def _wait_for_events(self, timeout_in_seconds: Optional[float] = None) -> bool:
+        """
+        Waits until either the timers change event or the run stop event is set, or until the timeout.
+        :param timeout_in_seconds: maximum time to wait for, or `None` to wait until one of the events is set
+        :returns: `True` if one of the events was set before the timeout
+        """
+        # `asyncio.wait` is not implemented in MicroPython so the events are waited on in cancellable tasks that all
+        # set the same event, which can then be waited on with a timeout
+        event_set = asyncio.Event()
 
-            if self.run_stop_event.is_set():
-                return False
+        async def wait_for_event(event: asyncio.Event):
+            await event.wait()
+            event_set.set()
 
-            await asyncio.sleep(self.minimum_time_accuracy.total_seconds())
+        event_waiters = tuple(
+            asyncio.create_task(wait_for_event(event)) for event in (self.timers_change_event, self.run_stop_event)
+        )
+        try:
+            await asyncio.wait_for(event_set.wait(), timeout_in_seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            for event_waiter in event_waiters:
+                event_waiter.cancel()
 
-    def _calculate_on_off_intervals(self) -> tuple[TimeInterval, ...]:
-        return merge_and_sort_intervals(tuple(map(lambda timer: timer.interval, self.timers)))
+    def _set_state(self, on: bool):
+        if on:
+            self._set_on()
+        else:
+            self._set_off()
 
     def _set_on(self):
         if not self._turned_on:
@@ -0,0 +1,223 @@
+from typing import Iterable
+
+from timeventx.timers.intervals import TimeInterval, to_unrolled_timer_interval
+from timeventx.timers.timers import (
+    SECONDS_IN_A_DAY,
+    DayTime,
+    IdentifiableTimer,
+    TimerId,
+)
+
+MINUTE_RESOLUTION = 60
+SECOND_RESOLUTION = 1
+
+_FULL_BYTE = 0xFF
+_EMPTY_BYTE = 0x00
+
+
+class BitmapSchedule:
+    """
+    Schedule of when timers are on, held as a bitmap with a bit for each slot (e.g. minute) of the day.
+
+    An alternative to `MergedIntervalsIndex` (with the same interface as used by the timer runner) that answers whether
+    the timers are on with a single bit lookup, and finds the next transition by scanning a byte at a time.
+
+    Timers are rounded outwards to whole slots, and intervals that touch are joined.
+    """
+
+    @property
+    def on_off_intervals(self) -> tuple[TimeInterval, ...]:
+        if self._on_off_intervals is None:
+            self._on_off_intervals = self._calculate_on_off_intervals()
+        return self._on_off_intervals
+
+    @staticmethod
+    def from_timer_seconds(
+        timer_seconds: Iterable[tuple[TimerId, int, int]], resolution: int = MINUTE_RESOLUTION
+    ) -> "BitmapSchedule":
+        """
+        Creates a schedule from timer times, without needing timer objects.
+        :param timer_seconds: `(timer_id, start_seconds, duration_seconds)` of each timer, e.g. as given by
+                              `IdentifiableTimersCollection.iter_timer_seconds`
+        :param resolution: length of each slot in the bitmap, in seconds (e.g. `MINUTE_RESOLUTION`)
+        :return: the created schedule
+        """
+        schedule = BitmapSchedule(resolution=resolution)
+        for timer_id, start_seconds, duration_seconds in timer_seconds:
+            schedule._timer_slots[timer_id] = schedule._to_slots(start_seconds, duration_seconds)
+        schedule._rebuild()
+        return schedule
+
+    def __init__(self, timers: Iterable[IdentifiableTimer] = (), resolution: int = MINUTE_RESOLUTION):
+        """
+        Constructor.
+        :param timers: timers to schedule
+        :param resolution: length of each slot in the bitmap, in seconds (e.g. `MINUTE_RESOLUTION`). Must divide a day
+                           into a multiple of 8 slots
+        :raises ValueError: if the resolution is not supported or the timers are always on
+        """
+        if SECONDS_IN_A_DAY % (resolution * 8) != 0:
+            raise ValueError(f"Unsupported resolution: {resolution}")
+        self.resolution = resolution
+        self._slots = SECONDS_IN_A_DAY // resolution
+        self._bitmap = bytearray(self._slots // 8)
+        # Unrolled `(start_slot, end_slot)` of each timer, used to rebuild the bitmap when a timer is removed
+        self._timer_slots: dict[TimerId, tuple[int, int]] = {}
+        self._on_off_intervals = None
+
+        for timer in timers:
+            self._timer_slots[timer.id] = self._to_slots(
+                timer.start_time.as_seconds(), int(timer.duration.total_seconds())
+            )
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._timer_slots)
+
+    def is_on(self, seconds: int) -> bool:
+        """
+        Gets whether the timers are on at the given time.
+        :param seconds: time of day, in seconds
+        :return: `True` if on
+        """
+        return self._get(seconds // self.resolution) == 1
+
+    def next_interval(self, seconds: int) -> tuple[TimeInterval, bool]:
+        """
+        Gets the interval that is on at the given time, or the next one to start if none are.
+        :param seconds: time of day, in seconds
+        :return: tuple where the first element is the interval and the second is whether it is on at the given time
+        :raises IndexError: if there are no timers
+        """
+        if len(self._timer_slots) == 0:
+            raise IndexError("No timers")
+        slot = seconds // self.resolution
+
+        on_now = self._get(slot) == 1
+        if on_now:
+            start = self._find_previous(slot, 0)
+            if start == -1:
+                # On from the start of the day, so may have started the day before
+                start = self._find_previous(self._slots - 1, 0)
+            start += 1
+        else:
+            start = self._find_next(slot, 1)
+            if start == -1:
+                start = self._find_next(0, 1)
+        end = self._find_next(start, 0)
+        if end == -1:
+            end = self._find_next(0, 0)
+
+        return self._to_interval(start, end), on_now
+
+    def add(self, timer: IdentifiableTimer):
+        """
+        Adds the given timer to the schedule.
+        :param timer: timer that has been added
+        :raises ValueError: if the timer is already in the schedule or if the timers would always be on
+        """
+        if timer.id in self._timer_slots:
+            raise ValueError(f"Timer with id {timer.id} already scheduled")
+        slots = self._to_slots(timer.start_time.as_seconds(), int(timer.duration.total_seconds()))
+        self._timer_slots[timer.id] = slots
+        self._set(*slots)
+        self._on_off_intervals = None
+        if self._find_next(0, 0) == -1:
+            del self._timer_slots[timer.id]
+            self._rebuild()
+            raise ValueError("Intervals overlap such that there is no end time")
+
+    def remove(self, timer_id: TimerId) -> bool:
+        """
+        Removes the timer with the given ID from the schedule.
+        :param timer_id: ID of the timer that has been removed
+        :return: `True` if the timer was in the schedule
+        """
+        if self._timer_slots.pop(timer_id, None) is None:
+            return False
+        # Bits cannot be unset as other timers may share them, so the bitmap is rebuilt from the remaining timers
+        self._rebuild()
+        return True
+
+    def _to_slots(self, start_seconds: int, duration_seconds: int) -> tuple[int, int]:
+        start, end = to_unrolled_timer_interval(start_seconds, duration_seconds)
+        # Rounded outwards, so the slots cover all of the timer
+        return start // self.resolution, -(-end // self.resolution)
+
+    def _to_interval(self, start_slot: int, end_slot: int) -> TimeInterval:
+        return TimeInterval(
+            DayTime.from_seconds(start_slot * self.resolution % SECONDS_IN_A_DAY),
+            DayTime.from_seconds(end_slot * self.resolution % SECONDS_IN_A_DAY),
+        )
+
+    def _rebuild(self):
+        bitmap = self._bitmap
+        for i in range(len(bitmap)):
+            bitmap[i] = _EMPTY_BYTE
+        for start, end in self._timer_slots.values():
+            self._set(start, end)
+        self._on_off_intervals = None
+        if len(self._timer_slots) > 0 and self._find_next(0, 0) == -1:
+            raise ValueError("Intervals overlap such that there is no end time")
+
+    def _set(self, start: int, end: int):
+        # Sets the bits of the unrolled slots `[start, end)`, wrapping around midnight
+        if end > self._slots:
+            self._set(0, end - self._slots)
+            end = self._slots
+        bitmap = self._bitmap
+        while start < end and start & 7 != 0:
+            bitmap[start >> 3] |= 1 << (start & 7)
+            start += 1
+        full_bytes_end = end >> 3
+        if start >> 3 < full_bytes_end:
+            # Slice assignment with a `bytes` of the same length, as supported by MicroPython
+            bitmap[start >> 3 : full_bytes_end] = bytes((_FULL_BYTE,)) * (full_bytes_end - (start >> 3))
+            start = full_bytes_end << 3
+        while start < end:
+            bitmap[start >> 3] |= 1 << (start & 7)
+            start += 1
+
+    def _get(self, slot: int) -> int:
+        return (self._bitmap[slot >> 3] >> (slot & 7)) & 1
+
+    def _find_next(self, slot: int, value: int) -> int:
+        # First slot from the given slot (inclusive) with the given value, or -1 if there are none before midnight
+        bitmap = self._bitmap
+        skippable_byte = _EMPTY_BYTE if value == 1 else _FULL_BYTE
+        while slot < self._slots:
+            if slot & 7 == 0 and bitmap[slot >> 3] == skippable_byte:
+                slot += 8
+                continue
+            if (bitmap[slot >> 3] >> (slot & 7)) & 1 == value:
+                return slot
+            slot += 1
+        return -1
+
+    def _find_previous(self, slot: int, value: int) -> int:
+        # Last slot up to the given slot (inclusive) with the given value, or -1 if there are none since midnight
+        bitmap = self._bitmap
+        skippable_byte = _EMPTY_BYTE if value == 1 else _FULL_BYTE
+        while slot >= 0:
+            if slot & 7 == 7 and bitmap[slot >> 3] == skippable_byte:
+                slot -= 8
+                continue
+            if (bitmap[slot >> 3] >> (slot & 7)) & 1 == value:
+                return slot
+            slot -= 1
+        return -1
+
+    def _calculate_on_off_intervals(self) -> tuple[TimeInterval, ...]:
+        runs = []
+        slot = self._find_next(0, 1)
+        while slot != -1:
+            end = self._find_next(slot, 0)
+            if end == -1:
+                end = self._slots
+            runs.append((slot, end))
+            slot = self._find_next(end, 1) if end < self._slots else -1
+
+        # An interval that spans midnight is split across the end and start of the bitmap, and is sorted last
+        if len(runs) > 1 and runs[0][0] == 0 and runs[-1][1] == self._slots:
+            runs[-1] = (runs[-1][0], runs.pop(0)[1])
+        return tuple(self._to_interval(start, end) for start, end in runs)
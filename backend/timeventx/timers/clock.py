@@ -0,0 +1,104 @@
+import time
+from datetime import timedelta
+from typing import Callable, Optional
+
+from timeventx._logging import get_logger
+from timeventx.timers.timers import SECONDS_IN_A_DAY, DayTime
+
+if hasattr(time, "ticks_ms"):
+    # MicroPython
+    _get_ticks_ms = time.ticks_ms
+    _ticks_diff = time.ticks_diff
+else:
+
+    def _get_ticks_ms() -> int:
+        return time.monotonic_ns() // 1_000_000
+
+    def _ticks_diff(end: int, start: int) -> int:
+        return end - start
+
+
+logger = get_logger(__name__)
+
+
+def get_wall_clock_seconds() -> int:
+    """
+    Gets the time of day from the wall clock.
+    :return: seconds since the start of the day
+    """
+    # Use of `tuple` aligns CPython format to MicroPython, without affecting the latter
+    current_time = tuple(time.localtime())
+    return current_time[3] * 3600 + current_time[4] * 60 + current_time[5]
+
+
+class MonotonicClock:
+    """
+    Clock that gets the time of day from a monotonic tick counter, which is anchored to the wall clock.
+
+    The anchor is periodically resynchronised with the wall clock, at which point the drift between the two is measured.
+    In between, reading the time is integer arithmetic and is unaffected by changes to the wall clock (e.g. by NTP).
+
+    Can be used as the current time getter of `TimerRunner`.
+    """
+
+    @property
+    def drift(self) -> timedelta:
+        """
+        Difference between the wall clock and this clock, measured at the last resynchronisation.
+        """
+        return timedelta(seconds=self._drift_in_seconds)
+
+    def __init__(
+        self,
+        resync_interval: timedelta = timedelta(hours=1),
+        wall_clock_seconds_getter: Callable[[], int] = get_wall_clock_seconds,
+        ticks_ms_getter: Callable[[], int] = _get_ticks_ms,
+    ):
+        """
+        Constructor.
+        :param resync_interval: how often to resynchronise with the wall clock. On MicroPython, this must be less than
+                                half the period of `time.ticks_ms`
+        :param wall_clock_seconds_getter: gets the time of day, in seconds, from the wall clock
+        :param ticks_ms_getter: gets the monotonic tick counter, in milliseconds
+        """
+        self.resync_interval = resync_interval
+        self._resync_interval_in_ms = int(resync_interval.total_seconds() * 1000)
+        self._wall_clock_seconds_getter = wall_clock_seconds_getter
+        self._ticks_ms_getter = ticks_ms_getter
+        self._drift_in_seconds = 0
+        self._anchor_ticks_ms: Optional[int] = None
+        self._anchor_ms = 0
+        self.resync()
+
+    def __call__(self) -> DayTime:
+        return DayTime.from_seconds(self.seconds_of_day())
+
+    def seconds_of_day(self) -> int:
+        """
+        Gets the time of day.
+        :return: seconds since the start of the day
+        """
+        elapsed_ms = _ticks_diff(self._ticks_ms_getter(), self._anchor_ticks_ms)
+        if elapsed_ms >= self._resync_interval_in_ms:
+            self.resync()
+            elapsed_ms = 0
+        return (self._anchor_ms + elapsed_ms) // 1000 % SECONDS_IN_A_DAY
+
+    def resync(self):
+        """
+        Re-anchors the tick counter to the wall clock, measuring the drift between the two.
+        """
+        ticks_ms = self._ticks_ms_getter()
+        wall_clock_seconds = self._wall_clock_seconds_getter()
+
+        if self._anchor_ticks_ms is not None:
+            expected_seconds = (self._anchor_ms + _ticks_diff(ticks_ms, self._anchor_ticks_ms)) // 1000
+            # Normalised to the nearest way around the clock
+            drift_in_seconds = (wall_clock_seconds - expected_seconds) % SECONDS_IN_A_DAY
+            if drift_in_seconds > SECONDS_IN_A_DAY // 2:
+                drift_in_seconds -= SECONDS_IN_A_DAY
+            self._drift_in_seconds = drift_in_seconds
+            logger.debug(f"Resynchronised clock with wall clock, with a drift of {drift_in_seconds}s")
+
+        self._anchor_ticks_ms = ticks_ms
+        self._anchor_ms = wall_clock_seconds * 1000
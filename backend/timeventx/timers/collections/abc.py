@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Collection, Iterable, TypeAlias, cast
+from typing import Collection, Iterable, Iterator, TypeAlias, cast
 
 from timeventx.timers.timers import IdentifiableTimer, Timer, TimerId
 
@@ -53,6 +53,81 @@ class IdentifiableTimersCollection(IdentifiableTimerCollection):
         :return: number of timers in the collection
         """
 
+    def replace(self, timer_id: TimerId, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        """
+        Replaces the timer with the given ID with the given timer, keeping the ID.
+
+        Collections can override this to replace the timer in one operation, rather than removing it then adding it.
+        :param timer_id: ID of the timer to replace
+        :param timer: timer to replace it with
+        :return: model of the replacement timer
+        :raises KeyError: if timer does not exist
+        :raises ValueError: if the replacement timer has a different ID
+        """
+        replacement_timer = self._to_replacement_timer(timer_id, timer)
+        self.get(timer_id)
+        self.remove(timer_id)
+        return self.add(replacement_timer)
+
+    def add_many(self, timers: Iterable[Timer | IdentifiableTimer]) -> list[IdentifiableTimer]:
+        """
+        Adds the given timers to the collection.
+
+        Collections can override this to add the timers more efficiently than one at a time (e.g. by writing to storage
+        once).
+        :param timers: timers to add
+        :return: models of the timers added, in the same order
+        :raises ValueError: if a timer with the same ID as another timer already exists, in which case no timers are
+                            added
+        """
+        timers = list(timers)
+        self._check_timer_ids_unused(timers)
+        return [self.add(timer) for timer in timers]
+
+    def remove_many(self, timer_ids: Iterable[TimerId]) -> list[TimerId]:
+        """
+        Removes the timers with the given IDs.
+
+        Collections can override this to remove the timers more efficiently than one at a time.
+        :param timer_ids: IDs of the timers to remove
+        :return: IDs of the timers that were removed
+        """
+        return [timer_id for timer_id in timer_ids if self.remove(timer_id)]
+
+    def replace_all(self, timers: Iterable[Timer | IdentifiableTimer]) -> list[IdentifiableTimer]:
+        """
+        Replaces all the timers in the collection with the given timers.
+        :param timers: timers to replace the existing timers with
+        :return: models of the timers added, in the same order
+        :raises ValueError: if the given timers contain the same ID more than once, in which case no timers are replaced
+        """
+        timers = list(timers)
+        self._check_timer_ids_unused(timers, check_collection=False)
+        # IDs copied so the collection is not changed whilst iterating
+        self.remove_many([timer_id for timer_id, _, _ in self.iter_timer_seconds()])
+        return self.add_many(timers)
+
+    def get_external_change_count(self) -> int:
+        """
+        Gets the number of times changes made to the timers by something other than this collection (e.g. another
+        process writing to the same files) have been loaded.
+
+        Collections that do not detect such changes always return 0.
+        :return: the number of external changes loaded, which only increases
+        """
+        return 0
+
+    def iter_timer_seconds(self) -> Iterator[tuple[TimerId, int, int]]:
+        """
+        Gets an iterator over the ID, start time and duration of each timer, with times in whole seconds.
+
+        Collections that do not hold timer objects can override this so consumers, such as the intervals index, can
+        read the timers without any timer objects being created.
+        :return: iterator of `(timer_id, start_seconds, duration_seconds)`
+        """
+        for timer in self:
+            yield timer.id, timer.start_time.as_seconds(), int(timer.duration.total_seconds())
+
     def __contains__(self, item: object) -> bool:
         if not issubclass(type(item), IdentifiableTimer):
             return False
@@ -62,3 +137,31 @@ class IdentifiableTimersCollection(IdentifiableTimerCollection):
             return True
         except KeyError:
             return False
+
+    def _check_timer_ids_unused(self, timers: list[Timer | IdentifiableTimer], check_collection: bool = True):
+        """
+        Checks that the given timers can all be added, before any are, so a bulk change is not partially made.
+        :param timers: timers to check
+        :param check_collection: whether to check the IDs against the timers in the collection, as well as each other
+        :raises ValueError: if a timer ID is used more than once
+        """
+        timer_ids = set()
+        for timer in timers:
+            if isinstance(timer, IdentifiableTimer):
+                if timer.id in timer_ids or (check_collection and timer in self):
+                    raise ValueError(f"Timer with id {timer.id} already exists")
+                timer_ids.add(timer.id)
+
+    def _to_replacement_timer(self, timer_id: TimerId, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        """
+        Gets the given timer with the ID of the timer it is replacing.
+        :param timer_id: ID of the timer being replaced
+        :param timer: replacement timer
+        :return: replacement timer with the ID
+        :raises ValueError: if the replacement timer has a different ID
+        """
+        if isinstance(timer, IdentifiableTimer):
+            if timer.id != timer_id:
+                raise ValueError(f"Replacement timer has a different id ({timer.id}) to timer {timer_id}")
+            return timer
+        return IdentifiableTimer.from_timer(timer, timer_id)
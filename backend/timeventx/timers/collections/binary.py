@@ -0,0 +1,139 @@
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from timeventx._logging import get_logger
+from timeventx.timers.collections.abc import IdentifiableTimersCollection
+from timeventx.timers.serialisation import (
+    IncompleteTimerRecordError,
+    record_to_identifiable_timer,
+    timer_to_record,
+)
+from timeventx.timers.timers import IdentifiableTimer, Timer, TimerId
+
+BINARY_FILE_EXTENSION = ".bin"
+
+# File header: identifier of the format, followed by the next timer ID to allocate
+_FILE_MAGIC = b"TVX1"
+_FILE_HEADER_FORMAT = "<4sq"
+_FILE_HEADER_SIZE = struct.calcsize(_FILE_HEADER_FORMAT)
+_NEXT_TIMER_ID_OFFSET = len(_FILE_MAGIC)
+
+logger = get_logger(__name__)
+
+
+class BinaryTimersCollection(IdentifiableTimersCollection):
+    """
+    Timers collection stored in a single file of binary timer records (see `timer_to_record`).
+
+    The whole file is read into one buffer when opened, with the records decoded from it in place. Adds are appended to
+    the file, whereas removes rewrite it.
+    """
+
+    @staticmethod
+    def from_timers(timers: Iterable[IdentifiableTimer], location: Path) -> "BinaryTimersCollection":
+        """
+        Creates a file containing the given timers, e.g. to migrate from a `TimersDatabase`.
+        :param timers: timers to put in the file
+        :param location: location of the file to create
+        :return: the created collection
+        :raises ValueError: if a file already exists at the given location
+        """
+        if location.exists():
+            raise ValueError(f"Timers file already exists: {location}")
+        collection = BinaryTimersCollection(location)
+        for timer in timers:
+            collection._timers[timer.id] = timer
+            collection._next_timer_id = max(collection._next_timer_id, TimerId(timer.id + 1))
+        collection._rewrite()
+        return collection
+
+    def __init__(self, location: Path):
+        """
+        Constructor.
+        :param location: location of the timers file, which is created if it does not exist
+        """
+        self.location = location
+        self._timers: dict[TimerId, IdentifiableTimer] = {}
+        self._next_timer_id = TimerId(2)
+
+        location.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __iter__(self) -> Iterator[IdentifiableTimer]:
+        return iter(self._timers.values())
+
+    def get(self, timer_id: TimerId) -> IdentifiableTimer:
+        try:
+            return self._timers[timer_id]
+        except KeyError:
+            raise KeyError(f"Timer with id {timer_id} does not exist")
+
+    def add(self, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        if isinstance(timer, IdentifiableTimer):
+            if timer.id in self._timers:
+                raise ValueError(f"Timer with id {timer.id} already exists")
+            identifiable_timer = timer
+        else:
+            identifiable_timer = IdentifiableTimer.from_timer(timer, self._next_timer_id)
+        record = timer_to_record(identifiable_timer)
+        next_timer_id = max(self._next_timer_id, TimerId(identifiable_timer.id + 1))
+
+        # String cast required with MicroPython due to use of non-standard `Path` lib
+        with open(str(self.location), "r+b") as file:
+            # The record is appended before the next ID is updated. If interrupted in between, the next ID is
+            # recalculated from the records when loaded
+            file.seek(0, 2)
+            file.write(record)
+            file.seek(_NEXT_TIMER_ID_OFFSET)
+            file.write(struct.pack("<q", next_timer_id))
+
+        self._timers[identifiable_timer.id] = identifiable_timer
+        self._next_timer_id = next_timer_id
+        return identifiable_timer
+
+    def remove(self, timer_id: TimerId) -> bool:
+        if timer_id not in self._timers:
+            return False
+        del self._timers[timer_id]
+        self._rewrite()
+        return True
+
+    def _load(self):
+        try:
+            # String cast required with MicroPython due to use of non-standard `Path` lib
+            with open(str(self.location), "rb") as file:
+                buffer = file.read()
+        except OSError:
+            self._rewrite()
+            return
+
+        if len(buffer) < _FILE_HEADER_SIZE or buffer[: len(_FILE_MAGIC)] != _FILE_MAGIC:
+            raise ValueError(f"Not a timers file: {self.location}")
+        self._next_timer_id = TimerId(struct.unpack_from(_FILE_HEADER_FORMAT, buffer, 0)[1])
+
+        offset = _FILE_HEADER_SIZE
+        while offset < len(buffer):
+            try:
+                timer, offset = record_to_identifiable_timer(buffer, offset)
+            except IncompleteTimerRecordError:
+                # Only the last record can be incomplete, if it was interrupted whilst being written. Any other decode
+                # error means the file is corrupt, so it is raised rather than the file being rewritten without it
+                logger.warning("Discarding incomplete record at end of timers file")
+                self._rewrite()
+                break
+            self._timers[timer.id] = timer
+            self._next_timer_id = max(self._next_timer_id, TimerId(timer.id + 1))
+
+    def _rewrite(self):
+        # Written to a temporary file that is then renamed over the timers file, so it is never partially written
+        temporary_location = str(self.location) + ".tmp"
+        with open(temporary_location, "wb") as file:
+            file.write(struct.pack(_FILE_HEADER_FORMAT, _FILE_MAGIC, self._next_timer_id))
+            for timer in self._timers.values():
+                file.write(timer_to_record(timer))
+        os.rename(temporary_location, str(self.location))
@@ -1,7 +1,8 @@
 import itertools
 import json
+import os
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, Optional
 
 from timeventx.timers.collections.abc import IdentifiableTimersCollection
 from timeventx.timers.serialisation import json_to_identifiable_timer, timer_to_json
@@ -9,25 +10,47 @@ from timeventx.timers.timers import IdentifiableTimer, Timer, TimerId
 
 
 class TimersDatabase(IdentifiableTimersCollection):
+    """
+    Timers database, with each timer stored in its own file in a directory.
+
+    The IDs of the timers and the next ID to allocate are kept in a manifest file, so that the directory only needs to be
+    scanned when the database is opened, to check that the manifest is up to date. The manifest's first line holds all
+    the IDs, with each change then appended as a line of the IDs added and removed, so a change does not rewrite every
+    ID. It is compacted back into one line once it has as many changes as there are timers.
+    """
+
     _DATABASE_FILE_EXTENSION = ".json"
+    # Deliberately without the database file extension, so it is not mistaken for a timer
+    _MANIFEST_FILE_NAME = "manifest"
+    # Fewest changes kept in the manifest before it is compacted, so a small database is not compacted on most changes
+    _MIN_MANIFEST_CHANGES_BEFORE_COMPACTION = 100
 
     @property
     def _database_files(self) -> Iterable[Path]:
         yield from (Path(path) for path in self.database_directory.glob(f"*{TimersDatabase._DATABASE_FILE_EXTENSION}"))
 
+    @property
+    def _manifest_file(self) -> Path:
+        return self.database_directory / TimersDatabase._MANIFEST_FILE_NAME
+
     def __init__(self, database_directory: Path):
         database_directory.mkdir(parents=True, exist_ok=True)
         self.database_directory = database_directory
+        self._timer_ids: set[TimerId] = set()
+        self._next_timer_id = TimerId(2)
+        # Changes not yet appended to the manifest, and the number of changes appended since it was last compacted
+        self._unwritten_added_timer_ids: set[TimerId] = set()
+        self._unwritten_removed_timer_ids: set[TimerId] = set()
+        self._manifest_change_count = 0
+        self._load_manifest()
 
     def __iter__(self) -> Iterable[IdentifiableTimer]:
-        # Read all files in self.database_directory
-        # For each file, read the contents and yield the timer
-        for location in self._database_files:
-            timer_id = self._database_file_to_timer_id(location)
+        # Copied so timers can be changed whilst iterating
+        for timer_id in tuple(self._timer_ids):
             yield self.get(timer_id)
 
     def __len__(self) -> int:
-        return sum(1 for _ in self._database_files)
+        return len(self._timer_ids)
 
     def get(self, timer_id: TimerId) -> IdentifiableTimer:
         location = self._timer_id_to_database_file(timer_id)
@@ -40,10 +63,81 @@ class TimersDatabase(IdentifiableTimersCollection):
         return json_to_identifiable_timer(json.loads(serialised_timer))
 
     def add(self, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        added_timer = self._write_timer(timer)
+        self._write_manifest()
+        return added_timer
+
+    def add_many(self, timers: Iterable[Timer | IdentifiableTimer]) -> list[IdentifiableTimer]:
+        timers = list(timers)
+        self._check_timer_ids_unused(timers)
+        added_timers = []
+        try:
+            for timer in timers:
+                added_timers.append(self._write_timer(timer))
+        finally:
+            # Manifest written once for all the timers
+            if len(added_timers) > 0:
+                self._write_manifest()
+        return added_timers
+
+    def remove(self, timer_id: TimerId) -> bool:
+        removed = self._delete_timer(timer_id)
+        if removed:
+            self._write_manifest()
+        return removed
+
+    def remove_many(self, timer_ids: Iterable[TimerId]) -> list[TimerId]:
+        removed_timer_ids = []
+        try:
+            for timer_id in timer_ids:
+                if self._delete_timer(timer_id):
+                    removed_timer_ids.append(timer_id)
+        finally:
+            # Manifest written once for all the timers
+            if len(removed_timer_ids) > 0:
+                self._write_manifest()
+        return removed_timer_ids
+
+    def replace(self, timer_id: TimerId, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        replacement_timer = self._to_replacement_timer(timer_id, timer)
+        if timer_id not in self._timer_ids:
+            raise KeyError(f"Timer with id {timer_id} does not exist")
+        serialised_timer = json.dumps(timer_to_json(replacement_timer))
+
+        # Written to a temporary file that is then renamed over the timer's file, so the timer always exists and is never
+        # partially written. The manifest is unchanged, as the ID is kept
+        location = str(self._timer_id_to_database_file(timer_id))
+        temporary_location = location + ".tmp"
+        with open(temporary_location, "w") as file:
+            file.write(serialised_timer)
+        os.rename(temporary_location, location)
+        return replacement_timer
+
+    def replace_all(self, timers: Iterable[Timer | IdentifiableTimer]) -> list[IdentifiableTimer]:
+        timers = list(timers)
+        self._check_timer_ids_unused(timers, check_collection=False)
+        added_timers = []
+        try:
+            # Copied as the timers are removed whilst iterating
+            for timer_id in tuple(self._timer_ids):
+                self._delete_timer(timer_id)
+            for timer in timers:
+                added_timers.append(self._write_timer(timer))
+        finally:
+            # Manifest written once for all the changes
+            self._write_manifest()
+        return added_timers
+
+    def _write_timer(self, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        """
+        Writes the given timer to its database file, without updating the manifest.
+        :param timer: timer to write
+        :return: model of the timer written
+        :raises ValueError: if timer with the same ID already exists
+        """
         timer_id = timer.id if isinstance(timer, IdentifiableTimer) else self._get_unique_timer_id()
 
-        location = self._timer_id_to_database_file(timer_id)
-        if location.exists():
+        if timer_id in self._timer_ids:
             raise ValueError(f"Timer with id {timer_id} already exists")
 
         identifiable_timer = (
@@ -52,16 +146,32 @@ class TimersDatabase(IdentifiableTimersCollection):
         serialised_timer = json.dumps(timer_to_json(identifiable_timer))
 
         # String cast required with MicroPython due to use of non-standard `Path` lib
-        with open(str(location), "w") as file:
+        with open(str(self._timer_id_to_database_file(timer_id)), "w") as file:
             file.write(serialised_timer)
 
+        # The timer is written before the manifest, so a crash in between leaves a manifest that is detected as stale
+        self._timer_ids.add(timer_id)
+        self._unwritten_added_timer_ids.add(timer_id)
+        self._next_timer_id = max(self._next_timer_id, timer_id + 1)
         return identifiable_timer
 
-    def remove(self, timer_id: TimerId) -> bool:
-        location = self._timer_id_to_database_file(timer_id)
-        if not location.exists():
+    def _delete_timer(self, timer_id: TimerId) -> bool:
+        """
+        Deletes the database file of the timer with the given ID, without updating the manifest.
+        :param timer_id: ID of the timer to delete
+        :return: `True` if a timer with the given ID was deleted
+        """
+        if timer_id not in self._timer_ids:
             return False
-        location.unlink()
+        try:
+            self._timer_id_to_database_file(timer_id).unlink()
+        except OSError:
+            # Already removed by something else
+            pass
+        self._timer_ids.remove(timer_id)
+        # Removals are applied after additions when the manifest is loaded, so the ID is no longer recorded as added
+        self._unwritten_added_timer_ids.discard(timer_id)
+        self._unwritten_removed_timer_ids.add(timer_id)
         return True
 
     def _timer_id_to_database_file(self, timer_id: TimerId) -> Path:
@@ -71,5 +181,176 @@ class TimersDatabase(IdentifiableTimersCollection):
         return TimerId(int(database_file.stem))
 
     def _get_unique_timer_id(self) -> TimerId:
-        # `itertools.chain` combines the sorted generator with a fixed value of 1 to work when there are no files
-        return TimerId(max(itertools.chain(sorted(int(file.stem) for file in self._database_files), (1,))) + 1)
+        return self._next_timer_id
+
+    def _load_manifest(self):
+        """
+        Loads the manifest, rebuilding it from the database files if it is missing or does not match them.
+        """
+        timer_ids = set(self._database_file_to_timer_id(location) for location in self._database_files)
+        # `itertools.chain` combines the IDs with a fixed value of 1 to work when there are no files
+        next_timer_id = TimerId(max(itertools.chain(timer_ids, (1,))) + 1)
+        manifest_change_count = 0
+        try:
+            # String cast required with MicroPython due to use of non-standard `Path` lib
+            with open(str(self._manifest_file), "r") as file:
+                content = file.read()
+            # Every line is written with a new line at its end. If the last line is missing one (e.g. if interrupted
+            # whilst being appended, or if written before changes were appended) the manifest is rewritten, as the line
+            # would otherwise be joined to the next change appended
+            terminated = content.endswith("\n")
+            lines = content.split("\n")
+            if terminated:
+                lines.pop()
+            manifest = json.loads(lines[0])
+            manifest_timer_ids = set(TimerId(timer_id) for timer_id in manifest["ids"])
+            up_to_date = terminated and manifest["count"] == len(manifest_timer_ids)
+            manifest_next_timer_id = TimerId(manifest["nextId"])
+            for i in range(1, len(lines)):
+                try:
+                    change = json.loads(lines[i])
+                except ValueError:
+                    if terminated or i != len(lines) - 1:
+                        raise
+                    # Only partly appended, so whether the change was made is left to the check against the files
+                    break
+                manifest_timer_ids.difference_update(change["removed"])
+                manifest_timer_ids.update(change["added"])
+                manifest_next_timer_id = max(manifest_next_timer_id, TimerId(change["nextId"]))
+                manifest_change_count += 1
+            up_to_date = up_to_date and manifest_timer_ids == timer_ids
+            # The next ID is never decreased, so the IDs of removed timers are not reused
+            next_timer_id = max(next_timer_id, manifest_next_timer_id)
+        except (OSError, ValueError, KeyError, TypeError):
+            up_to_date = False
+
+        self._timer_ids = timer_ids
+        self._next_timer_id = next_timer_id
+        self._unwritten_added_timer_ids = set()
+        self._unwritten_removed_timer_ids = set()
+        self._manifest_change_count = manifest_change_count
+        if not up_to_date:
+            self._write_manifest(compact=True)
+
+    def _write_manifest(self, compact: bool = False):
+        """
+        Writes the changes made since the manifest was last written to it.
+        :param compact: whether to rewrite the manifest as one line of all the IDs, rather than append the changes
+        """
+        compact = compact or self._manifest_change_count >= max(
+            len(self._timer_ids), TimersDatabase._MIN_MANIFEST_CHANGES_BEFORE_COMPACTION
+        )
+        if compact:
+            serialised_manifest = json.dumps(
+                {"ids": sorted(self._timer_ids), "count": len(self._timer_ids), "nextId": self._next_timer_id}
+            )
+            # Written to a temporary file that is then renamed over the manifest, so the manifest is never partially
+            # written
+            temporary_location = str(self._manifest_file) + ".tmp"
+            with open(temporary_location, "w") as file:
+                file.write(serialised_manifest + "\n")
+            os.rename(temporary_location, str(self._manifest_file))
+            self._manifest_change_count = 0
+        else:
+            serialised_change = json.dumps(
+                {
+                    "added": sorted(self._unwritten_added_timer_ids),
+                    "removed": sorted(self._unwritten_removed_timer_ids),
+                    "nextId": self._next_timer_id,
+                }
+            )
+            # A change that is only partly appended (e.g. if interrupted) is detected by its missing new line when loaded
+            with open(str(self._manifest_file), "a") as file:
+                file.write(serialised_change + "\n")
+            self._manifest_change_count += 1
+        self._unwritten_added_timer_ids.clear()
+        self._unwritten_removed_timer_ids.clear()
+
+
+class CachedTimersDatabase(TimersDatabase):
+    """
+    Timers database that reads all timers from disk once and then serves them from memory.
+
+    Adds and removes are written through to disk, keeping the cache up to date.
+    """
+
+    @property
+    def _cached_timers(self) -> dict[TimerId, IdentifiableTimer]:
+        if (
+            self._timers is not None
+            and self.check_for_external_changes
+            and self._get_directory_modified_time() != self._directory_modified_time
+        ):
+            self._load_manifest()
+            self._timers = None
+            self._external_change_count += 1
+        if self._timers is None:
+            # Modified time got before reading, so changes made during the read are picked up next time
+            self._directory_modified_time = self._get_directory_modified_time()
+            timers = {}
+            for timer_id in self._timer_ids:
+                timers[timer_id] = super().get(timer_id)
+            self._timers = timers
+        return self._timers
+
+    def __init__(self, database_directory: Path, check_for_external_changes: bool = False):
+        """
+        Constructor.
+        :param database_directory: directory containing the database files
+        :param check_for_external_changes: whether to check the modified time of the database directory on each access,
+                                           reloading the cache if the database has been changed by something else. Not
+                                           all filesystems update the modified time of directories
+        """
+        super().__init__(database_directory)
+        self.check_for_external_changes = check_for_external_changes
+        self._timers: Optional[dict[TimerId, IdentifiableTimer]] = None
+        self._directory_modified_time: Optional[int] = None
+        self._external_change_count = 0
+
+    def __iter__(self) -> Iterator[IdentifiableTimer]:
+        return iter(self._cached_timers.values())
+
+    def __len__(self) -> int:
+        return len(self._cached_timers)
+
+    def get(self, timer_id: TimerId) -> IdentifiableTimer:
+        try:
+            return self._cached_timers[timer_id]
+        except KeyError:
+            raise KeyError(f"Timer with id {timer_id} does not exist")
+
+    def get_external_change_count(self) -> int:
+        # Accessing the cache reloads it if there have been external changes
+        self._cached_timers
+        return self._external_change_count
+
+    def replace(self, timer_id: TimerId, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        timers = self._cached_timers
+        replacement_timer = super().replace(timer_id, timer)
+        timers[timer_id] = replacement_timer
+        self._directory_modified_time = self._get_directory_modified_time()
+        return replacement_timer
+
+    def _write_timer(self, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        timers = self._cached_timers
+        written_timer = super()._write_timer(timer)
+        timers[written_timer.id] = written_timer
+        return written_timer
+
+    def _delete_timer(self, timer_id: TimerId) -> bool:
+        timers = self._cached_timers
+        deleted = super()._delete_timer(timer_id)
+        if deleted:
+            timers.pop(timer_id, None)
+        return deleted
+
+    def _write_manifest(self, compact: bool = False):
+        super()._write_manifest(compact)
+        # Every change is followed by a manifest write, so this records the modified time after the change
+        self._directory_modified_time = self._get_directory_modified_time()
+
+    def _get_directory_modified_time(self) -> int:
+        # `os.stat` used as `Path.stat` is not available in MicroPython, where the result is a tuple with the modified
+        # time (in whole seconds) at index 8
+        stat = os.stat(str(self.database_directory))
+        return stat.st_mtime_ns if hasattr(stat, "st_mtime_ns") else stat[8]
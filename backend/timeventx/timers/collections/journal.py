@@ -0,0 +1,158 @@
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from timeventx._logging import get_logger
+from timeventx.timers.collections.abc import IdentifiableTimersCollection
+from timeventx.timers.serialisation import json_to_identifiable_timer, timer_to_json
+from timeventx.timers.timers import IdentifiableTimer, Timer, TimerId
+
+JOURNAL_FILE_EXTENSION = ".journal"
+
+_RECORD_TYPE_ADD = "add"
+_RECORD_TYPE_REMOVE = "remove"
+_RECORD_TYPE_NEXT_ID = "nextId"
+
+logger = get_logger(__name__)
+
+
+class JournalTimersCollection(IdentifiableTimersCollection):
+    """
+    Timers collection stored in a single, append-only journal file.
+
+    Each add and remove is appended to the journal as a JSON record on its own line. The journal is replayed into memory
+    when opened, and compacted (rewritten with only the timers that exist) when the proportion of records that are no
+    longer needed crosses a threshold.
+    """
+
+    @staticmethod
+    def from_timers(timers: Iterable[IdentifiableTimer], journal_location: Path) -> "JournalTimersCollection":
+        """
+        Creates a journal containing the given timers, e.g. to migrate from a `TimersDatabase`.
+        :param timers: timers to put in the journal
+        :param journal_location: location of the journal to create
+        :return: the created collection
+        :raises ValueError: if a journal already exists at the given location
+        """
+        if journal_location.exists():
+            raise ValueError(f"Journal already exists: {journal_location}")
+        collection = JournalTimersCollection(journal_location)
+        for timer in timers:
+            collection._apply_add(timer)
+        collection.compact()
+        return collection
+
+    @property
+    def dead_record_ratio(self) -> float:
+        return 0.0 if self._records == 0 else (self._records - len(self._timers)) / self._records
+
+    def __init__(self, journal_location: Path, compaction_threshold: float = 0.5, minimum_records_to_compact: int = 32):
+        """
+        Constructor.
+        :param journal_location: location of the journal file, which is created if it does not exist
+        :param compaction_threshold: proportion of records that are no longer needed at which the journal is compacted
+        :param minimum_records_to_compact: number of records the journal must have before it is compacted
+        """
+        self.journal_location = journal_location
+        self.compaction_threshold = compaction_threshold
+        self.minimum_records_to_compact = minimum_records_to_compact
+        self._timers: dict[TimerId, IdentifiableTimer] = {}
+        self._next_timer_id = TimerId(2)
+        self._records = 0
+
+        journal_location.parent.mkdir(parents=True, exist_ok=True)
+        self._replay()
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __iter__(self) -> Iterator[IdentifiableTimer]:
+        return iter(self._timers.values())
+
+    def get(self, timer_id: TimerId) -> IdentifiableTimer:
+        try:
+            return self._timers[timer_id]
+        except KeyError:
+            raise KeyError(f"Timer with id {timer_id} does not exist")
+
+    def add(self, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        if isinstance(timer, IdentifiableTimer):
+            if timer.id in self._timers:
+                raise ValueError(f"Timer with id {timer.id} already exists")
+            identifiable_timer = timer
+        else:
+            identifiable_timer = IdentifiableTimer.from_timer(timer, self._next_timer_id)
+
+        self._append({"type": _RECORD_TYPE_ADD, "timer": timer_to_json(identifiable_timer)})
+        self._apply_add(identifiable_timer)
+        return identifiable_timer
+
+    def remove(self, timer_id: TimerId) -> bool:
+        if timer_id not in self._timers:
+            return False
+        self._append({"type": _RECORD_TYPE_REMOVE, "id": timer_id})
+        del self._timers[timer_id]
+
+        if self._records >= self.minimum_records_to_compact and self.dead_record_ratio > self.compaction_threshold:
+            self.compact()
+        return True
+
+    def compact(self):
+        """
+        Rewrites the journal so it only contains the timers that exist.
+        """
+        logger.info(f"Compacting journal with {self._records} records to {len(self._timers)} timers")
+        records = [{"type": _RECORD_TYPE_NEXT_ID, "id": self._next_timer_id}]
+        records.extend({"type": _RECORD_TYPE_ADD, "timer": timer_to_json(timer)} for timer in self._timers.values())
+
+        # Written to a temporary file that is then renamed over the journal, so the journal is never partially written
+        temporary_location = str(self.journal_location) + ".tmp"
+        with open(temporary_location, "w") as file:
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+        os.rename(temporary_location, str(self.journal_location))
+        self._records = len(records)
+
+    def _replay(self):
+        incomplete_record = False
+        try:
+            # String cast required with MicroPython due to use of non-standard `Path` lib
+            with open(str(self.journal_location), "r") as file:
+                # Read a line at a time to avoid holding the whole journal in memory
+                for serialised_record in file:
+                    if not serialised_record.endswith("\n"):
+                        # Only the last record can be incomplete, if it was interrupted whilst being written
+                        incomplete_record = True
+                        break
+                    self._apply_record(json.loads(serialised_record))
+        except OSError:
+            return
+
+        if incomplete_record:
+            # Records cannot be appended after an incomplete record, so the journal is rewritten without it
+            logger.warning("Discarding incomplete record at end of journal")
+            self.compact()
+
+    def _apply_record(self, record: dict):
+        record_type = record["type"]
+        if record_type == _RECORD_TYPE_ADD:
+            self._apply_add(json_to_identifiable_timer(record["timer"]))
+        elif record_type == _RECORD_TYPE_REMOVE:
+            self._timers.pop(TimerId(record["id"]), None)
+        elif record_type == _RECORD_TYPE_NEXT_ID:
+            self._next_timer_id = max(self._next_timer_id, TimerId(record["id"]))
+        else:
+            raise ValueError(f"Unknown journal record type: {record_type}")
+        self._records += 1
+
+    def _append(self, record: dict):
+        # String cast required with MicroPython due to use of non-standard `Path` lib
+        with open(str(self.journal_location), "a") as file:
+            file.write(json.dumps(record) + "\n")
+        self._records += 1
+
+    def _apply_add(self, timer: IdentifiableTimer):
+        self._timers[timer.id] = timer
+        # The next ID is never decreased, so the IDs of removed timers are not reused
+        self._next_timer_id = max(self._next_timer_id, TimerId(timer.id + 1))
@@ -1,11 +1,15 @@
 from collections import defaultdict
-from typing import Callable, Iterator, TypeAlias
+from typing import Callable, Iterable, Iterator, List, Optional, TypeAlias
 
 from timeventx.timers.collections.abc import IdentifiableTimersCollection
 from timeventx.timers.timers import IdentifiableTimer, Timer, TimerId
 
 AddListener: TypeAlias = Callable[[IdentifiableTimer], None]
 RemoveListener: TypeAlias = Callable[[TimerId], None]
+# Called with the timer before and after it was replaced
+UpdateListener: TypeAlias = Callable[[IdentifiableTimer, IdentifiableTimer], None]
+# Called with the timers added and the IDs of the timers removed
+ChangeListener: TypeAlias = Callable[[List[IdentifiableTimer], List[TimerId]], None]
 EventEnum: TypeAlias = str
 
 
@@ -13,15 +17,99 @@ EventEnum: TypeAlias = str
 class Event:
     TIMER_ADDED: EventEnum = "added"
     TIMER_REMOVED: EventEnum = "removed"
+    TIMER_UPDATED: EventEnum = "updated"
+    # Bulk changes are notified once for all the timers, instead of per timer
+    TIMERS_CHANGED: EventEnum = "changed"
+
+
+class TimersBatch:
+    """
+    Changes made to a `ListenableTimersCollection` within a `with timers.batch():` block.
+
+    The changes are coalesced, so adding then removing a timer is no change, and removing then adding a timer with the
+    same ID and attributes is no change.
+    """
+
+    def __init__(self, timers: "ListenableTimersCollection"):
+        """
+        Constructor.
+        :param timers: collection that the changes are made to
+        """
+        self.timers = timers
+        # Timers added in the batch, and the original timers removed in the batch, by ID
+        self.added_timers: dict[TimerId, IdentifiableTimer] = {}
+        self.removed_timers: dict[TimerId, IdentifiableTimer] = {}
+        # Every change in the order made, as `(added, timer)`, so the changes can be undone
+        self._changes: list[tuple[bool, IdentifiableTimer]] = []
+        self._depth = 0
+
+    def __enter__(self) -> "TimersBatch":
+        self._depth += 1
+        self.timers._batch = self
+        return self
+
+    def __exit__(self, exception_type, exception, traceback) -> bool:
+        self._depth -= 1
+        # Nested batches are part of the outermost batch
+        if self._depth > 0:
+            return False
+        self.timers._batch = None
+        if exception_type is not None:
+            self._roll_back()
+        else:
+            self.timers._notify_change(list(self.added_timers.values()), list(self.removed_timers.keys()))
+        return False
+
+    def record_add(self, timer: IdentifiableTimer):
+        """
+        Records that the given timer has been added.
+        :param timer: timer added
+        """
+        self._changes.append((True, timer))
+        if self.removed_timers.get(timer.id) == timer:
+            del self.removed_timers[timer.id]
+        else:
+            self.added_timers[timer.id] = timer
+
+    def record_remove(self, timer: IdentifiableTimer):
+        """
+        Records that the given timer has been removed.
+        :param timer: timer removed
+        """
+        self._changes.append((False, timer))
+        if self.added_timers.pop(timer.id, None) is None:
+            self.removed_timers[timer.id] = timer
+
+    def _roll_back(self):
+        # Undone directly on the underlying collection, in reverse order, so no listeners are notified
+        timers_collection = self.timers._timers_collection
+        for added, timer in reversed(self._changes):
+            if added:
+                timers_collection.remove(timer.id)
+            else:
+                timers_collection.add(timer)
 
 
 class ListenableTimersCollection(IdentifiableTimersCollection):
     """
     Timers collection that can be listened to for changes.
 
+    Bulk changes (`add_many`, `remove_many` and `replace_all`) are notified with a single `Event.TIMERS_CHANGED` event,
+    rather than an event per timer, as are all the changes made in a `batch`.
+
     Not (p)thread safe.
     """
 
+    @property
+    def generation(self) -> int:
+        """
+        Number that changes whenever the timers change, so things derived from the timers (e.g. responses) can be cached.
+
+        Changes made by something other than this collection that the underlying collection detects (see
+        `get_external_change_count`) change the generation but are not notified to listeners.
+        """
+        return self._change_count + self._timers_collection.get_external_change_count()
+
     def __init__(self, timers_collection: IdentifiableTimersCollection):
         """
         Constructor.
@@ -30,7 +118,12 @@ class ListenableTimersCollection(IdentifiableTimersCollection):
         :param timers_collection: timers collection to initialise with
         """
         self._timers_collection = timers_collection
-        self.listeners: dict[str, list[AddListener | RemoveListener]] = defaultdict(list)
+        self.listeners: dict[str, list[AddListener | RemoveListener | UpdateListener | ChangeListener]] = defaultdict(
+            list
+        )
+        self._batch: Optional[TimersBatch] = None
+        # Incremented on each change notified
+        self._change_count = 0
 
     def __len__(self) -> int:
         return len(self._timers_collection)
@@ -41,20 +134,100 @@ class ListenableTimersCollection(IdentifiableTimersCollection):
     def get(self, timer_id: TimerId) -> IdentifiableTimer:
         return self._timers_collection.get(timer_id)
 
+    def iter_timer_seconds(self) -> Iterator[tuple[TimerId, int, int]]:
+        return self._timers_collection.iter_timer_seconds()
+
+    def get_external_change_count(self) -> int:
+        return self._timers_collection.get_external_change_count()
+
     def add(self, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
         added_timer = self._timers_collection.add(timer)
 
-        for listener in self.listeners[Event.TIMER_ADDED]:
-            listener(added_timer)
+        if self._batch is not None:
+            self._batch.record_add(added_timer)
+        else:
+            self._notify(Event.TIMER_ADDED, added_timer)
 
         return added_timer
 
     def remove(self, timer_id: TimerId) -> bool:
+        if self._batch is not None:
+            # Got before being removed, so the remove can be rolled back
+            try:
+                timer = self._timers_collection.get(timer_id)
+            except KeyError:
+                return False
+            removed = self._timers_collection.remove(timer_id)
+            if removed:
+                self._batch.record_remove(timer)
+            return removed
+
         removed = self._timers_collection.remove(timer_id)
         if removed:
-            for listener in self.listeners[Event.TIMER_REMOVED]:
-                listener(timer_id)
+            self._notify(Event.TIMER_REMOVED, timer_id)
         return removed
 
-    def add_listener(self, event: EventEnum, listener: AddListener | RemoveListener):
+    def replace(self, timer_id: TimerId, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        original_timer = self._timers_collection.get(timer_id)
+        replacement_timer = self._timers_collection.replace(timer_id, timer)
+
+        if self._batch is not None:
+            self._batch.record_remove(original_timer)
+            self._batch.record_add(replacement_timer)
+        else:
+            self._notify(Event.TIMER_UPDATED, original_timer, replacement_timer)
+
+        return replacement_timer
+
+    def add_many(self, timers: Iterable[Timer | IdentifiableTimer]) -> list[IdentifiableTimer]:
+        added_timers = self._timers_collection.add_many(timers)
+        if self._batch is not None:
+            for timer in added_timers:
+                self._batch.record_add(timer)
+        else:
+            self._notify_change(added_timers, [])
+        return added_timers
+
+    def remove_many(self, timer_ids: Iterable[TimerId]) -> list[TimerId]:
+        if self._batch is not None:
+            return [timer_id for timer_id in timer_ids if self.remove(timer_id)]
+
+        removed_timer_ids = self._timers_collection.remove_many(timer_ids)
+        self._notify_change([], removed_timer_ids)
+        return removed_timer_ids
+
+    def replace_all(self, timers: Iterable[Timer | IdentifiableTimer]) -> list[IdentifiableTimer]:
+        if self._batch is not None:
+            # Made as separate removes and adds, so each can be rolled back
+            timers = list(timers)
+            self._check_timer_ids_unused(timers, check_collection=False)
+            self.remove_many([timer_id for timer_id, _, _ in self._timers_collection.iter_timer_seconds()])
+            return self.add_many(timers)
+
+        removed_timer_ids = [timer_id for timer_id, _, _ in self._timers_collection.iter_timer_seconds()]
+        added_timers = self._timers_collection.replace_all(timers)
+        self._notify_change(added_timers, removed_timer_ids)
+        return added_timers
+
+    def batch(self) -> TimersBatch:
+        """
+        Gets a context in which changes to the timers are made as one.
+
+        Listeners are not notified of changes made in the context. When the context exits, the changes are coalesced and
+        notified with a single `Event.TIMERS_CHANGED` event. If the context exits with an exception, the changes are
+        rolled back instead, without listeners being notified. A batch started within a batch is part of it.
+        :return: context of the batch
+        """
+        return self._batch if self._batch is not None else TimersBatch(self)
+
+    def add_listener(self, event: EventEnum, listener: AddListener | RemoveListener | UpdateListener | ChangeListener):
         self.listeners[event].append(listener)
+
+    def _notify_change(self, added_timers: list[IdentifiableTimer], removed_timer_ids: list[TimerId]):
+        if len(added_timers) > 0 or len(removed_timer_ids) > 0:
+            self._notify(Event.TIMERS_CHANGED, added_timers, removed_timer_ids)
+
+    def _notify(self, event: EventEnum, *arguments):
+        self._change_count += 1
+        for listener in self.listeners[event]:
+            listener(*arguments)
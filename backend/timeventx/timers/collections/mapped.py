@@ -0,0 +1,195 @@
+"""
+Timers collection backed by a memory-mapped file.
+
+Only available on CPython, as MicroPython does not have `mmap`.
+"""
+import mmap
+import struct
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from timeventx.timers.collections.abc import IdentifiableTimersCollection
+from timeventx.timers.timers import DayTime, IdentifiableTimer, Timer, TimerId
+
+MAPPED_FILE_EXTENSION = ".mmap"
+
+# File header: identifier of the format, size of each record and the next timer ID to allocate
+_FILE_MAGIC = b"TVXM"
+_FILE_HEADER_FORMAT = "<4sIq"
+_FILE_HEADER_SIZE = struct.calcsize(_FILE_HEADER_FORMAT)
+_NEXT_TIMER_ID_OFFSET = 8
+
+# Record: flags, ID, start time (seconds), duration (microseconds) and name length, followed by the UTF-8 encoded name
+# padded to the size of the record
+RECORD_SIZE = 128
+_RECORD_HEADER_FORMAT = "<BqIQB"
+_RECORD_HEADER_SIZE = struct.calcsize(_RECORD_HEADER_FORMAT)
+_RECORD_TIMES_FORMAT = "<IQ"
+_RECORD_TIMES_OFFSET = 9
+MAXIMUM_NAME_LENGTH = RECORD_SIZE - _RECORD_HEADER_SIZE
+
+_LIVE_FLAG = 1
+_INITIAL_CAPACITY = 64
+
+
+class MappedTimersCollection(IdentifiableTimersCollection):
+    """
+    Timers collection stored in a memory-mapped file of fixed-size records.
+
+    Timers are read straight from the mapping when requested, so opening the collection only reads the ID of each
+    record. Names are limited to `MAXIMUM_NAME_LENGTH` bytes (UTF-8 encoded).
+    """
+
+    @staticmethod
+    def from_timers(timers: Iterable[IdentifiableTimer], location: Path) -> "MappedTimersCollection":
+        """
+        Creates a file containing the given timers, e.g. to migrate from a `TimersDatabase`.
+        :param timers: timers to put in the file
+        :param location: location of the file to create
+        :return: the created collection
+        :raises ValueError: if a file already exists at the given location
+        """
+        if location.exists():
+            raise ValueError(f"Timers file already exists: {location}")
+        collection = MappedTimersCollection(location)
+        for timer in timers:
+            collection.add(timer)
+        return collection
+
+    @property
+    def _capacity(self) -> int:
+        return (len(self._map) - _FILE_HEADER_SIZE) // RECORD_SIZE
+
+    def __init__(self, location: Path):
+        """
+        Constructor.
+        :param location: location of the timers file, which is created if it does not exist
+        :raises ValueError: if the file at the location is not a timers file
+        """
+        self.location = location
+        if not location.exists():
+            location.parent.mkdir(parents=True, exist_ok=True)
+            with open(location, "wb") as file:
+                file.write(struct.pack(_FILE_HEADER_FORMAT, _FILE_MAGIC, RECORD_SIZE, 2))
+                file.write(bytes(_INITIAL_CAPACITY * RECORD_SIZE))
+
+        self._file = open(location, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        if len(self._map) < _FILE_HEADER_SIZE:
+            self.close()
+            raise ValueError(f"Not a timers file: {location}")
+        magic, record_size, self._next_timer_id = struct.unpack_from(_FILE_HEADER_FORMAT, self._map, 0)
+        if magic != _FILE_MAGIC or record_size != RECORD_SIZE:
+            self.close()
+            raise ValueError(f"Not a timers file: {location}")
+
+        # Only the flags and ID of each record are read
+        self._slots: dict[TimerId, int] = {}
+        self._free_slots: list[int] = []
+        for slot in range(self._capacity - 1, -1, -1):
+            flags, timer_id = struct.unpack_from("<Bq", self._map, self._get_offset(slot))
+            if flags & _LIVE_FLAG:
+                self._slots[TimerId(timer_id)] = slot
+            else:
+                self._free_slots.append(slot)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __iter__(self) -> Iterator[IdentifiableTimer]:
+        # Walks the records in the mapping, rather than the IDs, so only live records are decoded
+        for slot in range(self._capacity):
+            if self._map[self._get_offset(slot)] & _LIVE_FLAG:
+                yield self._read_timer(slot)
+
+    def close(self):
+        """
+        Closes the file backing the collection. The collection cannot be used once closed.
+        """
+        self._map.close()
+        self._file.close()
+
+    def get(self, timer_id: TimerId) -> IdentifiableTimer:
+        try:
+            return self._read_timer(self._slots[timer_id])
+        except KeyError:
+            raise KeyError(f"Timer with id {timer_id} does not exist")
+
+    def add(self, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        if isinstance(timer, IdentifiableTimer):
+            if timer.id in self._slots:
+                raise ValueError(f"Timer with id {timer.id} already exists")
+            identifiable_timer = timer
+        else:
+            identifiable_timer = IdentifiableTimer.from_timer(timer, self._next_timer_id)
+
+        name = identifiable_timer.name.encode("utf-8")
+        if len(name) > MAXIMUM_NAME_LENGTH:
+            raise ValueError(f"Timer name is longer than {MAXIMUM_NAME_LENGTH} bytes")
+        try:
+            header = struct.pack(
+                _RECORD_HEADER_FORMAT,
+                0,
+                identifiable_timer.id,
+                identifiable_timer.start_time.as_seconds(),
+                round(identifiable_timer.duration.total_seconds() * 1_000_000),
+                len(name),
+            )
+        except struct.error as e:
+            raise ValueError(f"Timer cannot be stored in a record: {e}") from e
+
+        if len(self._free_slots) == 0:
+            self._grow()
+        slot = self._free_slots.pop()
+        offset = self._get_offset(slot)
+        # The record is only flagged as live once written, so a partially written record is never read
+        self._map[offset : offset + len(header)] = header
+        self._map[offset + len(header) : offset + len(header) + len(name)] = name
+        self._map[offset] = _LIVE_FLAG
+        self._slots[identifiable_timer.id] = slot
+
+        self._next_timer_id = max(self._next_timer_id, TimerId(identifiable_timer.id + 1))
+        struct.pack_into("<q", self._map, _NEXT_TIMER_ID_OFFSET, self._next_timer_id)
+        self._map.flush()
+        return identifiable_timer
+
+    def remove(self, timer_id: TimerId) -> bool:
+        slot = self._slots.pop(timer_id, None)
+        if slot is None:
+            return False
+        self._map[self._get_offset(slot)] = 0
+        self._map.flush()
+        self._free_slots.append(slot)
+        return True
+
+    def iter_timer_seconds(self) -> Iterator[tuple[TimerId, int, int]]:
+        for timer_id, slot in self._slots.items():
+            start_seconds, duration_microseconds = struct.unpack_from(
+                _RECORD_TIMES_FORMAT, self._map, self._get_offset(slot) + _RECORD_TIMES_OFFSET
+            )
+            yield timer_id, start_seconds, duration_microseconds // 1_000_000
+
+    def _get_offset(self, slot: int) -> int:
+        return _FILE_HEADER_SIZE + slot * RECORD_SIZE
+
+    def _read_timer(self, slot: int) -> IdentifiableTimer:
+        offset = self._get_offset(slot)
+        _, timer_id, start_seconds, duration_microseconds, name_length = struct.unpack_from(
+            _RECORD_HEADER_FORMAT, self._map, offset
+        )
+        name_offset = offset + _RECORD_HEADER_SIZE
+        return IdentifiableTimer(
+            timer_id=TimerId(timer_id),
+            name=self._map[name_offset : name_offset + name_length].decode("utf-8"),
+            start_time=DayTime.from_seconds(start_seconds),
+            duration=timedelta(microseconds=duration_microseconds),
+        )
+
+    def _grow(self):
+        # Capacity doubled, with the mapping recreated as it cannot be resized on all platforms
+        capacity = self._capacity
+        self._map.close()
+        self._file.truncate(self._get_offset(capacity * 2))
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._free_slots.extend(range(capacity * 2 - 1, capacity - 1, -1))
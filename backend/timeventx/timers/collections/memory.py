@@ -1,3 +1,4 @@
+from heapq import heappop, heappush
 from typing import Iterable, Iterator
 
 from timeventx.timers.collections.abc import IdentifiableTimersCollection
@@ -7,6 +8,7 @@ from timeventx.timers.timers import IdentifiableTimer, Timer, TimerId
 class InMemoryIdentifiableTimersCollection(IdentifiableTimersCollection):
     def __init__(self, timers: Iterable[IdentifiableTimer] = ()):
         self._timers = {timer.id: timer for timer in timers}
+        self._reset_timer_ids()
 
     def __len__(self) -> int:
         return len(self._timers)
@@ -28,18 +30,55 @@ class InMemoryIdentifiableTimersCollection(IdentifiableTimersCollection):
             identifiable_timer = IdentifiableTimer.from_timer(timer, timer_id)
             return self.add(identifiable_timer)
 
+    def add_many(self, timers: Iterable[Timer | IdentifiableTimer]) -> list[IdentifiableTimer]:
+        timers = list(timers)
+        self._check_timer_ids_unused(timers)
+        added_timers = []
+        for timer in timers:
+            if not isinstance(timer, IdentifiableTimer):
+                timer = IdentifiableTimer.from_timer(timer, self._create_timer_id())
+            self._timers[timer.id] = timer
+            added_timers.append(timer)
+        return added_timers
+
     def remove(self, timer_id: TimerId) -> bool:
         try:
             del self._timers[timer_id]
-            return True
         except KeyError:
             return False
+        if timer_id < self._next_fresh_timer_id:
+            heappush(self._free_timer_ids, timer_id)
+        return True
+
+    def replace(self, timer_id: TimerId, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        replacement_timer = self._to_replacement_timer(timer_id, timer)
+        if timer_id not in self._timers:
+            raise KeyError(f"Timer with id {timer_id} does not exist")
+        self._timers[timer_id] = replacement_timer
+        return replacement_timer
+
+    def replace_all(self, timers: Iterable[Timer | IdentifiableTimer]) -> list[IdentifiableTimer]:
+        timers = list(timers)
+        self._check_timer_ids_unused(timers, check_collection=False)
+        self._timers = {}
+        self._reset_timer_ids()
+        return self.add_many(timers)
+
+    def _reset_timer_ids(self):
+        # Every ID below the next fresh ID is either used by a timer or in the free-list (a min-heap), so the lowest
+        # unused ID is the lowest in the free-list, or else the lowest unused ID from the next fresh ID
+        self._free_timer_ids: list[TimerId] = []
+        self._next_fresh_timer_id = TimerId(0)
 
     def _create_timer_id(self) -> TimerId:
-        timer_ids = sorted(timer.id for timer in self)
-        if len(timer_ids) == 0:
-            return TimerId(0)
-        for i in range(len(timer_ids)):
-            if timer_ids[i] != i:
-                return TimerId(i)
-        return TimerId(i + 1)
+        # IDs in the free-list may have been used since being freed (by adding a timer with the ID), so are discarded
+        # when found rather than removed when used
+        while len(self._free_timer_ids) > 0:
+            timer_id = heappop(self._free_timer_ids)
+            if timer_id not in self._timers:
+                return timer_id
+        while self._next_fresh_timer_id in self._timers:
+            self._next_fresh_timer_id += 1
+        timer_id = self._next_fresh_timer_id
+        self._next_fresh_timer_id += 1
+        return TimerId(timer_id)
@@ -0,0 +1,212 @@
+"""
+Timers collection backed by a SQLite database.
+
+Only available on CPython, as MicroPython does not have `sqlite3`.
+"""
+import sqlite3
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from timeventx.timers.collections.abc import IdentifiableTimersCollection
+from timeventx.timers.timers import DayTime, IdentifiableTimer, Timer, TimerId
+
+SQLITE_FILE_EXTENSION = ".sqlite"
+
+# Number of prepared statements kept by the connection. Only a handful of statements are used, so all stay prepared
+_CACHED_STATEMENTS = 32
+
+_SCHEMA = (
+    # `AUTOINCREMENT` stops the IDs of removed timers from being reused
+    "CREATE TABLE IF NOT EXISTS timers ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "name TEXT NOT NULL, "
+    "start_seconds INTEGER NOT NULL, "
+    "duration_microseconds INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS timers_start_seconds ON timers (start_seconds)",
+    "CREATE INDEX IF NOT EXISTS timers_name ON timers (name)",
+)
+
+_SELECT_TIMER_COLUMNS = "SELECT id, name, start_seconds, duration_microseconds FROM timers"
+
+
+class SqliteTimersCollection(IdentifiableTimersCollection):
+    """
+    Timers collection stored in a SQLite database, for hosts that manage many timers.
+
+    Timers are indexed by start time and by name. The database is in write-ahead logging mode, so reads are not blocked
+    by writes from other connections.
+    """
+
+    @staticmethod
+    def from_timers(timers: Iterable[IdentifiableTimer], location: Path) -> "SqliteTimersCollection":
+        """
+        Creates a database containing the given timers, e.g. to migrate from a `TimersDatabase`.
+        :param timers: timers to put in the database
+        :param location: location of the database to create
+        :return: the created collection
+        :raises ValueError: if a file already exists at the given location
+        """
+        if location.exists():
+            raise ValueError(f"Timers database already exists: {location}")
+        collection = SqliteTimersCollection(location)
+        with collection._connection:
+            collection._connection.executemany(
+                "INSERT INTO timers (id, name, start_seconds, duration_microseconds) VALUES (?, ?, ?, ?)",
+                ((timer.id, *SqliteTimersCollection._to_values(timer)) for timer in timers),
+            )
+        return collection
+
+    def __init__(self, location: Path):
+        """
+        Constructor.
+        :param location: location of the database file, which is created if it does not exist
+        """
+        self.location = location
+        location.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(location), cached_statements=_CACHED_STATEMENTS)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM timers").fetchone()[0]
+
+    def __iter__(self) -> Iterator[IdentifiableTimer]:
+        for row in self._connection.execute(_SELECT_TIMER_COLUMNS):
+            yield self._from_row(row)
+
+    def close(self):
+        """
+        Closes the connection to the database. The collection cannot be used once closed.
+        """
+        self._connection.close()
+
+    def get(self, timer_id: TimerId) -> IdentifiableTimer:
+        row = self._connection.execute(f"{_SELECT_TIMER_COLUMNS} WHERE id = ?", (timer_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Timer with id {timer_id} does not exist")
+        return self._from_row(row)
+
+    def add(self, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        return self.add_many((timer,))[0]
+
+    def add_many(self, timers: Iterable[Timer | IdentifiableTimer]) -> list[IdentifiableTimer]:
+        return self._insert_all(timers)
+
+    def replace(self, timer_id: TimerId, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        replacement_timer = self._to_replacement_timer(timer_id, timer)
+        try:
+            with self._connection:
+                updated = self._connection.execute(
+                    "UPDATE timers SET name = ?, start_seconds = ?, duration_microseconds = ? WHERE id = ?",
+                    (*self._to_values(replacement_timer), timer_id),
+                ).rowcount
+        except OverflowError:
+            updated = 0
+        if updated == 0:
+            raise KeyError(f"Timer with id {timer_id} does not exist")
+        return replacement_timer
+
+    def remove(self, timer_id: TimerId) -> bool:
+        try:
+            with self._connection:
+                return self._connection.execute("DELETE FROM timers WHERE id = ?", (timer_id,)).rowcount > 0
+        except OverflowError:
+            return False
+
+    def iter_timer_seconds(self) -> Iterator[tuple[TimerId, int, int]]:
+        for timer_id, start_seconds, duration_microseconds in self._connection.execute(
+            "SELECT id, start_seconds, duration_microseconds FROM timers"
+        ):
+            yield TimerId(timer_id), start_seconds, duration_microseconds // 1_000_000
+
+    def replace_all(self, timers: Iterable[Timer | IdentifiableTimer]) -> list[IdentifiableTimer]:
+        return self._insert_all(timers, replace=True)
+
+    def get_starting_between(self, start_time: DayTime, end_time: DayTime) -> list[IdentifiableTimer]:
+        """
+        Gets the timers that start in the given range of times, using the start time index.
+
+        Lets consumers, such as the intervals index, only recompute for the timers affected by a change.
+        :param start_time: start of the range (inclusive)
+        :param end_time: end of the range (exclusive). If before the start, the range wraps around midnight
+        :return: timers that start in the range, ordered by start time (from the start of the range)
+        """
+        start_seconds = start_time.as_seconds()
+        end_seconds = end_time.as_seconds()
+        if start_seconds <= end_seconds:
+            rows = self._connection.execute(
+                f"{_SELECT_TIMER_COLUMNS} WHERE start_seconds >= ? AND start_seconds < ? ORDER BY start_seconds",
+                (start_seconds, end_seconds),
+            ).fetchall()
+        else:
+            rows = self._connection.execute(
+                f"{_SELECT_TIMER_COLUMNS} WHERE start_seconds >= ? ORDER BY start_seconds", (start_seconds,)
+            ).fetchall()
+            rows.extend(
+                self._connection.execute(
+                    f"{_SELECT_TIMER_COLUMNS} WHERE start_seconds < ? ORDER BY start_seconds", (end_seconds,)
+                )
+            )
+        return [self._from_row(row) for row in rows]
+
+    def get_by_name(self, name: str) -> list[IdentifiableTimer]:
+        """
+        Gets the timers with the given name, using the name index.
+        :param name: name of the timers
+        :return: timers with the name
+        """
+        return [
+            self._from_row(row)
+            for row in self._connection.execute(f"{_SELECT_TIMER_COLUMNS} WHERE name = ? ORDER BY id", (name,))
+        ]
+
+    def _insert_all(
+        self, timers: Iterable[Timer | IdentifiableTimer], replace: bool = False
+    ) -> list[IdentifiableTimer]:
+        added_timers = []
+        try:
+            # Changed in one transaction, so either all or none of the changes are made, with one commit
+            with self._connection:
+                if replace:
+                    self._connection.execute("DELETE FROM timers")
+                for timer in timers:
+                    added_timers.append(self._insert(timer))
+        except sqlite3.IntegrityError as e:
+            # Not necessarily a duplicate ID, nor caused by an identifiable timer (e.g. a timer without a name)
+            raise ValueError(f"Timer violates a constraint of the database: {e}") from e
+        except OverflowError as e:
+            raise ValueError(f"Timer cannot be stored in the database: {e}") from e
+        return added_timers
+
+    def _insert(self, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        if isinstance(timer, IdentifiableTimer):
+            self._connection.execute(
+                "INSERT INTO timers (id, name, start_seconds, duration_microseconds) VALUES (?, ?, ?, ?)",
+                (timer.id, *self._to_values(timer)),
+            )
+            return timer
+        cursor = self._connection.execute(
+            "INSERT INTO timers (name, start_seconds, duration_microseconds) VALUES (?, ?, ?)", self._to_values(timer)
+        )
+        return IdentifiableTimer.from_timer(timer, TimerId(cursor.lastrowid))
+
+    @staticmethod
+    def _to_values(timer: Timer) -> tuple[str, int, int]:
+        return (
+            timer.name,
+            timer.start_time.as_seconds(),
+            round(timer.duration.total_seconds() * 1_000_000),
+        )
+
+    @staticmethod
+    def _from_row(row: tuple[int, str, int, int]) -> IdentifiableTimer:
+        timer_id, name, start_seconds, duration_microseconds = row
+        return IdentifiableTimer(
+            timer_id=TimerId(timer_id),
+            name=name,
+            start_time=DayTime.from_seconds(start_seconds),
+            duration=timedelta(microseconds=duration_microseconds),
+        )
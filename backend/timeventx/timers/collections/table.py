@@ -0,0 +1,161 @@
+from array import array
+from bisect import bisect_left
+from datetime import timedelta
+from typing import Iterable, Iterator
+
+from timeventx.timers.collections.abc import IdentifiableTimersCollection
+from timeventx.timers.timers import DayTime, IdentifiableTimer, Timer, TimerId
+
+# Typecodes are kept as constants, as MicroPython's `array` does not have the `typecode` attribute
+_ID_TYPECODE = "l"
+_SECONDS_TYPECODE = "L"
+_NAME_INDEX_TYPECODE = "H"
+# Largest index that fits in the name index column, which is checked explicitly as MicroPython's `array` truncates
+# values that do not fit rather than raising
+_MAX_NAME_INDEX = 2**16 - 1
+
+
+class TimerTable(IdentifiableTimersCollection):
+    """
+    Collection of timers, stored column-wise in arrays rather than as timer objects.
+
+    Each timer costs a few bytes: its ID, start time (in seconds) and duration (in seconds) are held in array columns,
+    sorted by ID, and its name is held as an index into a pool of names shared by all timers. Timer objects are only
+    created when a timer is requested.
+
+    Durations must be a whole number of seconds.
+    """
+
+    def __init__(self, timers: Iterable[IdentifiableTimer] = ()):
+        self._ids = array(_ID_TYPECODE)
+        self._start_seconds = array(_SECONDS_TYPECODE)
+        self._duration_seconds = array(_SECONDS_TYPECODE)
+        self._name_indices = array(_NAME_INDEX_TYPECODE)
+
+        # Pool of names, with the number of timers using each name. Slots of names no longer in use are reused
+        self._names: list[str | None] = []
+        self._name_references: list[int] = []
+        self._name_to_index: dict[str, int] = {}
+        self._free_name_indices: list[int] = []
+
+        for timer in timers:
+            self.add(timer)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[IdentifiableTimer]:
+        for i in range(len(self._ids)):
+            yield self._create_timer(i)
+
+    def get(self, timer_id: TimerId) -> IdentifiableTimer:
+        return self._create_timer(self._get_position(timer_id))
+
+    def add(self, timer: Timer | IdentifiableTimer) -> IdentifiableTimer:
+        if not isinstance(timer, IdentifiableTimer):
+            return self.add(IdentifiableTimer.from_timer(timer, self._create_timer_id()))
+
+        position = bisect_left(self._ids, timer.id)
+        if position < len(self._ids) and self._ids[position] == timer.id:
+            raise ValueError(f"Timer with id {timer.id} already exists")
+        duration_seconds = int(timer.duration.total_seconds())
+        if timedelta(seconds=duration_seconds) != timer.duration:
+            raise ValueError(f"Timer duration must be a whole number of seconds: {timer.duration}")
+        name_index = self._get_name_index(timer.name)
+        if name_index > _MAX_NAME_INDEX:
+            raise ValueError(f"Too many distinct timer names to store another: {timer.name}")
+        # Every value is converted before any column is changed, so the table is left unchanged if one cannot be
+        try:
+            id_cell = array(_ID_TYPECODE, (timer.id,))
+        except OverflowError as e:
+            raise ValueError(f"Timer id {timer.id} is too large to store") from e
+        try:
+            duration_cell = array(_SECONDS_TYPECODE, (duration_seconds,))
+        except OverflowError as e:
+            raise ValueError(f"Timer duration is too large to store: {timer.duration}") from e
+        start_cell = array(_SECONDS_TYPECODE, (timer.start_time.as_seconds(),))
+        name_index_cell = array(_NAME_INDEX_TYPECODE, (name_index,))
+
+        self._reference_name(timer.name)
+        # Slice assignment used to insert, as MicroPython's `array` does not have `insert`
+        self._ids[position:position] = id_cell
+        self._start_seconds[position:position] = start_cell
+        self._duration_seconds[position:position] = duration_cell
+        self._name_indices[position:position] = name_index_cell
+        return timer
+
+    def remove(self, timer_id: TimerId) -> bool:
+        try:
+            position = self._get_position(timer_id)
+        except KeyError:
+            return False
+        self._release_name(self._name_indices[position])
+
+        # Slice assignment used to delete, as MicroPython's `array` does not support `del`
+        after = position + 1
+        self._ids[position:after] = array(_ID_TYPECODE)
+        self._start_seconds[position:after] = array(_SECONDS_TYPECODE)
+        self._duration_seconds[position:after] = array(_SECONDS_TYPECODE)
+        self._name_indices[position:after] = array(_NAME_INDEX_TYPECODE)
+        return True
+
+    def iter_timer_seconds(self) -> Iterator[tuple[TimerId, int, int]]:
+        return zip(self._ids, self._start_seconds, self._duration_seconds)
+
+    def _get_position(self, timer_id: TimerId) -> int:
+        position = bisect_left(self._ids, timer_id)
+        if position == len(self._ids) or self._ids[position] != timer_id:
+            raise KeyError(timer_id)
+        return position
+
+    def _create_timer(self, position: int) -> IdentifiableTimer:
+        return IdentifiableTimer(
+            timer_id=TimerId(self._ids[position]),
+            name=self._names[self._name_indices[position]],
+            start_time=DayTime.from_seconds(self._start_seconds[position]),
+            duration=timedelta(seconds=self._duration_seconds[position]),
+        )
+
+    def _create_timer_id(self) -> TimerId:
+        # Lowest unused ID. IDs are sorted, unique and non-negative, so `ids[i] == i` for all positions before the
+        # first gap, which can therefore be found by bisection
+        low, high = 0, len(self._ids)
+        while low < high:
+            middle = (low + high) // 2
+            if self._ids[middle] == middle:
+                low = middle + 1
+            else:
+                high = middle
+        return TimerId(low)
+
+    def _get_name_index(self, name: str) -> int:
+        # Index the name has, or would be given by `_reference_name` if it is not in the pool
+        index = self._name_to_index.get(name)
+        if index is not None:
+            return index
+        if len(self._free_name_indices) > 0:
+            return self._free_name_indices[-1]
+        return len(self._names)
+
+    def _reference_name(self, name: str) -> int:
+        index = self._name_to_index.get(name)
+        if index is not None:
+            self._name_references[index] += 1
+            return index
+        if len(self._free_name_indices) > 0:
+            index = self._free_name_indices.pop()
+            self._names[index] = name
+            self._name_references[index] = 1
+        else:
+            index = len(self._names)
+            self._names.append(name)
+            self._name_references.append(1)
+        self._name_to_index[name] = index
+        return index
+
+    def _release_name(self, index: int):
+        self._name_references[index] -= 1
+        if self._name_references[index] == 0:
+            del self._name_to_index[self._names[index]]
+            self._names[index] = None
+            self._free_name_indices.append(index)
@@ -1,7 +1,16 @@
+from bisect import bisect_left, bisect_right, insort
 from datetime import timedelta
-from typing import Collection
+from typing import Collection, Iterable, Optional, Tuple, TypeAlias
 
-from timeventx.timers.timers import DayTime
+from timeventx.timers.timers import (
+    SECONDS_IN_A_DAY,
+    DayTime,
+    IdentifiableTimer,
+    TimerId,
+)
+
+# `(start, end)` in seconds from the start of the day, with the end exceeding a day if the interval spans midnight
+UnrolledInterval: TypeAlias = Tuple[int, int]
 
 
 # Not using `dataclass` because it is not available in MicroPython (or installable using `mip`)
@@ -12,14 +21,15 @@ class TimeInterval:
 
         self.start_time = start_time
         self.end_time = end_time
+        # Integer seconds cached (intervals are not changed after creation) so the checks below can be made without
+        # creating any objects
+        self._start_seconds = start_time.as_seconds()
+        self._end_seconds = end_time.as_seconds()
+        self.duration_seconds = (self._end_seconds - self._start_seconds) % SECONDS_IN_A_DAY
 
     @property
     def duration(self) -> timedelta:
-        return (
-            timedelta(seconds=self.end_time.as_seconds() - self.start_time.as_seconds())
-            if not self.spans_midnight()
-            else timedelta(seconds=60 * 60 * 24 - self.start_time.as_seconds() + self.end_time.as_seconds())
-        )
+        return timedelta(seconds=self.duration_seconds)
 
     def __eq__(self, other: object) -> bool:
         return (
@@ -30,84 +40,288 @@ class TimeInterval:
         return repr([self.start_time, self.end_time])
 
     def spans_midnight(self) -> bool:
-        return self.start_time > self.end_time
+        return self._start_seconds > self._end_seconds
 
     def intersects(self, other: "TimeInterval") -> bool:
-        earlier_interval, later_interval = sorted((self, other), key=lambda interval: interval.start_time)
-
-        if earlier_interval.spans_midnight():
-            if later_interval.spans_midnight():
-                # Both intervals cross midnight, so they at least overlap at midnight
-                return True
-            earlier_interval, later_interval = later_interval, earlier_interval
-
-        if later_interval.spans_midnight():
-            return (
-                later_interval.start_time < earlier_interval.end_time
-                or later_interval.end_time > earlier_interval.start_time
-            )
-        else:
-            return (
-                later_interval.start_time < earlier_interval.end_time
-                and later_interval.end_time > earlier_interval.start_time
-            )
+        return self.intersects_seconds(other._start_seconds, other._end_seconds)
+
+    def intersects_seconds(self, start_seconds: int, end_seconds: int) -> bool:
+        """
+        Gets whether this interval intersects the given interval, without creating any objects.
+        :param start_seconds: start time of the other interval, in seconds since the start of the day
+        :param end_seconds: end time of the other interval, in seconds since the start of the day (it spans midnight if
+                            before the start time)
+        :return: `True` if the intervals intersect
+        """
+        start = self._start_seconds
+        end = start + self.duration_seconds
+        other_end = start_seconds + (end_seconds - start_seconds) % SECONDS_IN_A_DAY
+        # Both intervals are unrolled (ending after midnight if they span it), so the other interval is also checked a
+        # day earlier and later
+        return (
+            (start_seconds < end and start < other_end)
+            or (start_seconds - SECONDS_IN_A_DAY < end and start < other_end - SECONDS_IN_A_DAY)
+            or (start_seconds + SECONDS_IN_A_DAY < end and start < other_end + SECONDS_IN_A_DAY)
+        )
 
 
 def merge_and_sort_intervals(intervals: Collection[TimeInterval]) -> tuple[TimeInterval, ...]:
-    if len(intervals) == 0:
-        return ()
-
-    intervals_by_start_time = sorted(intervals, key=lambda interval: interval.start_time)
-    intervals = [intervals_by_start_time[0]]
-    intervals_by_start_time.pop(0)
-
-    for interval in intervals_by_start_time:
-        last_interval = intervals[-1]
-
-        start_time = interval.start_time
-        end_time = interval.end_time
-
-        if (
-            interval.start_time < last_interval.end_time
-            and not last_interval.spans_midnight()
-            or interval.start_time > last_interval.end_time
-            and last_interval.spans_midnight()
-        ):
-            # XXX: Intervals overlap. Taking "brute force" approach and generating all possible intervals from the
-            # overlapping intervals and then picking the longest one. There is undoubtedly a more efficient way to
-            # calculate this but the midnight wrap around makes it very confusing (consider converting to a linear
-            # representation?).
-            superset_interval = TimeInterval(interval.start_time, interval.end_time)
-            earlier_interval = TimeInterval(interval.start_time, last_interval.end_time)
-            later_interval = TimeInterval(last_interval.start_time, interval.end_time)
-            subset_interval = TimeInterval(last_interval.start_time, last_interval.end_time)
-            longest_interval = max(
-                (superset_interval, earlier_interval, later_interval, subset_interval), key=lambda x: x.duration
+    merged_intervals = merge_and_sort_unrolled_intervals(
+        tuple(to_unrolled_interval(interval) for interval in intervals)
+    )
+    return tuple(from_unrolled_interval(interval) for interval in merged_intervals)
+
+
+def to_unrolled_interval(interval: TimeInterval) -> UnrolledInterval:
+    """
+    Converts the given interval to its "unrolled" representation.
+    :param interval: interval to convert
+    :return: `(start, end)` in seconds, where the end is in the following day if the interval spans midnight
+    """
+    start = interval.start_time.as_seconds()
+    end = interval.end_time.as_seconds()
+    return start, end if end > start else end + SECONDS_IN_A_DAY
+
+
+def to_unrolled_timer_interval(start_seconds: int, duration_seconds: int) -> UnrolledInterval:
+    """
+    Gets the "unrolled" representation of the interval of a timer.
+    :param start_seconds: start time of the timer, in seconds since the start of the day
+    :param duration_seconds: duration of the timer, in whole seconds
+    :return: `(start, end)` in seconds, where the end is in the following day if the interval spans midnight
+    :raises ValueError: if the interval would have no length
+    """
+    if duration_seconds % SECONDS_IN_A_DAY == 0:
+        raise ValueError("Interval must be non-zero")
+    return start_seconds, start_seconds + duration_seconds
+
+
+def from_unrolled_interval(interval: UnrolledInterval) -> TimeInterval:
+    """
+    Converts the given "unrolled" interval back to a time interval.
+    :param interval: `(start, end)` in seconds
+    :return: the equivalent time interval
+    """
+    return TimeInterval(DayTime.from_seconds(interval[0]), DayTime.from_seconds(interval[1] % SECONDS_IN_A_DAY))
+
+
+def merge_and_sort_unrolled_intervals(intervals: Iterable[UnrolledInterval]) -> list[UnrolledInterval]:
+    """
+    Merges overlapping intervals, returning them sorted by start time.
+
+    Intervals are represented on an "unrolled" line of seconds, running from midnight to midnight on the following day,
+    so all intervals can be merged in a single sweep. Intervals that spill into the following day are then folded back
+    onto the intervals at the start of the day.
+
+    Intervals only merge if they overlap, apart from at the midnight fold where intervals that touch are also merged.
+    :param intervals: `(start, end)` intervals in seconds, where `0 <= start < 86400` and `start < end <= start + 86400`
+    :return: merged intervals, of which only the last can end in the following day
+    :raises ValueError: if the merged intervals leave no time in the day when they are all off
+    """
+    merged_intervals = []
+    # Latest time, in the following day, reached by an interval that spills over midnight
+    spilled_end = -1
+
+    for start, end in sorted(intervals):
+        if end >= SECONDS_IN_A_DAY and end > spilled_end:
+            spilled_end = end
+        if len(merged_intervals) > 0 and start < merged_intervals[-1][1]:
+            if end > merged_intervals[-1][1]:
+                merged_intervals[-1] = (merged_intervals[-1][0], end)
+        else:
+            merged_intervals.append((start, end))
+
+    if spilled_end >= 0:
+        # Fold the intervals at the start of the day that the spilled time reaches into the last interval
+        last_start, last_end = merged_intervals[-1]
+        spilled_end -= SECONDS_IN_A_DAY
+        folded = 0
+        while folded < len(merged_intervals) - 1 and merged_intervals[folded][0] <= spilled_end:
+            last_end = max(last_end, merged_intervals[folded][1] + SECONDS_IN_A_DAY)
+            folded += 1
+        if last_end - last_start >= SECONDS_IN_A_DAY:
+            raise ValueError("Intervals overlap such that there is no end time")
+        merged_intervals = merged_intervals[folded:-1]
+        merged_intervals.append((last_start, last_end))
+
+    return merged_intervals
+
+
+class MergedIntervalsIndex:
+    """
+    Index of the merged intervals of a collection of timers, updated incrementally as timers are added and removed.
+
+    Only the merged intervals affected by a change are recalculated, unless the change involves the intervals that are
+    folded over midnight, in which case all intervals are merged again (without needing to re-read any timers).
+
+    The merged intervals are held as parallel, sorted lists of start and end seconds so they can be searched without
+    creating any objects.
+    """
+
+    @property
+    def merged_intervals(self) -> list[UnrolledInterval]:
+        return list(zip(self.merged_starts, self.merged_ends))
+
+    @property
+    def on_off_intervals(self) -> tuple[TimeInterval, ...]:
+        if self._on_off_intervals is None:
+            self._on_off_intervals = tuple(from_unrolled_interval(interval) for interval in self.merged_intervals)
+        return self._on_off_intervals
+
+    @staticmethod
+    def from_timer_seconds(timer_seconds: Iterable[tuple[TimerId, int, int]]) -> "MergedIntervalsIndex":
+        """
+        Creates an index from timer times, without needing timer objects.
+        :param timer_seconds: `(timer_id, start_seconds, duration_seconds)` of each timer, e.g. as given by
+                              `IdentifiableTimersCollection.iter_timer_seconds`
+        :return: the created index
+        """
+        index = MergedIntervalsIndex()
+        index._index_all(
+            (timer_id, to_unrolled_timer_interval(start_seconds, duration_seconds))
+            for timer_id, start_seconds, duration_seconds in timer_seconds
+        )
+        return index
+
+    def __init__(self, timers: Iterable[IdentifiableTimer] = ()):
+        self._timer_intervals: dict[TimerId, UnrolledInterval] = {}
+        # Interval of every timer, as `(start, end, timer_id)`, kept sorted
+        self._intervals: list[tuple[int, int, TimerId]] = []
+        self.merged_starts: list[int] = []
+        self.merged_ends: list[int] = []
+        self._on_off_intervals: Optional[tuple[TimeInterval, ...]] = None
+        self._index_all((timer.id, to_unrolled_interval(timer.interval)) for timer in timers)
+
+    def __len__(self) -> int:
+        return len(self._timer_intervals)
+
+    def find(self, seconds: int) -> tuple[int, bool]:
+        """
+        Finds the merged interval that is on at the given time, or the next one to start if none are.
+        :param seconds: time of day, in seconds
+        :return: tuple where the first element is the position of the merged interval and the second is whether it is
+                 on at the given time
+        :raises IndexError: if there are no merged intervals
+        """
+        merged_starts = self.merged_starts
+        merged_ends = self.merged_ends
+        if len(merged_starts) == 0:
+            raise IndexError("No merged intervals")
+
+        position = bisect_right(merged_starts, seconds) - 1
+        if position >= 0 and seconds < merged_ends[position]:
+            return position, True
+        # The last interval may span midnight and so be on at the start of the day
+        if seconds < merged_ends[-1] - SECONDS_IN_A_DAY:
+            return len(merged_ends) - 1, True
+        return (position + 1) % len(merged_starts), False
+
+    def is_on(self, seconds: int) -> bool:
+        """
+        Gets whether any interval is on at the given time.
+        :param seconds: time of day, in seconds
+        :return: `True` if on
+        """
+        try:
+            return self.find(seconds)[1]
+        except IndexError:
+            return False
+
+    def next_interval(self, seconds: int) -> tuple[TimeInterval, bool]:
+        """
+        Gets the merged interval that is on at the given time, or the next one to start if none are.
+        :param seconds: time of day, in seconds
+        :return: tuple where the first element is the merged interval and the second is whether it is on at the given
+                 time
+        :raises IndexError: if there are no merged intervals
+        """
+        position, on_now = self.find(seconds)
+        return self.on_off_intervals[position], on_now
+
+    def add(self, timer: IdentifiableTimer):
+        """
+        Adds the interval of the given timer to the index.
+        :param timer: timer that has been added
+        :raises ValueError: if the timer is already in the index or if the merged intervals no longer have an end time
+        """
+        if timer.id in self._timer_intervals:
+            raise ValueError(f"Timer with id {timer.id} already indexed")
+        start, end = to_unrolled_interval(timer.interval)
+        self._timer_intervals[timer.id] = (start, end)
+        insort(self._intervals, (start, end, timer.id))
+
+        if end >= SECONDS_IN_A_DAY or self._is_folded(start, end):
+            try:
+                self._merge_all()
+            except ValueError:
+                # Rolled back so the index is left as it was, without the timer
+                del self._timer_intervals[timer.id]
+                del self._intervals[bisect_left(self._intervals, (start, end, timer.id))]
+                raise
+            return
+
+        merged_starts = self.merged_starts
+        merged_ends = self.merged_ends
+        # Merged intervals that the new interval overlaps are combined with it
+        upper = bisect_left(merged_starts, end)
+        lower = upper
+        while lower > 0 and merged_ends[lower - 1] > start:
+            lower -= 1
+        if lower < upper:
+            start = min(start, merged_starts[lower])
+            end = max(end, merged_ends[upper - 1])
+        merged_starts[lower:upper] = (start,)
+        merged_ends[lower:upper] = (end,)
+        self._on_off_intervals = None
+
+    def remove(self, timer_id: TimerId) -> bool:
+        """
+        Removes the interval of the timer with the given ID from the index.
+        :param timer_id: ID of the timer that has been removed
+        :return: `True` if the timer was in the index
+        :raises ValueError: if the merged intervals do not have an end time
+        """
+        try:
+            start, end = self._timer_intervals.pop(timer_id)
+        except KeyError:
+            return False
+        del self._intervals[bisect_left(self._intervals, (start, end, timer_id))]
+
+        if end >= SECONDS_IN_A_DAY or self._is_folded(start, end):
+            self._merge_all()
+            return True
+
+        # Only the timers in the merged interval that the removed interval was part of need to be merged again
+        position = bisect_right(self.merged_starts, start) - 1
+        intervals = self._intervals[
+            bisect_left(self._intervals, (self.merged_starts[position],)) : bisect_left(
+                self._intervals, (self.merged_ends[position],)
             )
+        ]
+        merged_intervals = merge_and_sort_unrolled_intervals(
+            (interval_start, interval_end) for interval_start, interval_end, _ in intervals
+        )
+        self.merged_starts[position : position + 1] = [interval[0] for interval in merged_intervals]
+        self.merged_ends[position : position + 1] = [interval[1] for interval in merged_intervals]
+        self._on_off_intervals = None
+        return True
+
+    def _is_folded(self, start: int, end: int) -> bool:
+        # Whether the interval could be part of the last merged interval when that interval spans midnight
+        if len(self.merged_ends) == 0 or self.merged_ends[-1] < SECONDS_IN_A_DAY:
+            return False
+        return end > self.merged_starts[-1] or start <= self.merged_ends[-1] - SECONDS_IN_A_DAY
+
+    def _index_all(self, timer_intervals: Iterable[tuple[TimerId, UnrolledInterval]]):
+        for timer_id, (start, end) in timer_intervals:
+            self._timer_intervals[timer_id] = (start, end)
+            self._intervals.append((start, end, timer_id))
+        self._intervals.sort()
+        self._merge_all()
 
-            # The above method does not work if the combined intervals result in no gap (i.e. there is no turn off).
-            # The concept of no off time is not supported. Detecting this case by checking if any of the intervals
-            # intersect with the gap, indicating the longest interval could have been longer.
-            gap_interval = TimeInterval(longest_interval.end_time, longest_interval.start_time)
-            if interval.intersects(gap_interval) or last_interval.intersects(gap_interval):
-                raise ValueError("Intervals overlap such that there is no end time")
-
-            start_time = longest_interval.start_time
-            end_time = longest_interval.end_time
-            intervals.pop()
-
-        if interval.spans_midnight():
-            # Interval wraps around midnight so need to check if it overlaps with any of the intervals at the start
-            for loop_interval in tuple(intervals):
-                if interval.end_time < loop_interval.start_time:
-                    # On/Off time at the start happens after the new wrap around on/off time
-                    break
-                else:
-                    # New wrapped around on/off time will replace this one at the start
-                    end_time = max(interval.end_time, loop_interval.end_time)
-                    intervals.remove(loop_interval)
-
-        new_interval = TimeInterval(start_time, end_time)
-        intervals.append(new_interval)
-
-    return tuple(intervals)
+    def _merge_all(self):
+        # Merged before any of the index is changed, so the index is unchanged if the merge fails
+        merged_intervals = merge_and_sort_unrolled_intervals((start, end) for start, end, _ in self._intervals)
+        self.merged_starts = [interval[0] for interval in merged_intervals]
+        self.merged_ends = [interval[1] for interval in merged_intervals]
+        self._on_off_intervals = None
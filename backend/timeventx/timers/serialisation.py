@@ -1,3 +1,4 @@
+import struct
 from datetime import timedelta
 
 from timeventx.timers.timers import DayTime, IdentifiableTimer, Timer, TimerId
@@ -8,7 +9,7 @@ def serialise_daytime(start_time: DayTime) -> str:
 
 
 def deserialise_daytime(start_time: str) -> DayTime:
-    return DayTime(int(start_time[0:2]), int(start_time[3:5]), int(start_time[6:8]))
+    return DayTime.intern(DayTime(int(start_time[0:2]), int(start_time[3:5]), int(start_time[6:8])))
 
 
 def timer_to_json(timer: Timer | IdentifiableTimer) -> dict:
@@ -28,3 +29,65 @@ def json_to_identifiable_timer(timer_json: dict) -> IdentifiableTimer:
         start_time=deserialise_daytime(timer_json["startTime"]),
         duration=timedelta(seconds=timer_json["duration"]),
     )
+
+
+# Binary timer record: fixed-size header of the ID, start time (seconds), duration (microseconds) and length of the name,
+# followed by the UTF-8 encoded name
+TIMER_RECORD_HEADER_FORMAT = "<qIQH"
+TIMER_RECORD_HEADER_SIZE = struct.calcsize(TIMER_RECORD_HEADER_FORMAT)
+
+
+class IncompleteTimerRecordError(ValueError):
+    """
+    Raised when a binary timer record runs past the end of the buffer containing it.
+    """
+
+
+def timer_to_record(timer: IdentifiableTimer) -> bytes:
+    """
+    Serialises the given timer to a binary record.
+    :param timer: timer to serialise
+    :return: the record
+    :raises ValueError: if the timer cannot be stored in a record (e.g. its ID is too large)
+    """
+    name = timer.name.encode("utf-8")
+    try:
+        header = struct.pack(
+            TIMER_RECORD_HEADER_FORMAT,
+            timer.id,
+            timer.start_time.as_seconds(),
+            round(timer.duration.total_seconds() * 1_000_000),
+            len(name),
+        )
+    except (struct.error, OverflowError) as e:
+        raise ValueError(f"Timer cannot be stored in a record: {e}") from e
+    return header + name
+
+
+def record_to_identifiable_timer(buffer: bytes, offset: int = 0) -> tuple[IdentifiableTimer, int]:
+    """
+    Deserialises the binary timer record at the given offset in the buffer, without copying the record.
+    :param buffer: buffer containing the record
+    :param offset: offset of the record in the buffer
+    :return: tuple where the first element is the timer and the second is the offset of the end of the record
+    :raises IncompleteTimerRecordError: if the buffer does not contain a complete record at the given offset
+    :raises ValueError: if the record is complete but cannot be decoded (e.g. its name is not valid UTF-8)
+    """
+    name_offset = offset + TIMER_RECORD_HEADER_SIZE
+    if name_offset > len(buffer):
+        raise IncompleteTimerRecordError(f"Incomplete timer record at offset {offset}")
+    timer_id, start_seconds, duration_microseconds, name_length = struct.unpack_from(
+        TIMER_RECORD_HEADER_FORMAT, buffer, offset
+    )
+    end_offset = name_offset + name_length
+    if end_offset > len(buffer):
+        raise IncompleteTimerRecordError(f"Incomplete timer record at offset {offset}")
+    return (
+        IdentifiableTimer(
+            timer_id=TimerId(timer_id),
+            name=str(buffer[name_offset:end_offset], "utf-8"),
+            start_time=DayTime.from_seconds(start_seconds),
+            duration=timedelta(microseconds=duration_microseconds),
+        ),
+        end_offset,
+    )
@@ -3,18 +3,47 @@ from datetime import timedelta
 from typing import Any, NewType, cast
 
 START_TIME_FORMAT = "%H:%M:%S"
+SECONDS_IN_A_DAY = 24 * 60 * 60
 
 TimerId = NewType("TimerId", int)
 
 
 # Not using `total_ordering` or `dataclass` because they are not available in MicroPython (or installable using `mip`)
 class DayTime:
+    """
+    Time of day, to the second.
+
+    Immutable and stored as the number of seconds since the start of the day.
+    """
+
+    # Ignored by MicroPython but saves memory per instance with CPython
+    __slots__ = ("_seconds",)
+
+    # When enabled, equal times passed through `intern` share the same instance. Disabled by default as the table of
+    # shared instances is never pruned
+    interning_enabled = False
+
     @staticmethod
     def now() -> "DayTime":
         # Use of `tuple` aligns CPython format to MicroPython, without affecting the latter
         current_time = tuple(time.localtime())
         return DayTime(current_time[3], current_time[4], current_time[5])
 
+    @staticmethod
+    def from_seconds(seconds: int) -> "DayTime":
+        return DayTime(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+    @staticmethod
+    def intern(day_time: "DayTime") -> "DayTime":
+        """
+        Gets the shared instance of the given time, if interning is enabled.
+        :param day_time: time to intern
+        :return: the shared instance equal to the given time, or the given time if interning is disabled
+        """
+        if not DayTime.interning_enabled:
+            return day_time
+        return _INTERNED_DAY_TIMES.setdefault(day_time._seconds, day_time)
+
     def __init__(self, hour: int, minute: int, second: int):
         if second < 0 or second >= 60:
             raise ValueError("second must be between 0 and 59")
@@ -23,61 +52,66 @@ class DayTime:
         if hour < 0 or hour >= 24:
             raise ValueError("hour must be between 0 and 23")
 
-        self.hour = hour
-        self.minute = minute
-        self.second = second
+        self._seconds = hour * 3600 + minute * 60 + second
+
+    @property
+    def hour(self) -> int:
+        return self._seconds // 3600
+
+    @property
+    def minute(self) -> int:
+        return self._seconds // 60 % 60
+
+    @property
+    def second(self) -> int:
+        return self._seconds % 60
 
     def __hash__(self):
-        return hash((self.hour, self.minute, self.second))
+        return hash(self._seconds)
 
     def __eq__(self, other: object) -> bool:
-        return (
-            isinstance(other, DayTime)
-            and self.hour == other.hour
-            and self.minute == other.minute
-            and self.second == other.second
-        )
+        return isinstance(other, DayTime) and self._seconds == other._seconds
 
     def __ne__(self, other: Any):
         return not self.__eq__(other)
 
     def __lt__(self, other: Any) -> bool:
-        if not issubclass(type(other), DayTime):
+        try:
+            return self._seconds < other._seconds
+        except AttributeError:
             raise TypeError(f"'<' not supported between instances of 'DayTime' and '{type(other).__name__}'")
-        other = cast(DayTime, other)
-        return self.as_seconds() < other.as_seconds()
 
-    def __gt__(self, other: Any):
-        return not self.__lt__(other) and not self.__eq__(other)
+    def __gt__(self, other: Any) -> bool:
+        try:
+            return self._seconds > other._seconds
+        except AttributeError:
+            raise TypeError(f"'>' not supported between instances of 'DayTime' and '{type(other).__name__}'")
 
-    def __le__(self, other: Any):
-        return self.__lt__(other) or self.__eq__(other)
+    def __le__(self, other: Any) -> bool:
+        try:
+            return self._seconds <= other._seconds
+        except AttributeError:
+            raise TypeError(f"'<=' not supported between instances of 'DayTime' and '{type(other).__name__}'")
 
-    def __ge__(self, other: Any):
-        return self.__gt__(other) or self.__eq__(other)
+    def __ge__(self, other: Any) -> bool:
+        try:
+            return self._seconds >= other._seconds
+        except AttributeError:
+            raise TypeError(f"'>=' not supported between instances of 'DayTime' and '{type(other).__name__}'")
 
     def __add__(self, other: object) -> "DayTime":
-        if not issubclass(type(other), timedelta):
+        if not isinstance(other, timedelta):
             raise TypeError(f"unsupported operand type(s) for +: 'DayTime' and '{type(other).__name__}'")
-
-        time_to_add: timedelta = cast(timedelta, other)
-        hours_to_add = time_to_add.seconds // 3600
-        minutes_to_add = time_to_add.seconds // 60 - hours_to_add * 60
-        seconds_to_add = time_to_add.seconds - hours_to_add * 3600 - minutes_to_add * 60
-
-        new_second_overflowed = self.second + seconds_to_add
-        new_minute_overflowed = self.minute + minutes_to_add + new_second_overflowed // 60
-        new_hour_overflowed = self.hour + hours_to_add + new_minute_overflowed // 60
-
-        return DayTime(
-            hour=new_hour_overflowed % 24, minute=new_minute_overflowed % 60, second=new_second_overflowed % 60
-        )
+        return DayTime.from_seconds((self._seconds + cast(timedelta, other).seconds) % SECONDS_IN_A_DAY)
 
     def __repr__(self):
         return f"{self.hour:02}:{self.minute:02}:{self.second:02}"
 
     def as_seconds(self) -> int:
-        return self.second + self.minute * 60 + self.hour * 3600
+        return self._seconds
+
+
+_INTERNED_DAY_TIMES: dict[int, DayTime] = {}
 
 
 # Not using dataclass because it is not available in MicroPython
@@ -0,0 +1,135 @@
+from bisect import bisect_right
+from typing import Iterable
+
+from timeventx.timers.intervals import TimeInterval
+from timeventx.timers.timers import SECONDS_IN_A_DAY
+
+# Not using an enum because it is not available in MicroPython
+ON = True
+OFF = False
+
+
+class TransitionPlan:
+    """
+    Immutable table of the times of day that the timers turn on and off, sorted by time.
+
+    Consecutive transitions always alternate between on and off, so the state at any time is the state of the last
+    transition before it (wrapping around to the day before).
+
+    Positions in the plan act as cursors: a cursor is the position of the next transition to happen.
+
+    A plan without transitions is in the same state all day, which is on if the timers cover the whole day (e.g. with
+    merged intervals that only touch each other), else off.
+    """
+
+    @staticmethod
+    def from_on_off_intervals(on_off_intervals: Iterable[TimeInterval]) -> "TransitionPlan":
+        """
+        Compiles the given intervals, that the timers are on for, into a plan.
+        :param on_off_intervals: intervals that the timers are on for
+        :return: the compiled plan
+        """
+        on_count = 0
+        edges = []
+        for interval in on_off_intervals:
+            start_seconds = interval.start_time.as_seconds()
+            end_seconds = interval.end_time.as_seconds()
+            edges.append((start_seconds, 1))
+            edges.append((end_seconds, -1))
+            if interval.spans_midnight():
+                on_count += 1
+        edges.sort()
+
+        # Transitions at the same time are combined, and only those that change the state are kept
+        seconds = []
+        states = []
+        on = on_count > 0
+        i = 0
+        while i < len(edges):
+            second = edges[i][0]
+            while i < len(edges) and edges[i][0] == second:
+                on_count += edges[i][1]
+                i += 1
+            if (on_count > 0) != on:
+                on = on_count > 0
+                seconds.append(second)
+                states.append(on)
+        # Without transitions, the state at the end of the day is the state all day
+        return TransitionPlan(tuple(seconds), tuple(states), on if len(seconds) == 0 else OFF)
+
+    def __init__(self, seconds: tuple[int, ...] = (), states: tuple[bool, ...] = (), constant_state: bool = OFF):
+        """
+        Constructor.
+        :param seconds: sorted times of the transitions, in seconds since the start of the day
+        :param states: state (`ON` or `OFF`) that each transition changes to, alternating
+        :param constant_state: state all day if there are no transitions
+        """
+        self.seconds = seconds
+        self.states = states
+        self.constant_state = constant_state
+
+    def __len__(self) -> int:
+        return len(self.seconds)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, TransitionPlan)
+            and self.seconds == other.seconds
+            and self.states == other.states
+            and self.constant_state == other.constant_state
+        )
+
+    def __repr__(self):
+        if len(self.seconds) == 0:
+            return f"<always {'on' if self.constant_state else 'off'}>"
+        return repr(list(zip(self.seconds, self.states)))
+
+    def state_at(self, seconds: int) -> bool:
+        """
+        Gets the state at the given time.
+        :param seconds: time of day, in seconds
+        :return: `ON` or `OFF`
+        """
+        if len(self.seconds) == 0:
+            return self.constant_state
+        # Position -1 wraps around to the last transition of the day before
+        return self.states[bisect_right(self.seconds, seconds) - 1]
+
+    def find_next(self, seconds: int) -> int:
+        """
+        Finds the cursor of the next transition after the given time.
+        :param seconds: time of day, in seconds
+        :return: position of the next transition
+        :raises IndexError: if there are no transitions
+        """
+        if len(self.seconds) == 0:
+            raise IndexError("No transitions")
+        return bisect_right(self.seconds, seconds) % len(self.seconds)
+
+    def seconds_until(self, cursor: int, seconds: int) -> int:
+        """
+        Gets the time from the given time until the transition at the given cursor.
+        :param cursor: position of the transition
+        :param seconds: time of day, in seconds
+        :return: seconds until the transition, which is a whole day if the transition is at the given time
+        """
+        return (self.seconds[cursor] - seconds) % SECONDS_IN_A_DAY or SECONDS_IN_A_DAY
+
+    def advance(self, cursor: int, previous_seconds: int, current_seconds: int) -> int:
+        """
+        Advances the given cursor past all transitions that happened after the previous time, up to and including the
+        current time.
+        :param cursor: position of the next transition at the previous time
+        :param previous_seconds: time of day that the cursor was for, in seconds
+        :param current_seconds: current time of day, in seconds
+        :return: position of the next transition at the current time. The current state is the state of the transition
+                 before it
+        """
+        seconds = self.seconds
+        elapsed = (current_seconds - previous_seconds) % SECONDS_IN_A_DAY
+        for _ in range(len(seconds)):
+            offset = (seconds[cursor] - previous_seconds) % SECONDS_IN_A_DAY
+            if offset == 0 or offset > elapsed:
+                break
+            cursor = (cursor + 1) % len(seconds)
+        return cursor
@@ -16,4 +16,15 @@ pushd "${project_directory}/frontend" > /dev/null
 VITE_BACKEND_API_ROOT="${backend_api_root}" \
     yarn build --base / --emptyOutDir --outDir "${build_directory}/dist/frontend"
 
+>&2 echo "Compressing frontend..."
+# A `.gz` copy is kept alongside each text file, and only when it is smaller, for the backend to serve when accepted
+find "${build_directory}/dist/frontend" -type f \
+    \( -name "*.html" -o -name "*.js" -o -name "*.css" -o -name "*.svg" -o -name "*.json" -o -name "*.txt" \) \
+    -print0 | while IFS= read -r -d "" file; do
+        gzip -9 --keep --no-name --force "${file}"
+        if [[ "$(wc -c < "${file}.gz")" -ge "$(wc -c < "${file}")" ]]; then
+            rm "${file}.gz"
+        fi
+    done
+
 popd > /dev/null
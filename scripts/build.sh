@@ -20,6 +20,16 @@ mkdir -p "${build_directory}"
 >&2 echo "Building frontend..."
 "${script_directory}/build-frontend.sh" "${backend_api_root}" "${build_directory}"
 
+if [[ -n "${TIMEVENTX_FRONTEND_ARCHIVE_LOCATION:-}" ]]; then
+    # Served from the archive, so the individual files are not needed on the device
+    >&2 echo "Packing frontend..."
+    archive_location="${dist_directory}/${TIMEVENTX_FRONTEND_ARCHIVE_LOCATION#/}"
+    mkdir -p "$(dirname "${archive_location}")"
+    PYTHONPATH="${project_directory}/backend" \
+        "${script_directory}/pack-frontend.py" "${dist_directory}/frontend" "${archive_location}"
+    rm -r "${dist_directory}/frontend"
+fi
+
 pushd "${dist_directory}" > /dev/null
 
 >&2 echo "Creating md5sums..."
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+
+import sys
+from pathlib import Path
+
+from timeventx.static_assets import pack_static_assets
+
+frontend_directory = sys.argv[1]
+archive_location = sys.argv[2]
+
+file_count = pack_static_assets(Path(frontend_directory), Path(archive_location))
+print(f"Packed {file_count} files into {archive_location}", file=sys.stderr)